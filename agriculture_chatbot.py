@@ -1,46 +1,52 @@
 import os
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, Response
 from dotenv import load_dotenv
-from openai import OpenAI
-from langchain_community.tools import TavilySearchResults
-from langchain.agents import initialize_agent, AgentType
-from langchain_openai import ChatOpenAI
-import requests
-import json
+from clients import openai_client, chat_log_collection
 from datetime import datetime
 import pytz
 import re
-from collections import deque
+import queue
+import threading
 from handlers.product_handler import handle_product
 from handlers.faq_handler import handle_faq
-from handlers.price_handler import handle_price
+from handlers.price_handler import handle_price, get_prices_batch, parse_korean_date
 from handlers.export_handler import handle_export
-from handlers.policy_handler import handle_policy
+from handlers.policy_handler import handle_policy, get_fallback_policy_info
 from handlers.search_handler import handle_search
-from product_list import PRODUCT_KEYWORDS
 from handlers.product_list_handler import handle_product_list
 from handlers.product_check_handler import handle_product_check
-from pymongo import MongoClient
+from classify_cache import cached_classifier, get_classify_cache_stats
+from tavily_client import get_tavily_cache_stats
+from stream_events import streaming, emit, complete_text, format_sse
+from intent_router import classify as route_and_classify, get_router_stats
+from chat_log_writer import create_writer
+from session_store import create_session_store
+from answer_cache import AnswerCache
+from metrics import request_timer, set_category, span, timed, render_metrics, METRICS_TIMING_IN_RESPONSE
+from llm_accounting import chat_completion, request_usage, record_request, usage_totals
+from product_catalog import catalog_stats
+from price_cache import get_price_cache_stats, kst_now
 
+# 기동 시간 단축: MongoDB/OpenAI/오라클 클라이언트는 처음 사용할 때 생성합니다. (clients.py, oracle_pool.py)
 load_dotenv()
-mongo_uri = os.getenv("MONGO_CLUSTER_URI")
-client = MongoClient(mongo_uri)
-db = client["chatbot_db"]
-collection = db["chat_logs"]
 
 app = Flask(__name__)
 
-def save_chat_log(user_id, user_message, bot_message):
-    try:
-        log = {
-            "user_id": user_id,
-            "user_message": user_message,
-            "bot_message": bot_message,
-            "timestamp": datetime.now()
-        }
-        collection.insert_one(log)
-    except Exception as e:
-        print(f"[MongoDB 저장 오류] {e}")
+# 대화 로그는 백그라운드에서 모아서 저장 (요청 처리 중에는 큐에 넣기만 함)
+chat_log_writer = create_writer(chat_log_collection)
+
+def save_chat_log(user_id, user_message, bot_message, category=None, llm_usage=None):
+    log = {
+        "user_id": user_id,
+        "user_message": user_message,
+        "bot_message": bot_message,
+        "category": category,
+        # 이 요청의 LLM 토큰 사용량/예상 비용 (llm_accounting.request_usage)
+        "llm_usage": llm_usage,
+        "timestamp": datetime.now()
+    }
+    if not chat_log_writer.submit(log):
+        print("[대화 로그 큐 가득 참] 로그를 저장하지 못했습니다.")
 
 # OpenAI 클라이언트 설정
 openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -48,105 +54,34 @@ if not openai_api_key:
     print("[경고] OPENAI_API_KEY가 설정되지 않았습니다. 환경 변수를 확인해주세요.")
     print("예: .env 파일에 OPENAI_API_KEY=sk-your-key-here 추가")
 
-client = OpenAI(api_key=openai_api_key)
-
-# LangChain 설정
-llm = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0.7,
-    openai_api_key=openai_api_key
-)
-
-# Tavily 검색 도구 설정
-search_tool = TavilySearchResults(api_key=os.getenv("TAVILY_API_KEY"))
+client = openai_client
 
 # 오늘 날짜/시간을 한글로 반환하는 함수
-def get_today_str():
-    korea = pytz.timezone('Asia/Seoul')
-    now = datetime.now(korea)
+def _korean_weekday(now):
     weekday_map = {"Monday": "월요일", "Tuesday": "화요일", "Wednesday": "수요일", "Thursday": "목요일", "Friday": "금요일", "Saturday": "토요일", "Sunday": "일요일"}
     eng_weekday = now.strftime("%A")
-    kor_weekday = weekday_map.get(eng_weekday, eng_weekday)
-    return now.strftime(f"%Y년 %m월 %d일 ({kor_weekday})")
+    return weekday_map.get(eng_weekday, eng_weekday)
+
+def get_today_str():
+    now = datetime.now(pytz.timezone('Asia/Seoul'))
+    return now.strftime(f"%Y년 %m월 %d일 ({_korean_weekday(now)})")
 
 def get_now_str():
-    korea = pytz.timezone('Asia/Seoul')
-    now = datetime.now(korea)
-    weekday_map = {"Monday": "월요일", "Tuesday": "화요일", "Wednesday": "수요일", "Thursday": "목요일", "Friday": "금요일", "Saturday": "토요일", "Sunday": "일요일"}
-    eng_weekday = now.strftime("%A")
-    kor_weekday = weekday_map.get(eng_weekday, eng_weekday)
-    return now.strftime(f"%Y년 %m월 %d일 {kor_weekday} %H:%M")
-
-# 에이전트 초기화
-agent = initialize_agent(
-    tools=[search_tool],
-    llm=llm,
-    agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
-    verbose=True,
-    agent_kwargs={
-        "system_message": (
-            f"너는 농업, 농산물, 정책, 시세, 유통, 인증 등 농산물 도매와 관련된 전문 AI 챗봇이야. "
-            f"참고: 오늘 날짜는 {get_today_str()}이고, 현재 시간은 {get_now_str()}이야. "
-            "검색 결과가 영어로 제공되어도 반드시 한국어로 번역하여 답변하라."
-            "모든 답변, 요약, 출처 안내까지 반드시 한국어로 작성하라."
-            "웹 검색 결과의 주요 내용을 빠짐없이 포함해서, 각 결과의 제목, 요약, 출처, 링크를 모두 명시해 풍부하게 답변해. "
-            "특히, 사용자가 원하는 정보가 여러 검색 결과에 나올 경우, 각 결과를 항목별로 정리해서 보여주고, 반드시 실제 링크와 출처를 포함해. "
-            "답변은 친절하고, 구체적이며, 신뢰할 수 있게 작성해."
-        )
-    }
-)
+    now = datetime.now(pytz.timezone('Asia/Seoul'))
+    return now.strftime(f"%Y년 %m월 %d일 {_korean_weekday(now)} %H:%M")
 
 
-# 대화 히스토리 저장 (간단한 메모리)
-user_histories = {}
+# 대화 히스토리 저장 (SESSION_BACKEND: memory/sqlite/redis, 워커가 여러 개면 sqlite나 redis 사용)
+user_histories = create_session_store()
 
-def is_product_list_query(msg):
-    """
-    사용자의 질문이 '전체 품목 안내' 의도(예: 판매 품목, 상품 리스트 등)인지 판별하는 함수.
-    - '판매/취급/파는/전체/모든/전부' + '품목/상품/리스트/목록/종류' 조합이 포함된 경우 True 반환
-    - 또는 자주 쓰는 단일 패턴(전체 품목, 상품 리스트 등)이 포함된 경우 True 반환
-    - 그 외에는 False
-    """
-    patterns = [
-        ("판매", ["품목", "상품", "리스트", "목록", "종류"]),  # 예: '판매 품목', '판매 상품', ...
-        ("취급", ["품목", "상품", "리스트", "목록", "종류"]),  # 예: '취급 품목', ...
-        ("파는", ["품목", "상품", "리스트", "목록", "종류"]),  # 예: '파는 품목', ...
-        ("전체", ["품목", "상품", "리스트", "목록", "종류"]),  # 예: '전체 품목', ...
-        ("모든", ["품목", "상품", "리스트", "목록", "종류"]),  # 예: '모든 상품', ...
-        ("전부", ["품목", "상품", "리스트", "목록", "종류"]),  # 예: '전부 품목', ...
-    ]
-    for first, seconds in patterns:
-        # 두 그룹(예: '판매' + '품목')이 모두 포함된 경우 True
-        if first in msg and any(s in msg for s in seconds):
-            return True
-    # 자주 쓰는 단일 패턴(조합이 아니어도 바로 인식)
-    single_patterns = [
-        "상품 리스트", "품목 목록", "전부 뭐야", "무엇을 판매", "뭐 팔아"
-    ]
-    if any(p in msg for p in single_patterns):
-        return True
-    return False
-
-def is_product_check_query(msg):
-    """
-    사용자의 질문이 '고추도 팔아?', '망고도 있나요?', '감자 팔아?' 등 품목 판매 여부 확인 의도인지 판별하는 함수
-    - '도 팔', '도 있', ... 기존 패턴
-    - 품목명 + 동사(팔아, 있, 판매, 취급, 구입, 구매) 조합이 메시지에 포함되어 있으면 True
-    """
-    patterns = ["도 팔", "도 있", "도 판매", "도 취급", "도 구입", "도 구매"]
-    if any(p in msg for p in patterns):
-        return True
-    # '도'가 없는 품목+동사 패턴도 인식
-    tokens = re.findall(r'[\w가-힣]+', msg)
-    verbs = ["팔아", "있", "판매", "취급", "구입", "구매"]
-    for t in tokens:
-        for v in verbs:
-            if t.endswith(v):
-                return True
-    return False
+# 사용자 간 유사 질문 답변 캐시 (시세 등 시점에 따라 달라지는 카테고리는 저장하지 않음)
+answer_cache = AnswerCache()
+answer_cache.uncacheable.add(get_fallback_policy_info())
 
-def classify_category_llm(user_message):
-    prompt = f"""
+CATEGORIES = ["simple_info", "product_list", "product_check", "faq", "price", "product", "policy"]
+
+def build_classify_prompt(user_message):
+    return f"""
 아래 질문을 가장 적합한 카테고리로 분류해줘.
 - simple_info: 오늘 날짜, 현재 시간, 인사(안녕, 반가워 등), 오늘 기분이 어때? 등
 - product_list: 전체 품목 안내, 판매 품목, 상품 리스트, 모든 상품, 취급 품목 등
@@ -160,19 +95,139 @@ def classify_category_llm(user_message):
 질문: \"{user_message}\"
 카테고리(영어 소문자만, 예: simple_info/product_list/product_check/faq/price/product/policy/other)로만 답해줘:
 """
-    completion = client.chat.completions.create(
+
+def parse_category(text):
+    category = text.strip().lower()
+    if category not in CATEGORIES:
+        return "search"
+    return category
+
+@cached_classifier
+@timed("classify_llm")
+def classify_category_llm(user_message):
+    completion = chat_completion(
+        client, "classify_llm",
         model="gpt-4o-2024-05-13",
-        messages=[{"role": "user", "content": prompt}],
+        messages=[{"role": "user", "content": build_classify_prompt(user_message)}],
         max_tokens=10,
         temperature=0
     )
-    category = completion.choices[0].message.content.strip().lower()
-    if category not in ["simple_info", "product_list", "product_check", "faq", "price", "product", "policy"]:
-        return "search"
-    return category
+    return parse_category(completion.choices[0].message.content)
+
+def classify_category(user_message):
+    # 규칙 기반 분류로 확실한 메시지는 바로 분류하고, 애매한 메시지만 LLM 분류 사용
+    return route_and_classify(user_message, classify_category_llm)
+
+def resolve_context_category(history, user_message):
+    """직전 답변이 상품 목록 안내를 제안했고 사용자가 수락하면 'product_list', 아니면 None"""
+    if len(history) >= 1:
+        prev_bot_message = history[-1][1] if history else None
+        if prev_bot_message:
+            # 모든 공백, 줄바꿈, 문장부호 제거 후 비교
+            normalized = re.sub(r'[\s\?\!\.]', '', prev_bot_message)
+            if "취급중인상품목록을알려드릴까요" in normalized:
+                if any(word in user_message.lower() for word in ["응", "네", "좋아", "알려줘", "보여줘", "그래", "좋다", "어", "좋아요", "네요", "알려주세요", "보여주세요"]):
+                    return "product_list"
+    return None
 
-# LLM 기반 분류를 실제 분기에서 사용
-classify_category = classify_category_llm
+def build_simple_info_request(user_message):
+    """simple_info 답변용 LLM 요청 인자 (날짜/시간 토큰 치환값 포함)"""
+    today_str = get_today_str()
+    time_str = get_now_str()
+    prompt = f'''
+아래 사용자의 질문에 대해 친절하고 자연스럽게 답변해줘. 
+만약 날짜가 필요하면 {{date}}, 시간이 필요하면 {{time}} 토큰을 답변에 포함해. 실제 값은 시스템이 자동으로 채워줄 거야.
+질문: "{user_message}"
+'''
+    return {
+        "replacements": {"{date}": today_str, "{time}": time_str},
+        "model": "gpt-4o-2024-05-13",
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": 200,
+        "temperature": 0.5
+    }
+
+def dispatch_handler(category, user_message, history):
+    """simple_info를 제외한 카테고리별 핸들러 함수로 위임"""
+    if category == "export":
+        return handle_export(user_message)
+    elif category == "policy":
+        return handle_policy(user_message)
+    elif category == "product":
+        return handle_product(user_message)
+    elif category == "price":
+        # 대화 히스토리를 price 핸들러에 전달
+        conversation_history = []
+        for user_msg, bot_msg in history:
+            conversation_history.append({"role": "user", "content": user_msg})
+            conversation_history.append({"role": "assistant", "content": bot_msg})
+        return handle_price(user_message, conversation_history)
+    elif category == "faq":
+        return handle_faq(user_message)
+    elif category == "search":
+        return handle_search(user_message)
+    elif category == "product_list":
+        return handle_product_list(user_message)
+    elif category == "product_check":
+        return handle_product_check(user_message)
+    else:
+        return handle_search(user_message)
+
+def finish_chat(user_id, user_message, result, category=None):
+    # 이 요청의 LLM 사용량을 카테고리/사용자/날짜별 합계에 더하고 대화 로그에 함께 저장
+    usage = request_usage()
+    record_request(user_id, category or "unknown", usage)
+    save_chat_log(user_id, user_message, result.get("response", str(result)), category, usage)
+    # 히스토리 저장 (모든 분기에서 공통)
+    user_histories.append(user_id, user_message, result.get("response", str(result)))
+
+def process_chat(user_id, user_message):
+    """
+    메시지를 분류하고 카테고리별 핸들러로 처리한 결과({"response", "type"})를 반환합니다.
+    /chat, /chat/stream이 함께 사용하며, 스트리밍 요청이면 분류 결과를 category 이벤트로 먼저 보냅니다.
+    (비동기 모드는 asgi.py의 process_chat_async)
+    """
+    # 대화 히스토리 가져오기 (최대 3턴)
+    with span("history"):
+        history = user_histories.get(user_id)
+    
+    context_category = resolve_context_category(history, user_message)
+    # 이전 대화 컨텍스트가 없으면 일반 분류 수행
+    with span("classify"):
+        category = context_category or classify_category(user_message)
+    print(f"[DEBUG] 분류된 카테고리: {category}")
+    set_category(category)
+    emit("category", {"category": category})
+
+    # 같은 카테고리의 비슷한 질문에 최근 답변한 적이 있으면 핸들러 호출 없이 재사용
+    with span("answer_cache"):
+        cached = None if context_category else answer_cache.lookup(user_message, category, history)
+    if cached:
+        with span("finish"):
+            finish_chat(user_id, user_message, cached, category)
+        return cached
+
+    with span("handler"):
+        if category == "simple_info":
+            # 토큰 치환 (스트리밍 요청이면 치환한 조각을 바로 전달)
+            result = {
+                "response": complete_text(client, **build_simple_info_request(user_message)),
+                "type": "simple_info"
+            }
+        else:
+            result = dispatch_handler(category, user_message, history)
+    
+    if not context_category:
+        answer_cache.store(user_message, category, result, history)
+    with span("finish"):
+        finish_chat(user_id, user_message, result, category)
+    return result
+
+def with_timings(result, timer, data):
+    """요청 본문에 debug_timing이 true이거나 METRICS_TIMING_IN_RESPONSE면 단계별 소요 시간(timings)을 붙인 응답"""
+    if data.get('debug_timing') or METRICS_TIMING_IN_RESPONSE:
+        return dict(result, timings=timer.breakdown())
+    return result
 
 @app.route('/chat', methods=['POST'])
 def chat():
@@ -185,89 +240,86 @@ def chat():
         if not user_message:
             return jsonify({"error": "메시지가 필요합니다."}), 400
 
-        # 대화 히스토리 가져오기 (최대 3턴)
-        history = user_histories.get(user_id, deque(maxlen=3))
-        
-        # 이전 대화 컨텍스트 확인
-        context_category = None
-        if len(history) >= 1:
-            prev_bot_message = history[-1][1] if history else None
-            if prev_bot_message:
-                # 모든 공백, 줄바꿈, 문장부호 제거 후 비교
-                normalized = re.sub(r'[\s\?\!\.]', '', prev_bot_message)
-                if "취급중인상품목록을알려드릴까요" in normalized:
-                    if any(word in user_message.lower() for word in ["응", "네", "좋아", "알려줘", "보여줘", "그래", "좋다", "어", "좋아요", "네요", "알려주세요", "보여주세요"]):
-                        context_category = "product_list"
-        
-        # 컨텍스트가 없으면 일반 분류 수행
-        if not context_category:
-            category = classify_category(user_message)
-        else:
-            category = context_category
-            
-        print(f"[DEBUG] 분류된 카테고리: {category}")
+        with request_timer() as timer:
+            result = process_chat(user_id, user_message)
+        return jsonify(with_timings(result, timer, data))
+    except Exception as e:
+        print(f"[API 오류] {e}")
+        return jsonify({"error": str(e)}), 500
 
-        if category == "simple_info":
-            korea = pytz.timezone('Asia/Seoul')
-            now = datetime.now(korea)
-            weekday_map = {"Monday": "월요일", "Tuesday": "화요일", "Wednesday": "수요일", "Thursday": "목요일", "Friday": "금요일", "Saturday": "토요일", "Sunday": "일요일"}
-            eng_weekday = now.strftime("%A")
-            kor_weekday = weekday_map.get(eng_weekday, eng_weekday)
-            today_str = now.strftime(f"%Y년 %m월 %d일 ({kor_weekday})")
-            time_str = now.strftime(f"%Y년 %m월 %d일 {kor_weekday} %H:%M")
-            prompt = f'''
-아래 사용자의 질문에 대해 친절하고 자연스럽게 답변해줘. 
-만약 날짜가 필요하면 {{date}}, 시간이 필요하면 {{time}} 토큰을 답변에 포함해. 실제 값은 시스템이 자동으로 채워줄 거야.
-질문: "{user_message}"
-'''
-            completion = client.chat.completions.create(
-                model="gpt-4o-2024-05-13",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=200,
-                temperature=0.5
-            )
-            response_text = completion.choices[0].message.content.strip()
-            # 토큰 치환
-            response_text = response_text.replace("{date}", today_str).replace("{time}", time_str)
-            save_chat_log(user_id, user_message, response_text)
-            # 히스토리 저장
-            history.append((user_message, response_text))
-            user_histories[user_id] = history
-            return jsonify({
-                "response": response_text,
-                "type": "simple_info"
-            })
-
-        # 카테고리별 핸들러 함수로 위임
-        if category == "export":
-            result = handle_export(user_message)
-        elif category == "policy":
-            result = handle_policy(user_message)
-        elif category == "product":
-            result = handle_product(user_message)
-        elif category == "price":
-            # 대화 히스토리를 price 핸들러에 전달
-            conversation_history = []
-            for user_msg, bot_msg in history:
-                conversation_history.append({"role": "user", "content": user_msg})
-                conversation_history.append({"role": "assistant", "content": bot_msg})
-            result = handle_price(user_message, conversation_history)
-        elif category == "faq":
-            result = handle_faq(user_message)
-        elif category == "search":
-            result = handle_search(user_message)
-        elif category == "product_list":
-            result = handle_product_list(user_message)
-        elif category == "product_check":
-            result = handle_product_check(user_message)
-        else:
-            result = handle_search(user_message)
-        
-        save_chat_log(user_id, user_message, result.get("response", str(result)))
-        # 히스토리 저장 (모든 분기에서 공통)
-        history.append((user_message, result.get("response", str(result))))
-        user_histories[user_id] = history
-        return jsonify(result)
+@app.route('/chat/stream', methods=['POST'])
+def chat_stream():
+    """
+    스트리밍 챗봇 엔드포인트 (Server-Sent Events)
+    - category: 분류된 카테고리
+    - result: 요약된 검색 결과 하나 (search/product/policy/export)
+    - token: LLM 응답 조각 (faq/simple_info)
+    - done: 최종 응답 ({"response", "type"}, /chat 응답과 동일) / error: 오류
+    """
+    data = request.get_json() or {}
+    user_message = data.get('message', '')
+    user_id = data.get('user_id', 'anonymous')
+
+    if not user_message:
+        return jsonify({"error": "메시지가 필요합니다."}), 400
+
+    events = queue.Queue()
+
+    def worker():
+        with streaming(lambda event, payload: events.put((event, payload))):
+            try:
+                with request_timer() as timer:
+                    result = process_chat(user_id, user_message)
+                events.put(("done", with_timings(result, timer, data)))
+            except Exception as e:
+                print(f"[API 오류] {e}")
+                events.put(("error", {"error": str(e)}))
+
+    threading.Thread(target=worker, daemon=True).start()
+
+    def generate():
+        while True:
+            event, payload = events.get()
+            yield format_sse(event, payload)
+            if event in ("done", "error"):
+                break
+
+    return Response(generate(), mimetype='text/event-stream', headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.route('/price/batch', methods=['POST'])
+def price_batch():
+    """
+    여러 품목 × 여러 날짜 시세 일괄 조회 엔드포인트
+    - products: 품목 목록 (또는 쉼표로 구분한 문자열)
+    - dates: 날짜 목록 (YYYYMMDD 또는 '오늘', '어제', '7월 24일' 등), 생략 시 오늘
+    - start_date / end_date: 날짜 범위 (dates 대신 사용)
+    """
+    try:
+        data = request.get_json() or {}
+        products = data.get('products') or []
+        if isinstance(products, str):
+            products = [p.strip() for p in products.split(',') if p.strip()]
+        if not products:
+            return jsonify({"error": "품목이 필요합니다."}), 400
+
+        def to_yyyymmdd(value):
+            value = str(value).strip()
+            return value if re.fullmatch(r'\d{8}', value) else parse_korean_date(value)
+
+        dates = [to_yyyymmdd(d) for d in (data.get('dates') or [])]
+        start_date = to_yyyymmdd(data['start_date']) if data.get('start_date') else None
+        end_date = to_yyyymmdd(data['end_date']) if data.get('end_date') else None
+        if None in dates or (data.get('start_date') and not start_date) or (data.get('end_date') and not end_date):
+            return jsonify({"error": "날짜를 인식하지 못했습니다."}), 400
+        if not dates and not (start_date and end_date):
+            dates = [kst_now().strftime('%Y%m%d')]
+
+        try:
+            prices = get_prices_batch(products, dates, start_date, end_date)
+        except Exception:
+            # 조회 실패는 '데이터 없음'({})과 구분되도록 503으로 응답
+            return jsonify({"error": "시세 정보를 조회하는 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요."}), 503
+        return jsonify({"prices": prices, "type": "price_batch"})
     except Exception as e:
         print(f"[API 오류] {e}")
         return jsonify({"error": str(e)}), 500
@@ -275,7 +327,28 @@ def chat():
 @app.route('/health', methods=['GET'])
 def health_check():
     """헬스 체크 엔드포인트"""
-    return jsonify({"status": "healthy", "timestamp": datetime.now().isoformat()})
+    return jsonify({
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "router": get_router_stats(),
+        "classify_cache": get_classify_cache_stats(),
+        "tavily_cache": get_tavily_cache_stats(),
+        "chat_log": chat_log_writer.stats(),
+        "history": user_histories.stats(),
+        "answer_cache": answer_cache.stats(),
+        "price_cache": get_price_cache_stats(),
+        "product_catalog": catalog_stats()
+    })
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus 형식 지표 (단계별 소요 시간 히스토그램, 카테고리별 요청 수)"""
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/usage', methods=['GET'])
+def usage():
+    """날짜별(?day=YYYYMMDD, 기본 오늘) LLM 토큰 사용량/예상 비용: 전체, 카테고리별, 많이 사용한 사용자"""
+    return jsonify(usage_totals.report(request.args.get('day')))
 
 @app.route('/')
 def chat_ui():
@@ -0,0 +1,186 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from classify_cache import normalize_message, TRAILING_ENDINGS
+from product_matcher import find_products
+from text_similarity import ngram_vector, cosine
+from intent_router import PRICE_WORDS, DATE_TIME_WORDS
+
+# 사용자 간 답변 캐시 (분류 후, 핸들러 호출 전에 확인)
+# 같은 카테고리로 분류된 최근 질문과 글자 n-gram 유사도가 ANSWER_CACHE_THRESHOLD 이상이면 저장된 답변을 그대로 반환합니다.
+# ('감자 제철 언제야?' / '감자 제철 시기 알려줘')
+# - 카테고리별 유지 시간: 시세(price)와 날짜/시간(simple_info) 등 시점에 따라 달라지는 답변은 저장하지 않음
+# - 언급한 품목과 숫자(연도 등)가 다르면 유사해도 다른 질문으로 봄 ('감자 제철' ≠ '고구마 제철')
+# - 의도 표현을 뺀 단어 집합도 같아야 함 ('지원사업 신청 방법' ≠ '지원사업 신청 자격')
+# - 이전 대화가 있는 사용자의 질문 중 앞 대화를 가리키는 질문('어제는?', '그거 더 알려줘')은 조회/저장하지 않음
+ANSWER_CACHE_TTL = {
+    "faq": int(os.getenv("ANSWER_CACHE_TTL_FAQ", str(24 * 3600))),
+    "product": int(os.getenv("ANSWER_CACHE_TTL_PRODUCT", str(12 * 3600))),
+    "policy": int(os.getenv("ANSWER_CACHE_TTL_POLICY", str(6 * 3600))),
+    "export": int(os.getenv("ANSWER_CACHE_TTL_EXPORT", str(6 * 3600))),
+    "search": int(os.getenv("ANSWER_CACHE_TTL_SEARCH", str(10 * 60))),
+}
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.9"))
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1000"))
+ANSWER_CACHE_NGRAM_SIZES = (2, 3)
+# 질문 의도와 상관없이 붙는 표현 (끝 어미를 정리한 메시지에서 긴 것부터 제거)
+ANSWER_CACHE_STOPWORDS = sorted([
+    "알려주세요", "알려줘", "알려", "궁금해요", "궁금해", "궁금", "언제", "시기", "뭐야", "뭔가요", "무엇", "어때", "어떻게",
+    "좀", "요즘", "혹시",
+], key=len, reverse=True)
+# 시세/날짜처럼 매번 새로 답해야 하는 질문은 비슷한 질문의 답변을 재사용하지 않음
+ANSWER_CACHE_SKIP_WORDS = PRICE_WORDS + DATE_TIME_WORDS + ["오늘", "어제", "그제", "내일", "모레", "이번주", "지난주", "저번주"]
+# 앞 대화를 가리키는 표현 (후속 질문)
+FOLLOW_UP_WORDS = ["그거", "그건", "그것", "이거", "이건", "저거", "거기", "그럼", "그러면", "그래서", "아까", "방금", "더알려", "자세히", "다른거", "또"]
+# 공백 제거 후 이 길이 이하인 짧은 질문('어제는?', '그럼 감자는?')은 후속 질문으로 봄
+FOLLOW_UP_MAX_CHARS = 5
+# 단어 끝 조사 (단어 집합 비교 시 제거)
+_PARTICLE_SUFFIX = re.compile(r'(으로|이랑|이|가|은|는|을|를|도|의|에|로|랑)$')
+# 일시적인 오류/검색 실패 응답은 저장하지 않음
+UNCACHEABLE_RESPONSES = {
+    "관련 정보가 검색되지 않았습니다.",
+    "검색 서비스를 이용할 수 없습니다. 잠시 후 다시 시도해주세요.",
+    "농산물 정보 검색 서비스를 이용할 수 없습니다. 잠시 후 다시 시도해주세요.",
+}
+
+
+def content_words(user_message):
+    """의도 표현/끝 어미/조사를 뺀 단어 목록 ('청년농업인 지원사업 신청 자격이 뭐야?' → 청년농업인, 지원사업, 신청, 자격)"""
+    words = []
+    for token in user_message.lower().split():
+        token = re.sub(r'[\W_]+', '', token)
+        for ending in TRAILING_ENDINGS:
+            if token.endswith(ending) and len(token) > len(ending) + 1:
+                token = token[:-len(ending)]
+                break
+        for stopword in ANSWER_CACHE_STOPWORDS:
+            token = token.replace(stopword, "")
+        stripped = _PARTICLE_SUFFIX.sub("", token)
+        if len(stripped) >= 2:
+            token = stripped
+        if token:
+            words.append(token)
+    return words
+
+
+def refers_to_conversation(user_message):
+    """앞 대화를 가리키는 후속 질문이면 True ('그거 더 알려줘', '어제는?'처럼 지시어가 있거나 아주 짧은 질문)"""
+    compact = re.sub(r'\s+', '', user_message)
+    if any(w in compact for w in FOLLOW_UP_WORDS):
+        return True
+    return len(re.sub(r'[\W_]+', '', compact)) <= FOLLOW_UP_MAX_CHARS
+
+
+def is_cacheable_question(user_message, history=None):
+    """시세/날짜 질문이 아니고, 이전 대화가 있으면 앞 대화를 가리키는 후속 질문이 아닐 때 True"""
+    compact = re.sub(r'\s+', '', user_message)
+    if any(w in compact for w in ANSWER_CACHE_SKIP_WORDS):
+        return False
+    return not (history and refers_to_conversation(user_message))
+
+
+class AnswerCache:
+    """
+    - lookup(user_message, category, history): 같은 카테고리로 저장된 비슷한 질문의 결과 또는 None
+    - store(user_message, category, result, history): 저장 대상 카테고리의 정상 응답만 저장
+      (history: 그 사용자의 최근 대화, 있고 질문이 앞 대화를 가리키면 조회/저장하지 않음)
+    - stats(): 크기, 조회/적중 횟수, 적중률, 카테고리별 적중 횟수
+    """
+
+    def __init__(self, max_entries=ANSWER_CACHE_MAX_ENTRIES, threshold=ANSWER_CACHE_THRESHOLD, ttl=None):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl = ANSWER_CACHE_TTL if ttl is None else ttl
+        self.uncacheable = set(UNCACHEABLE_RESPONSES)
+        self._entries = OrderedDict()  # id -> (vector, guard, category, result, expires_at)
+        self._postings = {}  # n-gram -> {id}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.stores = 0
+        self.category_hits = {}
+
+    def _features(self, user_message):
+        vector = ngram_vector(normalize_message(user_message), ANSWER_CACHE_NGRAM_SIZES, ANSWER_CACHE_STOPWORDS)
+        guard = (
+            frozenset(find_products(user_message)),
+            frozenset(re.findall(r'\d+', user_message)),
+            frozenset(content_words(user_message)),
+        )
+        return vector, guard
+
+    def _remove(self, entry_id):
+        vector = self._entries.pop(entry_id)[0]
+        for g in vector:
+            ids = self._postings.get(g)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids:
+                    del self._postings[g]
+
+    def lookup(self, user_message, category, history=None):
+        if self.ttl.get(category, 0) <= 0 or not is_cacheable_question(user_message, history):
+            return None
+        vector, guard = self._features(user_message)
+        now = time.time()
+        with self._lock:
+            self.lookups += 1
+            candidates = set()
+            for g in vector:
+                candidates |= self._postings.get(g, set())
+            best_id, best_score = None, 0.0
+            for entry_id in candidates:
+                entry_vector, entry_guard, entry_category, _, expires_at = self._entries[entry_id]
+                if expires_at <= now or entry_category != category or entry_guard != guard:
+                    continue
+                score = cosine(vector, entry_vector)
+                if score > best_score:
+                    best_id, best_score = entry_id, score
+            if best_id is None or best_score < self.threshold:
+                return None
+            result = self._entries[best_id][3]
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            self.category_hits[category] = self.category_hits.get(category, 0) + 1
+        print(f"[DEBUG] 답변 캐시 적중: {category} (유사도 {best_score:.2f})")
+        return dict(result)
+
+    def store(self, user_message, category, result, history=None):
+        ttl = self.ttl.get(category, 0)
+        if ttl <= 0 or result.get("response") in self.uncacheable:
+            return False
+        if not is_cacheable_question(user_message, history):
+            return False
+        vector, guard = self._features(user_message)
+        if not vector:
+            return False
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (vector, guard, category, dict(result), time.time() + ttl)
+            for g in vector:
+                self._postings.setdefault(g, set()).add(entry_id)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+            self.stores += 1
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._postings.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "stores": self.stores,
+                "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+                "category_hits": dict(self.category_hits),
+            }
@@ -0,0 +1,190 @@
+import asyncio
+import contextvars
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.wsgi import WsgiToAsgi
+import agriculture_chatbot as chatbot
+from clients import get_async_openai_client
+from classify_cache import cached_classifier
+from intent_router import classify_async
+from stream_events import streaming, emit, complete_text_async, format_sse
+from metrics import request_timer, set_category, span, timed
+from llm_accounting import chat_completion_async
+
+# 비동기 실행 모드 (ASGI): uvicorn asgi:application --host 0.0.0.0 --port 5000
+# - POST /chat, /chat/stream은 이벤트 루프에서 처리해 I/O를 기다리는 대화가 작업 스레드를 붙잡지 않음
+#   (LLM 분류와 simple_info 답변은 AsyncOpenAI로 호출)
+# - 나머지 핸들러(Tavily/Oracle/요약)는 기존 동기 함수를 그대로 제한된 스레드 풀에서 실행 (반환 형식 동일)
+# - 그 외 경로(/, /health, /price/batch 등)는 기존 Flask 앱으로 전달
+ASYNC_HANDLER_POOL_SIZE = int(os.getenv("ASYNC_HANDLER_POOL_SIZE", "32"))
+
+_handler_executor = ThreadPoolExecutor(max_workers=ASYNC_HANDLER_POOL_SIZE, thread_name_prefix="handler")
+flask_app = WsgiToAsgi(chatbot.app)
+
+
+async def run_blocking(func, *args):
+    """동기 함수를 핸들러 스레드 풀에서 실행합니다. (스트리밍 이벤트 전달을 위해 contextvars 복사)"""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_handler_executor, context.run, func, *args)
+
+
+@cached_classifier
+@timed("classify_llm")
+async def classify_category_llm_async(user_message):
+    completion = await chat_completion_async(
+        get_async_openai_client(), "classify_llm",
+        model="gpt-4o-2024-05-13",
+        messages=[{"role": "user", "content": chatbot.build_classify_prompt(user_message)}],
+        max_tokens=10,
+        temperature=0
+    )
+    return chatbot.parse_category(completion.choices[0].message.content)
+
+
+async def process_chat_async(user_id, user_message):
+    """agriculture_chatbot.process_chat의 비동기 버전 (같은 결과 반환)"""
+    # 대화 히스토리 가져오기 (최대 3턴)
+    # 세션 저장소(sqlite/redis)와 답변 캐시는 블로킹 I/O일 수 있으므로 이벤트 루프가 아닌 스레드 풀에서 호출
+    with span("history"):
+        history = await run_blocking(chatbot.user_histories.get, user_id)
+
+    context_category = chatbot.resolve_context_category(history, user_message)
+    # 이전 대화 컨텍스트가 없으면 일반 분류 수행
+    with span("classify"):
+        category = context_category or await classify_async(user_message, classify_category_llm_async)
+    print(f"[DEBUG] 분류된 카테고리: {category}")
+    set_category(category)
+    emit("category", {"category": category})
+
+    # 같은 카테고리의 비슷한 질문에 최근 답변한 적이 있으면 핸들러 호출 없이 재사용
+    with span("answer_cache"):
+        cached = None if context_category else await run_blocking(chatbot.answer_cache.lookup, user_message, category, history)
+    if cached:
+        with span("finish"):
+            await run_blocking(chatbot.finish_chat, user_id, user_message, cached, category)
+        return cached
+
+    with span("handler"):
+        if category == "simple_info":
+            result = {
+                "response": await complete_text_async(get_async_openai_client(), **chatbot.build_simple_info_request(user_message)),
+                "type": "simple_info"
+            }
+        else:
+            result = await run_blocking(chatbot.dispatch_handler, category, user_message, history)
+
+    if not context_category:
+        await run_blocking(chatbot.answer_cache.store, user_message, category, result, history)
+    with span("finish"):
+        await run_blocking(chatbot.finish_chat, user_id, user_message, result, category)
+    return result
+
+
+async def _read_json(receive):
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    try:
+        return json.loads(body or b"{}")
+    except ValueError:
+        return None
+
+
+async def _send_json(send, status, data):
+    body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json; charset=utf-8"), (b"content-length", str(len(body)).encode())]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def chat(scope, receive, send):
+    """POST /chat (비동기)"""
+    data = await _read_json(receive) or {}
+    user_message = data.get('message', '')
+    user_id = data.get('user_id', 'anonymous')
+
+    if not user_message:
+        await _send_json(send, 400, {"error": "메시지가 필요합니다."})
+        return
+
+    try:
+        with request_timer() as timer:
+            result = await process_chat_async(user_id, user_message)
+    except Exception as e:
+        print(f"[API 오류] {e}")
+        await _send_json(send, 500, {"error": str(e)})
+        return
+    await _send_json(send, 200, chatbot.with_timings(result, timer, data))
+
+
+async def chat_stream(scope, receive, send):
+    """POST /chat/stream (비동기, 이벤트 형식은 Flask 버전과 동일)"""
+    data = await _read_json(receive) or {}
+    user_message = data.get('message', '')
+    user_id = data.get('user_id', 'anonymous')
+
+    if not user_message:
+        await _send_json(send, 400, {"error": "메시지가 필요합니다."})
+        return
+
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+
+    def push(event, payload):
+        # 핸들러 스레드에서도 호출되므로 이벤트 루프를 통해 전달
+        loop.call_soon_threadsafe(events.put_nowait, (event, payload))
+
+    async def worker():
+        with streaming(push):
+            try:
+                with request_timer() as timer:
+                    result = await process_chat_async(user_id, user_message)
+                push("done", chatbot.with_timings(result, timer, data))
+            except Exception as e:
+                print(f"[API 오류] {e}")
+                push("error", {"error": str(e)})
+
+    task = asyncio.create_task(worker())
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"text/event-stream; charset=utf-8"), (b"cache-control", b"no-cache"), (b"x-accel-buffering", b"no")]
+    })
+    while True:
+        event, payload = await events.get()
+        await send({"type": "http.response.body", "body": format_sse(event, payload).encode("utf-8"), "more_body": True})
+        if event in ("done", "error"):
+            break
+    await send({"type": "http.response.body", "body": b"", "more_body": False})
+    await task
+
+
+ROUTES = {
+    "/chat": chat,
+    "/chat/stream": chat_stream,
+}
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                _handler_executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    view = ROUTES.get(scope["path"]) if scope["type"] == "http" and scope["method"] == "POST" else None
+    if view is not None:
+        await view(scope, receive, send)
+    else:
+        await flask_app(scope, receive, send)
@@ -0,0 +1,237 @@
+"""
+요청마다 실행되는 파싱/매칭 함수 마이크로 벤치마크
+
+    python benchmarks/bench_hotpaths.py                     # 전체 측정 (초당 호출 수, 메모리 할당)
+    python benchmarks/bench_hotpaths.py -k price date       # 이름에 price 또는 date가 들어간 항목만
+    python benchmarks/bench_hotpaths.py --save-baseline     # 결과를 기준값 파일에 저장
+    python benchmarks/bench_hotpaths.py --check             # 기준값보다 --threshold 이상 나빠지면 종료 코드 1
+
+- ops/sec: 고정된 질문 목록(PRICE_QUERIES 등)을 반복 호출해 --min-time초 동안 측정, --repeat번 중 가장 빠른 값
+- alloc: tracemalloc으로 측정한 한 바퀴(목록 전체) 동안의 최대 추가 메모리(KB)와 호출 후에도 남은 메모리(KB)
+- 함수 안의 [DEBUG] 출력은 측정에서 제외 (stdout을 os.devnull로 보냄)
+- 보정: 매번 같은 순수 파이썬 작업(CALIBRATION)의 초당 호출 수도 함께 재고, --check는 기준값을 저장할 때와의
+  속도 비율만큼 기준값을 보정해 비교 (다른 머신/부하에서도 비교 가능, 그래도 CI 머신에서 다시 저장하는 것을 권장)
+"""
+import argparse
+import contextlib
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("TAVILY_CACHE_PATH", "")
+# 품목 카탈로그를 DB에서 읽는 백그라운드 스레드가 측정에 섞이지 않도록 product_list.py 목록만 사용
+os.environ.setdefault("PRODUCT_CATALOG_FROM_DB", "false")
+
+from handlers.price_handler import parse_price_query, parse_korean_date, extract_date_phrases  # noqa: E402
+from handlers.product_check_handler import extract_item_name  # noqa: E402
+from intent_router import is_product_check_query  # noqa: E402
+from summarizer import filter_ad_lines  # noqa: E402
+from product_matcher import find_products, build_matcher  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hotpaths_baseline.json")
+
+PRICE_QUERIES = [
+    "오늘 배추 시세 알려줘",
+    "감자 가격 얼마야?",
+    "어제 양파 가격이랑 오늘 가격 비교해줘",
+    "저번주 금요일 사과 시세",
+    "7월 24일 방울 토마토 가격",
+    "2024년 3월 5일 딸기 단가 알려줘",
+    "지난달 15일 대파 시세는?",
+    "이번주 월요일 고구마랑 감자 가격",
+    "옥수수 시세 좀 알려줄래",
+    "그제 청양고추 가격 어땠어?",
+    "6월 30일이랑 7월 1일 수박 가격 비교",
+    "요즘 마늘 시세 어때",
+]
+DATE_PHRASES = [
+    "오늘", "어제", "그제", "이번주 월요일", "저번주 금요일", "지난주수요일", "지난달 15일", "저번달",
+    "7월 24일", "2024년 3월 5일", "2023-11-02", "12월 1일", "이번주일요일", "날짜 없음",
+]
+PRODUCT_CHECK_QUERIES = [
+    "고추도 팔아?",
+    "망고도 있나요?",
+    "감자 팔아?",
+    "배추는 안팔아?",
+    "고등어는 안 팔아요?",
+    "아보카도 판매해?",
+    "블루베리 취급하나요?",
+    "옥수수 살 수 있어?",
+    "오늘 날씨 어때?",
+    "반품은 어떻게 해?",
+    "딸기 제철 언제야",
+    "양파도 구매 가능해요?",
+]
+SEARCH_RESULTS = [
+    "\n".join([
+        "올해 배추 작황은 기상 여건이 좋아 평년보다 생산량이 늘어날 전망이다.",
+        "산지 출하가 본격화되면서 도매시장 반입량도 증가하고 있다.",
+        "[이벤트] 지금 주문하면 배송비 무료! 고객님 전용 특가 할인",
+        "농촌진흥청은 병해충 예방을 위해 적기 방제를 당부했다.",
+        "도화농부 블로그 프로필에서 직거래 상담 신청하세요",
+        "김장철을 앞두고 소비자 가격은 안정세를 보일 것으로 예상된다.",
+    ] * 3),
+    "\n".join([
+        "감자는 서늘하고 통풍이 잘 되는 곳에 보관하는 것이 좋다.",
+        "햇빛에 노출되면 껍질이 녹색으로 변하고 솔라닌이 생긴다.",
+        "예약 판매 중인 햇감자, 문의는 프로필 링크로",
+        "사과와 함께 보관하면 싹이 나는 것을 늦출 수 있다.",
+    ] * 5),
+    "수출 농식품 지원 사업 공고\n신청 기간: 3월 1일 ~ 3월 31일\n포장재 지원 및 물류비 지원\n문의: 지역 농업기술센터",
+]
+MATCH_QUERIES = PRICE_QUERIES + PRODUCT_CHECK_QUERIES + [
+    "방울토마토랑 토마토 중에 뭐가 더 싸?",
+    "수수랑 옥수수 둘 다 있어?",
+    "청양 고추와 꽈리고추 가격",
+    "귤 한라봉 천혜향 레드향 시세 비교해줘",
+]
+
+CALIBRATION = "_calibration"
+_CALIBRATION_PATTERN = re.compile(r"([0-9]{1,2})월[ ]*([0-9]{1,2})일|오늘|어제")
+
+
+def _calibrate(text):
+    """측정 대상 함수와 비슷한 종류의 작업(정규식, 문자열 분리/치환, dict 조회)만 하는 고정 작업"""
+    counts = {}
+    for word in text.replace("?", " ").split():
+        counts[word[:2]] = counts.get(word[:2], 0) + 1
+    return _CALIBRATION_PATTERN.search(text), sorted(counts)
+
+
+# 이름: (함수, 입력 목록)
+BENCHMARKS = {
+    "parse_price_query": (parse_price_query, PRICE_QUERIES),
+    "parse_price_query_multi": (lambda q: parse_price_query(q, multi=True), PRICE_QUERIES),
+    "parse_korean_date": (parse_korean_date, DATE_PHRASES),
+    "extract_date_phrases": (extract_date_phrases, PRICE_QUERIES),
+    "extract_item_name": (extract_item_name, PRODUCT_CHECK_QUERIES),
+    "is_product_check_query": (is_product_check_query, PRODUCT_CHECK_QUERIES),
+    "filter_ad_lines": (filter_ad_lines, SEARCH_RESULTS),
+    "find_products": (find_products, MATCH_QUERIES),
+    "build_matcher": (lambda _: build_matcher(), [None]),
+}
+
+
+def _run_pass(func, inputs):
+    for value in inputs:
+        func(value)
+
+
+def measure_ops(func, inputs, min_time, repeat):
+    """min_time초 이상 반복 호출한 초당 호출 수 (repeat번 중 최댓값)"""
+    best = 0.0
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time:
+            _run_pass(func, inputs)
+            calls += len(inputs)
+            elapsed = time.perf_counter() - start
+        best = max(best, calls / elapsed)
+    return best
+
+
+def measure_alloc(func, inputs):
+    """(한 바퀴 동안의 최대 추가 메모리 KB, 끝난 뒤 남은 메모리 KB)"""
+    _run_pass(func, inputs)  # 캐시/정규식 컴파일 등 첫 호출 비용 제외
+    tracemalloc.start()
+    try:
+        _run_pass(func, inputs)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024, retained / 1024
+
+
+def run(names, min_time, repeat):
+    results = {}
+    for name in names:
+        func, inputs = BENCHMARKS[name]
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            ops = measure_ops(func, inputs, min_time, repeat)
+            peak_kb, retained_kb = measure_alloc(func, inputs)
+        results[name] = {"ops_per_sec": round(ops, 1), "peak_kb": round(peak_kb, 2), "retained_kb": round(retained_kb, 2)}
+        print(f"{name:26s} {ops:12,.0f} ops/s  {peak_kb:8.2f} KB peak  {retained_kb:8.2f} KB retained")
+    return results
+
+
+def measure_calibration(min_time, repeat):
+    return measure_ops(_calibrate, PRICE_QUERIES, min_time, repeat)
+
+
+def compare(results, baseline, threshold, calibration=None):
+    """
+    기준값 대비 초당 호출 수가 threshold 비율 이상 줄었거나 최대 메모리가 그만큼 늘어난 항목
+    calibration과 기준값 파일의 보정값이 모두 있으면 두 값의 비율(이 머신의 상대 속도)만큼 기준 초당 호출 수를 보정합니다.
+    """
+    speed = 1.0
+    base_calibration = baseline.get(CALIBRATION, {}).get("ops_per_sec")
+    if calibration and base_calibration:
+        speed = calibration / base_calibration
+    failures = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base or name == CALIBRATION:
+            continue
+        expected = base["ops_per_sec"] * speed
+        if current["ops_per_sec"] < expected * (1 - threshold):
+            failures.append(f"{name}: {current['ops_per_sec']:,.0f} ops/s < 보정 기준값 {expected:,.0f} ops/s (기준값 {base['ops_per_sec']:,.0f} × 상대 속도 {speed:.2f})")
+        # 아주 작은 값은 측정 오차가 크므로 1KB 여유를 둠
+        if current["peak_kb"] > base["peak_kb"] * (1 + threshold) + 1:
+            failures.append(f"{name}: 최대 메모리 {current['peak_kb']}KB > 기준값 {base['peak_kb']}KB")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="파싱/매칭 함수 마이크로 벤치마크")
+    parser.add_argument("-k", nargs="*", default=None, help="이름에 포함된 문자열로 항목 선택")
+    parser.add_argument("--min-time", type=float, default=0.2, help="항목별 1회 측정 시간(초)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="기준값 대비 나빠졌으면 실패")
+    parser.add_argument("--threshold", type=float, default=0.3, help="허용하는 성능 저하 비율 (기본 30%%)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로도 출력")
+    args = parser.parse_args()
+
+    names = [n for n in BENCHMARKS if not args.k or any(k in n for k in args.k)]
+    calibration = measure_calibration(args.min_time, args.repeat)
+    print(f"{'(보정) ' + CALIBRATION:26s} {calibration:12,.0f} ops/s")
+    results = run(names, args.min_time, args.repeat)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        baseline[CALIBRATION] = {"ops_per_sec": round(calibration, 1)}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+        print(f"\n기준값 저장: {args.baseline}")
+
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"\n[참고] 기준값 파일이 없습니다: {args.baseline} (--save-baseline으로 생성)")
+            sys.exit(0)
+        with open(args.baseline, encoding="utf-8") as f:
+            failures = compare(results, json.load(f), args.threshold, calibration)
+        for failure in failures:
+            print(f"[실패] {failure}")
+        if failures:
+            print(f"\n{len(failures)}개 항목이 기준값보다 나빠졌습니다.")
+            sys.exit(1)
+        print("\n모든 항목이 기준값 범위 안입니다.")
+
+
+if __name__ == "__main__":
+    main()
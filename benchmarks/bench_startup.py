@@ -0,0 +1,117 @@
+"""
+agriculture_chatbot 기동(import) 시간 측정
+
+    python benchmarks/bench_startup.py                      # 5회 측정, 중앙값/최대값 출력
+    python benchmarks/bench_startup.py --importtime         # 가장 오래 걸린 모듈 상위 15개
+    python benchmarks/bench_startup.py --save-baseline      # 결과를 기준값 파일에 저장
+    python benchmarks/bench_startup.py --check              # 기준값보다 --threshold 이상 느려지면 종료 코드 1
+
+매 측정은 새 파이썬 프로세스에서 실행하며, 외부 서비스에 접속하지 않도록 더미 환경 변수를 사용합니다.
+(import 시점에 MongoDB/OpenAI/오라클에 접속하거나 무거운 패키지를 불러오면 여기서 드러납니다)
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_baseline.json")
+# import 시점에 불러오면 안 되는 무거운 패키지 (처음 사용할 때 불러옴)
+LAZY_MODULES = ["openai", "httpx", "pymongo", "oracledb", "langchain"]
+
+MEASURE_CODE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    env.update({
+        "OPENAI_API_KEY": "bench",
+        "TAVILY_API_KEY": "bench",
+        "MONGO_CLUSTER_URI": "mongodb://127.0.0.1:1/?serverSelectionTimeoutMS=100",
+        "TAVILY_CACHE_PATH": "",
+    })
+    return env
+
+
+def measure_once(module):
+    code = MEASURE_CODE.format(module=module, lazy=LAZY_MODULES)
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=_env(), capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def top_imports(module, limit=15):
+    """python -X importtime 결과에서 module이 직접 불러온 모듈 중 누적 시간이 큰 순서"""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT, env=_env(), capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        # 이름 앞 들여쓰기: 최상위 1칸, module이 직접 불러온 모듈 3칸
+        if len(name) - len(name.lstrip()) == 3:
+            rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="agriculture_chatbot 기동 시간 측정")
+    parser.add_argument("--module", default="agriculture_chatbot")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--importtime", action="store_true", help="모듈별 import 시간 상위 목록 출력")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="기준값 대비 느려졌으면 실패")
+    parser.add_argument("--threshold", type=float, default=0.25, help="허용하는 중앙값 증가 비율 (기본 25%%)")
+    args = parser.parse_args()
+
+    # 첫 실행은 .pyc 생성 시간이 섞이므로 버림
+    measure_once(args.module)
+    runs = [measure_once(args.module) for _ in range(args.runs)]
+    seconds = [r["seconds"] for r in runs]
+    loaded = sorted({m for r in runs for m in r["loaded"]})
+    result = {
+        "module": args.module,
+        "runs": args.runs,
+        "median_seconds": round(statistics.median(seconds), 4),
+        "max_seconds": round(max(seconds), 4),
+        "eager_heavy_modules": loaded,
+    }
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+    if args.importtime:
+        print("\n누적 import 시간 상위 모듈 (ms)")
+        for cumulative_us, name in top_imports(args.module):
+            print(f"{cumulative_us / 1000:10.1f}  {name}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"\n기준값 저장: {args.baseline}")
+
+    if args.check:
+        failed = False
+        if loaded:
+            print(f"\n[실패] import 시점에 불러온 무거운 패키지: {', '.join(loaded)}")
+            failed = True
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+            limit = baseline["median_seconds"] * (1 + args.threshold)
+            if result["median_seconds"] > limit:
+                print(f"\n[실패] 기동 시간 {result['median_seconds']}s > 기준값 {baseline['median_seconds']}s × {1 + args.threshold:.2f}")
+                failed = True
+        else:
+            print(f"\n[참고] 기준값 파일이 없습니다: {args.baseline} (--save-baseline으로 생성)")
+        sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    크기 제한(LRU 제거)과 항목별 만료 시각을 지원하는 스레드 안전 캐시.
+    - set(key, value, expires_at=None): expires_at(epoch 초)이 None이면 만료되지 않음
+    - get(key): 없거나 만료된 항목이면 default 반환
+    - stats(): 크기, 적중/미적중/제거 횟수, 적중률
+    - dump(path) / load(path): 만료되지 않은 항목을 JSON 파일로 저장/복원 (키와 값이 JSON으로 표현 가능해야 함)
+    """
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._data = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, expires_at=None):
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def dump(self, path):
+        now = time.time()
+        with self._lock:
+            items = [[k, v, exp] for k, (v, exp) in self._data.items() if exp is None or exp > now]
+        # 여러 프로세스/스레드가 같은 파일에 저장해도 섞이지 않도록 저장할 때마다 다른 임시 파일에 쓴 뒤 교체
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, suffix=".tmp", delete=False) as f:
+            tmp_path = f.name
+            try:
+                json.dump(items, f, ensure_ascii=False)
+            except Exception:
+                f.close()
+                os.remove(tmp_path)
+                raise
+        os.replace(tmp_path, path)
+
+    def load(self, path):
+        if not os.path.exists(path):
+            return 0
+        with open(path, encoding="utf-8") as f:
+            items = json.load(f)
+        now = time.time()
+        loaded = 0
+        for k, v, exp in items:
+            if exp is None or exp > now:
+                self.set(k, v, exp)
+                loaded += 1
+        return loaded
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,240 @@
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from metrics import span
+
+# MongoDB 대화 로그 백그라운드 저장
+# 요청 처리 중에는 로그를 메모리 큐에 넣기만 하고, 백그라운드 스레드가 모아서 insert_many로 저장합니다.
+# MongoDB에 저장하지 못한 로그는 로컬 파일(JSONL)에 남겼다가 다음에 저장에 성공하면 다시 저장합니다.
+CHAT_LOG_QUEUE_SIZE = int(os.getenv("CHAT_LOG_QUEUE_SIZE", "10000"))
+CHAT_LOG_BATCH_SIZE = int(os.getenv("CHAT_LOG_BATCH_SIZE", "100"))
+# 배치가 다 차지 않아도 이 시간(초)이 지나면 저장
+CHAT_LOG_FLUSH_INTERVAL = float(os.getenv("CHAT_LOG_FLUSH_INTERVAL", "2"))
+# 큐가 가득 찼을 때 기다리는 최대 시간(초), 0이면 기다리지 않고 버림
+CHAT_LOG_BLOCK_TIMEOUT = float(os.getenv("CHAT_LOG_BLOCK_TIMEOUT", "0"))
+CHAT_LOG_SPILL_PATH = os.getenv("CHAT_LOG_SPILL_PATH", os.path.join(".cache", "chat_log_spill.jsonl"))
+# 보관 파일 최대 크기(바이트), 넘으면 더 보관하지 않고 버림 (MongoDB 장애가 길어져도 디스크를 채우지 않도록)
+CHAT_LOG_SPILL_MAX_BYTES = int(os.getenv("CHAT_LOG_SPILL_MAX_BYTES", str(50 * 1024 * 1024)))
+# 종료 시 남은 로그 저장을 기다리는 최대 시간(초)
+CHAT_LOG_SHUTDOWN_TIMEOUT = float(os.getenv("CHAT_LOG_SHUTDOWN_TIMEOUT", "10"))
+
+_DATETIME_FIELDS = ["timestamp"]
+# 이미 저장된 문서 (중복 키 오류는 다시 저장하지 않음)
+_DUPLICATE_KEY_ERROR = 11000
+
+
+class ChatLogWriter:
+    """
+    collection.insert_many로 로그를 모아서 저장하는 백그라운드 작성기
+    - submit(record): 큐에 넣기만 하고 바로 반환 (큐가 가득 차면 버리고 False)
+    - close(): 남은 로그를 저장하고 스레드 종료
+    - stats(): 큐 길이, 저장/버림/파일 보관/재저장 건수 (spill_overflow: 보관 파일이 가득 차서 버린 건수)
+    """
+
+    def __init__(self, collection, max_queue=CHAT_LOG_QUEUE_SIZE, batch_size=CHAT_LOG_BATCH_SIZE,
+                 flush_interval=CHAT_LOG_FLUSH_INTERVAL, spill_path=CHAT_LOG_SPILL_PATH, spill_max_bytes=CHAT_LOG_SPILL_MAX_BYTES):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self.spill_max_bytes = spill_max_bytes
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._counts = {"submitted": 0, "written": 0, "dropped": 0, "blocked": 0, "spilled": 0, "spill_overflow": 0, "replayed": 0, "failed_batches": 0}
+
+    def _count(self, name, n=1):
+        with self._stats_lock:
+            self._counts[name] += n
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="chat-log-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, record):
+        if self._stop.is_set():
+            self._spill([record])
+            return False
+        self.start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            if CHAT_LOG_BLOCK_TIMEOUT <= 0:
+                self._count("dropped")
+                return False
+            # 백프레셔: 잠시 기다렸다가 그래도 가득 차 있으면 버림
+            self._count("blocked")
+            try:
+                self._queue.put(record, timeout=CHAT_LOG_BLOCK_TIMEOUT)
+            except queue.Full:
+                self._count("dropped")
+                return False
+        self._count("submitted")
+        return True
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                batch.append(self._queue.get(timeout=max(0.0, min(deadline - time.monotonic(), 0.5))))
+            except queue.Empty:
+                pass
+            if len(batch) >= self.batch_size or (batch and time.monotonic() >= deadline):
+                self._flush(batch)
+                batch = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+        if batch:
+            self._flush(batch)
+
+    def _insert(self, records):
+        """
+        insert_many(ordered=False)로 저장하고 서버가 거부한 로그 목록을 반환합니다.
+        일부만 실패한 경우(BulkWriteError) 나머지는 이미 저장됐으므로 writeErrors의 인덱스에 해당하는 로그만 돌려줍니다.
+        그 밖의 오류(연결 실패 등)는 그대로 발생시킵니다.
+        """
+        try:
+            self.collection.insert_many([dict(r) for r in records], ordered=False)
+            return []
+        except Exception as e:
+            details = getattr(e, "details", None)
+            if not isinstance(details, dict) or "writeErrors" not in details:
+                raise
+            print(f"[MongoDB 일부 저장 오류] {len(details['writeErrors'])}건: {e}")
+            failed = {err["index"] for err in details["writeErrors"] if err.get("code") != _DUPLICATE_KEY_ERROR}
+            return [records[i] for i in sorted(failed)]
+
+    def _flush(self, batch):
+        try:
+            with span("mongo_write"):
+                failed = self._insert(batch)
+        except Exception as e:
+            print(f"[MongoDB 저장 오류] {e}")
+            self._count("failed_batches")
+            self._spill(batch)
+            return
+        self._count("written", len(batch) - len(failed))
+        self._replay_spill()
+        # 거부된 로그만 파일에 남겨 다음 저장 성공 때 한 번 더 시도 (이미 저장된 로그는 남기지 않아 중복 저장되지 않음)
+        if failed:
+            self._count("failed_batches")
+            self._spill(failed)
+
+    def _spill(self, records):
+        if not self.spill_path:
+            self._count("dropped", len(records))
+            return
+        written = size = 0
+        try:
+            with self._spill_lock:
+                directory = os.path.dirname(self.spill_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                size = os.path.getsize(self.spill_path) if os.path.exists(self.spill_path) else 0
+                with open(self.spill_path, "a", encoding="utf-8") as f:
+                    for record in records:
+                        line = json.dumps({k: v for k, v in record.items() if k != "_id"}, ensure_ascii=False, default=_json_default) + "\n"
+                        size += len(line.encode("utf-8"))
+                        if size > self.spill_max_bytes:
+                            break
+                        f.write(line)
+                        written += 1
+        except Exception as e:
+            print(f"[대화 로그 파일 저장 오류] {e}")
+        self._count("spilled", written)
+        if written < len(records):
+            if size > self.spill_max_bytes:
+                print(f"[대화 로그 파일 보관 한도 초과] {len(records) - written}건 버림 ({self.spill_path})")
+                self._count("spill_overflow", len(records) - written)
+            self._count("dropped", len(records) - written)
+
+    def _replay_spill(self):
+        """
+        파일에 남겨 둔 로그를 다시 저장 (MongoDB 저장에 성공한 직후 호출)
+        보관 파일을 .replay 파일 뒤에 이어 붙인 뒤 읽으므로, 이전 재저장 도중 종료되어 남은 .replay 파일의 로그도 함께 저장됩니다.
+        """
+        if not self.spill_path:
+            return
+        replay_path = f"{self.spill_path}.replay"
+        if not os.path.exists(self.spill_path) and not os.path.exists(replay_path):
+            return
+        with self._spill_lock:
+            try:
+                if os.path.exists(self.spill_path):
+                    with open(self.spill_path, encoding="utf-8") as src, open(replay_path, "a", encoding="utf-8") as dst:
+                        for line in src:
+                            dst.write(line)
+                    os.remove(self.spill_path)
+                with open(replay_path, encoding="utf-8") as f:
+                    records = [_restore(json.loads(line)) for line in f if line.strip()]
+            except Exception as e:
+                print(f"[대화 로그 파일 읽기 오류] {e}")
+                return
+        for i in range(0, len(records), self.batch_size):
+            chunk = records[i:i + self.batch_size]
+            try:
+                failed = self._insert(chunk)
+            except Exception as e:
+                print(f"[MongoDB 재저장 오류] {e}")
+                self._spill(records[i:])
+                break
+            self._count("replayed", len(chunk) - len(failed))
+            # 다시 저장해도 서버가 거부한 로그는 계속 거부되므로 파일에 다시 남기지 않고 버림
+            if failed:
+                self._count("dropped", len(failed))
+        os.remove(replay_path)
+
+    def close(self, timeout=CHAT_LOG_SHUTDOWN_TIMEOUT):
+        """남은 로그를 저장하고 종료합니다. 시간 안에 끝나지 않으면 큐에 남은 로그는 파일로 보관"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._thread is None or not self._thread.is_alive():
+            return
+        remaining = []
+        while True:
+            try:
+                remaining.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if remaining:
+            self._spill(remaining)
+
+    def stats(self):
+        with self._stats_lock:
+            counts = dict(self._counts)
+        counts["queue_size"] = self._queue.qsize()
+        return counts
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _restore(record):
+    for field in _DATETIME_FIELDS:
+        if isinstance(record.get(field), str):
+            try:
+                record[field] = datetime.fromisoformat(record[field])
+            except ValueError:
+                pass
+    return record
+
+
+def create_writer(collection):
+    """작성기를 만들고 프로세스 종료 시 남은 로그를 저장하도록 등록합니다."""
+    writer = ChatLogWriter(collection)
+    atexit.register(writer.close)
+    return writer
@@ -0,0 +1,109 @@
+import atexit
+import inspect
+import os
+import re
+import threading
+import time
+from functools import wraps
+from cache_utils import LRUCache
+
+# LLM 의도 분류 결과 캐시 (temperature=0 이라 같은 질문은 항상 같은 결과)
+# 공백/문장부호/끝 어미를 정리한 메시지를 키로 사용해 "반품 가능한가요?", "반품가능한가요" 등을 같은 질문으로 봅니다.
+CLASSIFY_CACHE_MAX_ENTRIES = int(os.getenv("CLASSIFY_CACHE_MAX_ENTRIES", "4096"))
+CLASSIFY_CACHE_TTL = int(os.getenv("CLASSIFY_CACHE_TTL", str(7 * 24 * 3600)))
+# 지정하면 재시작 후에도 캐시를 유지 (JSON 파일)
+CLASSIFY_CACHE_PATH = os.getenv("CLASSIFY_CACHE_PATH", "")
+CLASSIFY_CACHE_SAVE_EVERY = 50
+
+# 질문 끝에 붙는 어미/조사 (긴 것부터 제거)
+TRAILING_ENDINGS = sorted([
+    "인가요", "한가요", "할까요", "일까요", "나요", "까요", "가요", "세요", "어요", "아요", "해요",
+    "예요", "이에요", "에요", "니", "냐", "야", "요", "지", "죠", "줘", "해",
+], key=len, reverse=True)
+
+_cache = LRUCache(max_size=CLASSIFY_CACHE_MAX_ENTRIES)
+_writes_since_save = 0
+# _writes_since_save 증감과 파일 저장을 한 번에 하나씩 처리
+_save_lock = threading.Lock()
+
+
+def normalize_message(message):
+    """
+    분류 캐시 키용 메시지 정규화
+    - 소문자, 공백/문장부호 제거
+    - 끝 어미 하나 제거 (예: '반품 가능한가요?' → '반품가능')
+    """
+    text = re.sub(r'[\W_]+', '', message.lower())
+    for ending in TRAILING_ENDINGS:
+        if text.endswith(ending) and len(text) > len(ending) + 1:
+            return text[:-len(ending)]
+    return text
+
+
+def _store(key, category):
+    global _writes_since_save
+    _cache.set(key, category, time.time() + CLASSIFY_CACHE_TTL)
+    if CLASSIFY_CACHE_PATH:
+        with _save_lock:
+            _writes_since_save += 1
+            due = _writes_since_save >= CLASSIFY_CACHE_SAVE_EVERY
+        if due:
+            save_classify_cache()
+
+
+def cached_classifier(func):
+    """
+    func(user_message) 형태의 분류 함수 앞에 캐시를 둡니다. (async 함수도 지원)
+    """
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(user_message):
+            key = normalize_message(user_message)
+            if not key:
+                return await func(user_message)
+            category = _cache.get(key)
+            if category is not None:
+                print(f"[DEBUG] 분류 캐시 적중: {key} → {category}")
+                return category
+            category = await func(user_message)
+            _store(key, category)
+            return category
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(user_message):
+        key = normalize_message(user_message)
+        if not key:
+            return func(user_message)
+        category = _cache.get(key)
+        if category is not None:
+            print(f"[DEBUG] 분류 캐시 적중: {key} → {category}")
+            return category
+        category = func(user_message)
+        _store(key, category)
+        return category
+    return wrapper
+
+
+def save_classify_cache():
+    global _writes_since_save
+    if not CLASSIFY_CACHE_PATH:
+        return
+    with _save_lock:
+        try:
+            _cache.dump(CLASSIFY_CACHE_PATH)
+            _writes_since_save = 0
+        except Exception as e:
+            print(f"[DEBUG] 분류 캐시 저장 오류: {e}")
+
+
+def get_classify_cache_stats():
+    return _cache.stats()
+
+
+if CLASSIFY_CACHE_PATH:
+    try:
+        print(f"[DEBUG] 분류 캐시 복원: {_cache.load(CLASSIFY_CACHE_PATH)}건")
+    except Exception as e:
+        print(f"[DEBUG] 분류 캐시 복원 오류: {e}")
+    atexit.register(save_classify_cache)
@@ -0,0 +1,109 @@
+from dotenv import load_dotenv
+load_dotenv()
+import os
+import threading
+
+# 외부 호출용 공유 클라이언트 (핸들러와 agriculture_chatbot.py가 함께 사용)
+# 매 호출마다 TCP/TLS 연결을 새로 맺지 않도록 keep-alive 연결 풀을 재사용합니다.
+# 기동 시간을 줄이기 위해 openai/requests 패키지는 클라이언트를 처음 사용할 때 불러옵니다.
+# 호스트별 최대 연결 수 (Tavily 등 requests 세션)
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))
+# 연결 풀을 유지할 호스트 수
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))
+# true면 풀의 연결이 모두 사용 중일 때 새 연결을 만들지 않고 대기
+HTTP_POOL_BLOCK = os.getenv("HTTP_POOL_BLOCK", "false").lower() == "true"
+# OpenAI API 최대 동시 연결 수 / 유지할 keep-alive 연결 수
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "32"))
+OPENAI_MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "16"))
+
+_lock = threading.Lock()
+_http_session = None
+_openai_client = None
+_async_openai_client = None
+_mongo_client = None
+
+
+def get_http_session():
+    """keep-alive 연결 풀을 가진 공유 requests.Session"""
+    global _http_session
+    if _http_session is None:
+        with _lock:
+            if _http_session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=HTTP_POOL_MAXSIZE,
+                    pool_block=HTTP_POOL_BLOCK
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _http_session = session
+    return _http_session
+
+
+def get_openai_client():
+    """연결 풀 크기를 지정한 공유 OpenAI 클라이언트"""
+    global _openai_client
+    if _openai_client is None:
+        with _lock:
+            if _openai_client is None:
+                import httpx
+                from openai import OpenAI, DefaultHttpxClient
+                _openai_client = OpenAI(
+                    api_key=os.getenv("OPENAI_API_KEY"),
+                    http_client=DefaultHttpxClient(
+                        limits=httpx.Limits(
+                            max_connections=OPENAI_MAX_CONNECTIONS,
+                            max_keepalive_connections=OPENAI_MAX_KEEPALIVE
+                        )
+                    )
+                )
+    return _openai_client
+
+
+def get_async_openai_client():
+    """비동기 모드(asgi.py)용 공유 AsyncOpenAI 클라이언트 (이벤트 루프 안에서 처음 사용)"""
+    global _async_openai_client
+    if _async_openai_client is None:
+        with _lock:
+            if _async_openai_client is None:
+                import httpx
+                from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+                _async_openai_client = AsyncOpenAI(
+                    api_key=os.getenv("OPENAI_API_KEY"),
+                    http_client=DefaultAsyncHttpxClient(
+                        limits=httpx.Limits(
+                            max_connections=OPENAI_MAX_CONNECTIONS,
+                            max_keepalive_connections=OPENAI_MAX_KEEPALIVE
+                        )
+                    )
+                )
+    return _async_openai_client
+
+
+def get_chat_log_collection():
+    """대화 로그 MongoDB 컬렉션 (첫 로그 저장 시 pymongo를 불러와 연결)"""
+    global _mongo_client
+    if _mongo_client is None:
+        with _lock:
+            if _mongo_client is None:
+                from pymongo import MongoClient
+                _mongo_client = MongoClient(os.getenv("MONGO_CLUSTER_URI"))
+    return _mongo_client["chatbot_db"]["chat_logs"]
+
+
+class _LazyClient:
+    """처음 속성에 접근할 때 factory()로 만든 클라이언트에 위임 (모듈 수준 client 변수용)"""
+
+    def __init__(self, factory):
+        self._factory = factory
+
+    def __getattr__(self, name):
+        return getattr(self._factory(), name)
+
+
+# 핸들러에서 client = openai_client 로 사용 (import 시점에는 openai를 불러오지 않음)
+openai_client = _LazyClient(get_openai_client)
+chat_log_collection = _LazyClient(get_chat_log_collection)
@@ -1,27 +1,127 @@
-from dotenv import load_dotenv
-load_dotenv()
 import os
-from openai import OpenAI
+from clients import openai_client
+import re
+from text_similarity import NgramIndex, normalize_text
+from stream_events import complete_text, emit
+
+client = openai_client
+
+CUSTOMER_SERVICE_INFO = {
+    "반품": "제품 수령 후 2일 이내 반품 신청 가능합니다. 제품이 불량이거나 오배송일 경우에만 반품 가능합니다. 단순 변심 등 사유로는 반품 불가합니다. 반품 신청은 판매자 연락처로 접수 후 검수 후 환불 처리됩니다.",
+    "배송": "즉시구매일 경우, 오전 11시 이전 주문 시 당일 출하되고, 이후 주문 시 익일 출하됩니다.\n 예약 구매일 경우, 상품상세 페이지에 고시된 판매종료일자의 익일 출하됩니다.\n 배송은 출고 후 1~3일 소요됩니다. 배송사는 판매자별로 상이 할 수 있습니다.",
+    "결제": "신용카드, 토스페이 간편결제, 카카오페이 등 다양한 결제 방법을 지원합니다.",
+    "회원가입": "이메일 인증 후 가입이 완료됩니다.",
+    "가입 승인": "회원 가입 승인까지 영업일 기준 1~2일 소요됩니다. 승인 완료 시 문자 메세지를 보내드립니다.",
+    "상품 등록 제한": "등록이 제한되는 상품은 다음과 같습니다.\n- 유통기한이 지난 농산물\n- 가공식품, 반찬류, 탕류 등 가공품(곶감 제외)\n- 씨앗, 묘목, 농약, 비료 등 기타 금지 물품\n- 고기, 생선, 계란, 유제품 등 동물성 식품\n- 그 외 농산물에 해당하지 않는 기타 상품\n 상품등록시 안내사항에서 자세한 내용을 확인할 수 있습니다.\n 사이트에서 취급 중인 상품 목록을 알려드릴까요?",
+    "판매자 구매": "판매자로 가입하신 경우, 상품 구매도 가능합니다.",
+    "구매자 판매": "구매자로 가입하신 경우, 판매자로 재가입 하시거나 고객센터에 문의주세요.",
+    "고객센터 연락처": "고객센터 연락처는 010-1234-5678입니다.",
+    "배송 문의": "배송 문의는 판매자에게 문의주세요.",
+    "반품 문의": "반품 문의는 판매자에게 문의주세요.",
+    "판매자 문의": "판매자 정보는 상품 상세페이지의 상품카드나, 배송/반품정보 탭의 하단 '문의연락처'에서 확인할 수 있습니다.",
+    "상품 등록 유의사항": "- 상품명은 명확하게 작성해 주세요.\n - 상품 이미지는 1장 이상 등록해야 하며, 실제 상품과 동일해야 합니다.\n - 썸네일 이미지는 1장 등록 가능하며, 상품상세 이미지는 1장~3장 등록 가능합니다.\n - 상품 단위, 규격, 수량, 가격을 정확히 입력해 주세요.\n - 유통기한이 지난 상품이나 플랫폼에서 금지한 품목은 등록할 수 없습니다.\n - 욕설, 비방, 광고성 문구, 외부 링크는 작성할 수 없습니다.\n - 개인정보(연락처, 계좌번호 등)를 상품 설명에 포함하지 마세요.\n - 도배, 중복 등록된 상품은 관리자에 의해 삭제될 수 있습니다.\n - 타인의 이미지나 글을 무단으로 사용하는 경우 제재를 받을 수 있습니다.\n - 등록된 상품 정보가 사실과 다를 경우, 거래 제한 및 판매 중지 조치가 있을 수 있습니다.\n - 예약상품의 경우 예약금의 비율은 기본 50%입니다."
+}
+
+# FAQ별 예시 질문 (검색 색인용)
+FAQ_PARAPHRASES = {
+    "반품": ["반품 가능한가요", "반품하고 싶어요", "환불 받을 수 있나요", "상품이 불량이에요", "오배송 됐어요", "단순 변심 반품"],
+    "배송": ["배송 얼마나 걸려요", "언제 출고되나요", "당일 출고 되나요", "오늘 주문하면 언제 와요", "예약 구매 배송일", "배송 기간"],
+    "결제": ["결제 방법 알려줘", "카드 결제 되나요", "카카오페이 되나요", "토스페이 결제", "무통장 입금 되나요"],
+    "회원가입": ["회원가입 어떻게 해요", "가입 방법", "이메일 인증", "가입하려면 어떻게 해야 돼"],
+    "가입 승인": ["가입 승인 언제 나요", "승인 얼마나 걸려요", "가입 승인 대기", "승인 문자"],
+    "상품 등록 제한": ["어떤 상품은 등록 못 해요", "가공식품 팔 수 있나요", "등록 금지 상품", "고기나 생선도 팔 수 있나요", "씨앗 묘목 판매 가능한가요", "금지된 상품"],
+    "판매자 구매": ["판매자인데 구매 가능해", "판매자도 살 수 있나요", "판매자 계정으로 구매"],
+    "구매자 판매": ["구매자인데 판매 가능해", "구매자도 팔 수 있나요", "구매자 계정으로 판매", "판매자로 전환"],
+    "고객센터 연락처": ["고객센터 전화번호", "고객센터 번호 알려줘", "상담원 연결", "고객센터 연락"],
+    "배송 문의": ["배송 문의는 어디로 해요", "택배가 안 와요 어디에 물어봐요", "배송 관련 문의처"],
+    "반품 문의": ["반품 문의는 어디로 해요", "반품 접수는 누구한테 해요", "반품 관련 문의처"],
+    "판매자 문의": ["판매자 연락처 어디서 봐요", "판매자 정보 확인", "판매자한테 연락하고 싶어요"],
+    "상품 등록 유의사항": ["상품 등록할 때 주의사항", "상품 등록 방법", "상품 이미지 몇 장 올려요", "상품 등록 규칙", "썸네일 이미지"],
+}
+
+# 유사도가 FAQ_DIRECT_THRESHOLD 이상이고 2위와 FAQ_DIRECT_MARGIN 이상 차이 나며,
+# 질문의 단어가 모두 그 FAQ의 키/예시 질문에 있을 때만 LLM 없이 바로 답변 ('회원 탈퇴'가 '회원가입' 답변을 받지 않도록)
+FAQ_DIRECT_THRESHOLD = float(os.getenv("FAQ_DIRECT_THRESHOLD", "0.8"))
+FAQ_DIRECT_MARGIN = float(os.getenv("FAQ_DIRECT_MARGIN", "0.2"))
+# 애매한 질문은 상위 FAQ_TOP_K개 후보만 LLM에 전달
+FAQ_TOP_K = int(os.getenv("FAQ_TOP_K", "3"))
+# 질문 형식에 흔히 붙는 표현 (FAQ 구분에 도움이 안 되므로 색인/검색에서 제외)
+FAQ_STOPWORDS = [
+    "어떻게", "가능한가요", "가능해요", "가능해", "가능", "알려주세요", "알려줘", "되나요", "돼요", "하나요", "해요", "해야",
+    "있나요", "있어요", "있어", "수있", "얼마나", "걸려요", "걸려", "하려면", "언제", "어디로", "어디서", "어디에",
+    "누구한테", "뭐로", "인데", "싶어요", "궁금", "나요", "해",
+]
+# 바로 답변할지 판단할 때 무시하는 질문 표현
+FAQ_QUESTION_WORDS = ["뭐야", "뭐가", "뭐예요", "무엇", "무엇인가요", "알려", "좀"]
+# 단어 끝의 조사 (바로 답변 판단 시 떼고 비교)
+_PARTICLE_SUFFIX = re.compile(r'(으로|이랑|이|가|은|는|을|를|도|의|에|로|랑)$')
+# 답변 본문은 길고 여러 FAQ에 공통 단어가 많아 키/예시 질문보다 낮은 가중치
+FAQ_ANSWER_WEIGHT = 0.6
+
+
+def _build_faq_index():
+    documents, owners, weights = [], [], []
+    for key, answer in CUSTOMER_SERVICE_INFO.items():
+        for text in [key] + FAQ_PARAPHRASES.get(key, []):
+            documents.append(text)
+            owners.append(key)
+            weights.append(1.0)
+        documents.append(answer)
+        owners.append(key)
+        weights.append(FAQ_ANSWER_WEIGHT)
+    return NgramIndex(documents, stopwords=FAQ_STOPWORDS), owners, weights
+
+
+_faq_index, _faq_owners, _faq_weights = _build_faq_index()
+# FAQ 키 → 키와 예시 질문을 정규화해 이어 붙인 문자열 (바로 답변 판단용)
+_faq_question_text = {
+    key: "|".join(normalize_text(t) for t in [key] + FAQ_PARAPHRASES.get(key, []))
+    for key in CUSTOMER_SERVICE_INFO
+}
+
+
+def covers_question(key, user_message):
+    """질문의 내용 단어(질문 표현/조사 제외, 2글자 이상)가 모두 FAQ 키/예시 질문에 있으면 True"""
+    text = _faq_question_text[key]
+    for token in re.findall(r'[가-힣A-Za-z0-9]+', user_message):
+        token = normalize_text(token)
+        for word in _faq_index.stopwords:
+            token = token.replace(word, "")
+        if len(token) < 2 or token in FAQ_QUESTION_WORDS:
+            continue
+        if token in text:
+            continue
+        stripped = _PARTICLE_SUFFIX.sub("", token)
+        if len(stripped) >= 2 and stripped in text:
+            continue
+        return False
+    return True
+
+
+def search_faq(user_message, k=FAQ_TOP_K):
+    """유사도가 높은 FAQ [(키, 유사도), ...] (키/예시 질문/답변 중 가장 높은 유사도 사용)"""
+    best = {}
+    for i, score in _faq_index.search(user_message, k=len(_faq_owners)):
+        key = _faq_owners[i]
+        best[key] = max(best.get(key, 0.0), score * _faq_weights[i])
+    return sorted(best.items(), key=lambda item: item[1], reverse=True)[:k]
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 def handle_faq(user_message):
-    CUSTOMER_SERVICE_INFO = {
-        "반품": "제품 수령 후 2일 이내 반품 신청 가능합니다. 제품이 불량이거나 오배송일 경우에만 반품 가능합니다. 단순 변심 등 사유로는 반품 불가합니다. 반품 신청은 판매자 연락처로 접수 후 검수 후 환불 처리됩니다.",
-        "배송": "즉시구매일 경우, 오전 11시 이전 주문 시 당일 출하되고, 이후 주문 시 익일 출하됩니다.\n 예약 구매일 경우, 상품상세 페이지에 고시된 판매종료일자의 익일 출하됩니다.\n 배송은 출고 후 1~3일 소요됩니다. 배송사는 판매자별로 상이 할 수 있습니다.",
-        "결제": "신용카드, 토스페이 간편결제, 카카오페이 등 다양한 결제 방법을 지원합니다.",
-        "회원가입": "이메일 인증 후 가입이 완료됩니다.",
-        "가입 승인": "회원 가입 승인까지 영업일 기준 1~2일 소요됩니다. 승인 완료 시 문자 메세지를 보내드립니다.",
-        "상품 등록 제한": "등록이 제한되는 상품은 다음과 같습니다.\n- 유통기한이 지난 농산물\n- 가공식품, 반찬류, 탕류 등 가공품(곶감 제외)\n- 씨앗, 묘목, 농약, 비료 등 기타 금지 물품\n- 고기, 생선, 계란, 유제품 등 동물성 식품\n- 그 외 농산물에 해당하지 않는 기타 상품\n 상품등록시 안내사항에서 자세한 내용을 확인할 수 있습니다.\n 사이트에서 취급 중인 상품 목록을 알려드릴까요?",
-        "판매자 구매": "판매자로 가입하신 경우, 상품 구매도 가능합니다.",
-        "구매자 판매": "구매자로 가입하신 경우, 판매자로 재가입 하시거나 고객센터에 문의주세요.",
-        "고객센터 연락처": "고객센터 연락처는 010-1234-5678입니다.",
-        "배송 문의": "배송 문의는 판매자에게 문의주세요.",
-        "반품 문의": "반품 문의는 판매자에게 문의주세요.",
-        "판매자 문의": "판매자 정보는 상품 상세페이지의 상품카드나, 배송/반품정보 탭의 하단 '문의연락처'에서 확인할 수 있습니다.",
-        "상품 등록 유의사항": "- 상품명은 명확하게 작성해 주세요.\n - 상품 이미지는 1장 이상 등록해야 하며, 실제 상품과 동일해야 합니다.\n - 썸네일 이미지는 1장 등록 가능하며, 상품상세 이미지는 1장~3장 등록 가능합니다.\n - 상품 단위, 규격, 수량, 가격을 정확히 입력해 주세요.\n - 유통기한이 지난 상품이나 플랫폼에서 금지한 품목은 등록할 수 없습니다.\n - 욕설, 비방, 광고성 문구, 외부 링크는 작성할 수 없습니다.\n - 개인정보(연락처, 계좌번호 등)를 상품 설명에 포함하지 마세요.\n - 도배, 중복 등록된 상품은 관리자에 의해 삭제될 수 있습니다.\n - 타인의 이미지나 글을 무단으로 사용하는 경우 제재를 받을 수 있습니다.\n - 등록된 상품 정보가 사실과 다를 경우, 거래 제한 및 판매 중지 조치가 있을 수 있습니다.\n - 예약상품의 경우 예약금의 비율은 기본 50%입니다."
-    }
-    faq_list = "\n".join([f"- {k}: {v}" for k, v in CUSTOMER_SERVICE_INFO.items()])
+    matches = search_faq(user_message)
+    print(f"[DEBUG] FAQ 검색: {[(k, round(v, 3)) for k, v in matches]}")
+    if matches:
+        top_key, top_score = matches[0]
+        second_score = matches[1][1] if len(matches) > 1 else 0.0
+        if (top_score >= FAQ_DIRECT_THRESHOLD and top_score - second_score >= FAQ_DIRECT_MARGIN
+                and covers_question(top_key, user_message)):
+            answer = CUSTOMER_SERVICE_INFO[top_key]
+            emit("token", {"text": answer})
+            return {"response": answer, "type": "customer_service"}
+
+    # 애매한 질문: 상위 후보만 프롬프트에 포함 (검색 결과가 없으면 전체)
+    candidates = [k for k, _ in matches] or list(CUSTOMER_SERVICE_INFO)
+    faq_list = "\n".join([f"- {k}: {CUSTOMER_SERVICE_INFO[k]}" for k in candidates])
     prompt = f"""
 아래는 고객센터 FAQ 질문과 답변입니다.
 
@@ -32,14 +132,16 @@ def handle_faq(user_message):
 가장 적합한 FAQ 답변만 골라서, 공손하고 친근한 말투로 2~3문장으로 자연스럽게 안내해줘.
 만약 적합한 답변이 없으면 '죄송합니다. 해당 질문에 대한 안내가 없습니다.'라고 답해줘.
 """
-    completion = client.chat.completions.create(
+    # 스트리밍 요청이면 답변 조각을 바로 전달
+    answer = complete_text(
+        client,
         model="gpt-4o-2024-05-13",
         messages=[{"role": "user", "content": prompt}],
         max_tokens=300,
         temperature=0.5
     )
-    answer = completion.choices[0].message.content.strip()
     # 후처리: 답변에 '가공품(곶감 제외)'가 포함되어 있으면 문구 강제 포함
     if "가공품(곶감 제외)" in answer and "사이트에서 취급 중인 상품 목록을 알려드릴까요?" not in answer:
         answer += "\n사이트에서 취급 중인 상품 목록을 알려드릴까요?"
+        emit("token", {"text": "\n사이트에서 취급 중인 상품 목록을 알려드릴까요?"})
     return {"response": answer, "type": "customer_service"} 
\ No newline at end of file
@@ -1,20 +1,11 @@
-from dotenv import load_dotenv
-load_dotenv()
 import os
 import requests
-import json
-from openai import OpenAI
+from clients import openai_client
+from summarizer import filter_ad_lines, summarize_contents, format_result
+from stream_events import emit
+from tavily_client import tavily_search
 
-def filter_ad_lines(text):
-    ad_keywords = [
-        "예약", "안전", "판매", "주문", "농부", "고객님", "화학비료", "유기물",
-        "배송", "구매", "블로그", "프로필", "문의", "상담", "신청", "이벤트", "할인", "특가", "무료", "배송비", "포장", "직거래", "도화농부"
-    ]
-    lines = text.split('\n')
-    filtered = [line for line in lines if not any(k in line for k in ad_keywords)]
-    return '\n'.join(filtered)
-
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = openai_client
 
 def get_fallback_policy_info():
     """API 오류 시 제공할 기본 정책 정보"""
@@ -37,49 +28,13 @@ def handle_policy(user_message):
             print("[DEBUG] Tavily API 키가 설정되지 않음")
             return {"response": get_fallback_policy_info(), "type": "policy"}
         
-        tavily_url = "https://api.tavily.com/search"
-        headers = {"Content-Type": "application/json"}
-        
         # 최신 정책 정보를 우선적으로 검색하도록 쿼리 개선
         current_year = "2025"
         enhanced_query = f"{user_message} {current_year}년 최신 정책"
         
-        payload = {
-            "api_key": tavily_api_key,
-            "query": enhanced_query,
-            "search_depth": "advanced",
-            "include_answer": False,
-            "include_raw_content": False,
-            "max_results": 5
-        }
-        
         print(f"[DEBUG] Tavily API 요청 시작: {enhanced_query}")
-        tavily_resp = requests.post(tavily_url, headers=headers, data=json.dumps(payload), timeout=60)
-        
-        print(f"[DEBUG] Tavily API 응답 상태 코드: {tavily_resp.status_code}")
-        print(f"[DEBUG] Tavily API 응답 헤더: {dict(tavily_resp.headers)}")
-        
-        # HTTP 상태 코드 확인
-        if tavily_resp.status_code != 200:
-            print(f"[DEBUG] Tavily API HTTP 오류: {tavily_resp.status_code}")
-            print(f"[DEBUG] 오류 응답 내용: {tavily_resp.text[:500]}")
-            return {"response": get_fallback_policy_info(), "type": "policy"}
-        
-        # 응답 내용 확인
-        response_text = tavily_resp.text.strip()
-        print(f"[DEBUG] Tavily API 응답 길이: {len(response_text)}")
-        print(f"[DEBUG] Tavily API 응답 내용 (처음 200자): {response_text[:200]}")
-        
-        if not response_text:
-            print("[DEBUG] Tavily API 응답이 비어있음")
-            return {"response": get_fallback_policy_info(), "type": "policy"}
-        
-        # JSON 파싱 시도
-        try:
-            tavily_data = tavily_resp.json()
-        except json.JSONDecodeError as e:
-            print(f"[DEBUG] Tavily API JSON 파싱 오류: {e}")
-            print(f"[DEBUG] 응답 내용: {response_text[:500]}")
+        tavily_data = tavily_search(enhanced_query, "advanced", 5, handler="policy")
+        if tavily_data is None:
             return {"response": get_fallback_policy_info(), "type": "policy"}
         
         observations = tavily_data.get("results", [])
@@ -106,32 +61,24 @@ def handle_policy(user_message):
         
         print(f"[DEBUG] 필터링된 최신 정책 수: {len(recent_policies)}")
         
+        # 검색 결과별 요약을 동시에 요청 (결과 순서 유지)
+        instruction = (
+            "아래 내용을 3~4문장으로, 핵심 정보만 요약해줘. "
+            "2025년, 2024년 최신 정책 정보를 우선적으로 포함하고, "
+            "광고, 예약, 판매, 블로그 안내, 농장명, 브랜드명, 고객 안내, 이벤트, 할인, 후기, 포장, 배송, 주문, 신청, 문의 등은 절대 포함하지 마."
+        )
+        contents = [filter_ad_lines(obs.get("content", "")) for obs in recent_policies]
+        # 스트리밍 요청이면 요약이 끝난 결과부터 순서대로 바로 전달
+        def emit_result(i, summary, _relevant):
+            obs = recent_policies[i]
+            emit("result", {"index": i, "text": format_result(i + 1, obs.get("title", ""), summary, obs.get("url", ""))})
+
+        summaries = summarize_contents("policy", client, instruction, contents, on_result=emit_result)
+        
         obs_answer = ""
-        for i, obs in enumerate(recent_policies):
-            title = obs.get("title", "")
-            content = filter_ad_lines(obs.get("content", ""))
-            url = obs.get("url", "")
-            summary = ""
-            if content:
-                try:
-                    prompt = (
-                        "아래 내용을 3~4문장으로, 핵심 정보만 요약해줘. "
-                        "2025년, 2024년 최신 정책 정보를 우선적으로 포함하고, "
-                        "광고, 예약, 판매, 블로그 안내, 농장명, 브랜드명, 고객 안내, 이벤트, 할인, 후기, 포장, 배송, 주문, 신청, 문의 등은 절대 포함하지 마.\n\n"
-                        f"{content}"
-                    )
-                    completion = client.chat.completions.create(
-                        model="gpt-4o-2024-05-13",
-                        messages=[{"role": "user", "content": prompt}],
-                        max_tokens=400,
-                        temperature=0.5
-                    )
-                    summary = completion.choices[0].message.content.strip()
-                    summary = filter_ad_lines(summary)
-                except Exception as e:
-                    print(f"[DEBUG] LLM 요약 오류: {e}")
-                    summary = content[:400]
-            obs_answer += f"{i+1}. [{title}] {summary}\n출처: <a href='{url}' target='_blank'>{url}</a>\n\n"
+        for i, (obs, (summary, _)) in enumerate(zip(recent_policies, summaries)):
+            result_text = format_result(i + 1, obs.get("title", ""), summary, obs.get("url", ""))
+            obs_answer += result_text
         
         obs_answer = obs_answer.strip() if obs_answer else get_fallback_policy_info()
         return {"response": obs_answer, "type": "policy"}
@@ -1,11 +1,14 @@
-import oracledb
 import re
 from datetime import datetime, timedelta
 import os
-from openai import OpenAI
-from product_list import PRODUCT_KEYWORDS
+from product_catalog import get_catalog
+from product_matcher import find_product, find_products
+from oracle_pool import get_connection
+from price_cache import cached_price, get_cached_price, set_cached_price, kst_now
+from metrics import span, timed
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# 시세 조회 오류 안내 ('가격 정보 없음'과 구분)
+PRICE_ERROR_MESSAGE = "{product}의 가격 정보를 조회하는 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요."
 
 def format_date(date_str):
     y = int(date_str[:4])
@@ -13,8 +16,9 @@ def format_date(date_str):
     d = int(date_str[6:8])
     return f"{y}년 {m}월 {d}일"
 
-def parse_korean_date(text):
-    today = datetime.now()
+def parse_korean_date(text, now=None):
+    # now: 기준 시각 (한 요청에서 여러 번 호출할 때 한 번 구한 KST 현재 시각을 넘김)
+    today = now or kst_now()
     weekday_map = {
         "월요일": 0, "화요일": 1, "수요일": 2, "목요일": 3, "금요일": 4, "토요일": 5, "일요일": 6
     }
@@ -62,31 +66,19 @@ def parse_korean_date(text):
     return None
 
 def test_oracle_connection():
-    conn = oracledb.connect(
-        user="YH",
-        password="0000",
-        dsn="116.36.205.25:1521/XEPDB1" 
-    )
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM TB_PRICE_API_HISTORY")  
-    rows = cur.fetchall()
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT * FROM TB_PRICE_API_HISTORY")
+            rows = cur.fetchall()
     for row in rows:
         print(row)
-    cur.close()
-    conn.close()
 
 def get_today_price(product_name):
     """
     주어진 품목명(product_name)에 대해 오늘 날짜의 가격을 오라클 DB에서 조인하여 조회합니다.
     """
-    today = datetime.now().strftime('%Y%m%d')
+    today = kst_now().strftime('%Y%m%d')
     try:
-        conn = oracledb.connect(
-            user="YH",
-            password="0000",
-            dsn="116.36.205.25:1521/XEPDB1"
-        )
-        cur = conn.cursor()
         sql = """
             SELECT h.price
             FROM tb_price_api_history h
@@ -94,10 +86,10 @@ def get_today_price(product_name):
             WHERE d.low_code_name = :product_name
               AND h.date = :today
         """
-        cur.execute(sql, product_name=product_name, today=today)
-        row = cur.fetchone()
-        cur.close()
-        conn.close()
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, product_name=product_name, today=today)
+                row = cur.fetchone()
         if row:
             return f"오늘 {product_name} 가격은 {row[0]}원입니다."
         else:
@@ -113,61 +105,24 @@ def extract_date_phrases(text):
     candidates = [c.strip() for c in candidates if c.strip() and len(c.strip()) > 1]
     return candidates
 
-def parse_price_query(user_message, conversation_history=None):
-    today = datetime.now().strftime('%Y%m%d')
+def parse_price_query(user_message, conversation_history=None, multi=False):
+    """
+    시세 질문에서 (품목, date1, date2, 비교 여부)를 추출합니다.
+    multi=True 이면 첫 번째 값으로 메시지에 언급된 모든 품목 목록을 반환합니다.
+    """
+    now = kst_now()
+    today = now.strftime('%Y%m%d')
     
     # 사용자 메시지에서 직접 품목 찾기 (LLM 의존성 제거)
-    product = None
-    message_no_space = user_message.replace(' ', '')
-    
-    # 1. 공백 제거된 메시지에서 정확히 일치하는 품목 찾기
-    for p in PRODUCT_KEYWORDS:
-        if p == message_no_space:
-            product = p
-            break
-    
-    # 2. 원본 메시지에서 정확히 일치하는 품목 찾기
-    if not product:
-        for p in PRODUCT_KEYWORDS:
-            if p == user_message:
-                product = p
-                break
+    # 공백 차이(방울 토마토 → 방울토마토), 긴 품목명 우선, 옥수수/수수 구분은 매처가 처리
+    product = find_product(user_message)
     
-    # 3. 공백 제거된 메시지에서 정확히 일치하는 품목 찾기 (방울 토마토 → 방울토마토)
-    if not product:
-        # 가장 긴 품목부터 매칭하여 정확한 품목 우선 선택
-        sorted_products = sorted(PRODUCT_KEYWORDS, key=len, reverse=True)
-        for p in sorted_products:
-            if p in message_no_space:
-                # 특별한 경우 처리: 옥수수와 수수 구분
-                if p == "수수" and "옥수수" in message_no_space:
-                    continue  # 옥수수가 있으면 수수는 건너뛰기
-                product = p
-                break
-    
-    # 4. 한글 단어들을 추출해서 정확히 일치하는 품목 찾기
-    if not product:
-        import re
-        korean_words = re.findall(r'[가-힣]+', user_message)
-        for word in korean_words:
-            for p in PRODUCT_KEYWORDS:
-                if p == word:
-                    product = p
-                    break
-            if product:
-                break
-    
-    # 5. 대화 맥락에서 품목 찾기 (새로 추가)
+    # 대화 맥락에서 품목 찾기
     if not product and conversation_history:
         # 이전 대화에서 언급된 품목 찾기
         for prev_message in reversed(conversation_history):
             if isinstance(prev_message, dict) and prev_message.get('role') == 'user':
-                prev_text = prev_message.get('content', '')
-                # 이전 메시지에서 품목 찾기
-                for p in PRODUCT_KEYWORDS:
-                    if p in prev_text:
-                        product = p
-                        break
+                product = find_product(prev_message.get('content', ''))
                 if product:
                     break
     
@@ -175,14 +130,16 @@ def parse_price_query(user_message, conversation_history=None):
     date_candidates = extract_date_phrases(user_message)
     print(f"[DEBUG] 추출된 날짜 후보: {date_candidates}")
     if len(date_candidates) >= 2:
-        date1 = parse_korean_date(date_candidates[0])
-        date2 = parse_korean_date(date_candidates[1])
+        date1 = parse_korean_date(date_candidates[0], now)
+        date2 = parse_korean_date(date_candidates[1], now)
     elif len(date_candidates) == 1:
-        date1 = parse_korean_date(date_candidates[0])
+        date1 = parse_korean_date(date_candidates[0], now)
         date2 = date1
     else:
         date1 = date2 = today
     print(f"[DEBUG] 변환된 date1: {date1}, date2: {date2}")
+    if multi:
+        product = find_products(user_message) or ([product] if product else [])
     # 날짜 파싱 실패 시 None 반환
     if date1 is None or date2 is None:
         return product, None, None, False
@@ -190,81 +147,42 @@ def parse_price_query(user_message, conversation_history=None):
     return product, date1, date2, compare
 
 def handle_price(user_message, conversation_history=None):
-    result = parse_price_query(user_message, conversation_history)
+    result = parse_price_query(user_message, conversation_history, multi=True)
     # 구버전 fallback 호환
     if len(result) == 3:
-        product, date, compare = result
+        products, date, compare = result
         date1 = date2 = date
     else:
-        product, date1, date2, compare = result
+        products, date1, date2, compare = result
     # 날짜 파싱 실패 안내
     if date1 is None or date2 is None:
         return {
             "response": "날짜를 인식하지 못했습니다. 입력하신 날짜 표현을 다시 확인해 주세요.",
             "type": "price"
         }
+    # 여러 품목을 한 번에 물어본 경우 일괄 조회
+    if len(products) > 1:
+        return handle_multi_price(products, date1, date2, compare)
+    product = products[0] if products else None
     if not product:
-        import re
-        # 사용자 메시지에서 한글 단어들을 추출
+        # '고추'처럼 여러 품목을 묶어 부르는 별칭이면 해당 품목 모두 조회
+        aliases = get_catalog().find_aliases(user_message)
+        if aliases:
+            varieties = []
+            for _, items in aliases:
+                varieties += [p for p in items if p not in varieties]
+            notes = [f"{alias} 관련 품목({', '.join(items)})의 시세를 품목별로 안내합니다." for alias, items in aliases if len(items) > 1]
+            return handle_multi_price(varieties, date1, date2, compare, note="\n".join(notes) or None)
+        # 취급하지 않는 품목으로 처리
         korean_words = re.findall(r'[가-힣]+', user_message)
+        not_found = korean_words[0] if korean_words else user_message
         
-        # 공백을 제거한 전체 메시지도 확인
-        full_message_no_space = user_message.replace(' ', '')
-        
-        # 1. 먼저 공백 제거된 전체 메시지로 정확히 매칭되는 품목 찾기
-        for p in PRODUCT_KEYWORDS:
-            if p == full_message_no_space:
-                product = p
-                break
+        response = f"{not_found}는 사이트에서 취급하지 않습니다.\n{get_catalog().product_list_text}"
         
-        # 2. 공백 제거된 메시지에서 정확히 일치하는 품목 찾기 (방울 토마토 → 방울토마토)
-        if not product:
-            # 가장 긴 품목부터 매칭하여 정확한 품목 우선 선택
-            sorted_products = sorted(PRODUCT_KEYWORDS, key=len, reverse=True)
-            for p in sorted_products:
-                if p in full_message_no_space:
-                    # 특별한 경우 처리: 옥수수와 수수 구분
-                    if p == "수수" and "옥수수" in full_message_no_space:
-                        continue  # 옥수수가 있으면 수수는 건너뛰기
-                    product = p
-                    break
-        
-        # 3. 여전히 찾지 못했다면 개별 단어로 매칭 시도
-        if not product:
-            for word in korean_words:
-                for p in PRODUCT_KEYWORDS:
-                    if p == word:
-                        product = p
-                        break
-                if product:
-                    break
-        
-        # 3. 여전히 찾지 못했다면 취급하지 않는 품목으로 처리
-        if not product:
-            not_found = korean_words[0] if korean_words else user_message
-            
-            # 상품을 카테고리별로 분류
-            categories = {
-                "식량작물": ["쌀","찹쌀","혼합곡","기장","콩","팥","녹두","메밀","고구마","감자","귀리","보리","수수","율무"],
-                "채소류": ["배추","양배추","시금치","상추","얼갈이배추","갓","연근","우엉","수박","참외","오이","호박","토마토","딸기","무","당근","열무","건고추","풋고추","붉은고추","피마늘","양파","파","생강","고춧가루","가지","미나리","깻잎","부추","피망","파프리카","멜론","깐마늘(국산)","깐마늘(수입)","브로콜리","양상추","청경채","케일","콩나물","절임배추","쑥","달래","두릅","로메인 상추","취나물","쥬키니호박","청양고추","대파","고사리","쪽파","다발무","겨울 배추","알배기배추","방울토마토"],
-                "특용작물": ["참깨","들깨","땅콩","느타리버섯","팽이버섯","새송이버섯","호두","아몬드","양송이버섯","표고버섯","더덕"],
-                "과일류": ["바나나","참다래","파인애플","오렌지","자몽","레몬","체리","건포도","건블루베리","망고","블루베리","아보카도","레드향","매실","무화과","복분자","샤인머스켓","곶감","골드키위","사과","배","복숭아","포도","감귤","단감"]
-            }
-            
-            response = f"{not_found}는 사이트에서 취급하지 않습니다.\n저희 사이트에서 취급하는 주요 상품 목록입니다:\n\n"
-            
-            for category, items in categories.items():
-                response += f"📦 {category} ({len(items)}종)\n"
-                response += f"   {', '.join(items)}"
-                response += "\n\n"
-            
-            response += f"총 {len(PRODUCT_KEYWORDS)}가지의 농산물을 취급하고 있습니다.\n"
-            response += "특정 상품에 대한 자세한 정보가 필요하시면 언제든 말씀해 주세요!"
-            
-            return {
-                "response": response,
-                "type": "price"
-            }
+        return {
+            "response": response,
+            "type": "price"
+        }
     # 날짜 비교 로직 개선
     if compare:
         # 날짜를 datetime 객체로 변환
@@ -275,54 +193,140 @@ def handle_price(user_message, conversation_history=None):
             return {"response": f"날짜 형식이 올바르지 않습니다. (date1: {date1}, date2: {date2})", "type": "price"}
         # 두 날짜가 같으면 변동 없음 안내
         if d1 == d2:
-            v = get_avg_unit_price(product, date1)
-            if v is None:
+            date1 = date2 = d1.strftime("%Y%m%d")
+            try:
+                stats = get_prices_batch([product], [date1]).get(product, {}).get(date1)
+            except Exception:
+                return {"response": PRICE_ERROR_MESSAGE.format(product=product), "type": "price"}
+            if stats is None:
                 return {"response": f"{format_date(date1)} 기준 {product} 가격 정보를 찾을 수 없습니다.", "type": "price"}
-            return {"response": f"{format_date(date1)} 기준 {product} 평균가는 {v:.2f}원입니다. (동일 날짜 비교, 변동 없음)", "type": "price"}
+            return {"response": f"{format_date(date1)} 기준 {product} 평균가는 {stats['avg']:.2f}원입니다. (동일 날짜 비교, 변동 없음)", "type": "price"}
         # 과거, 최근 순서로 정렬
         if d1 > d2:
             d1, d2 = d2, d1
             date1, date2 = date2, date1
-        v1 = get_avg_unit_price(product, date1)
-        v2 = get_avg_unit_price(product, date2)
-        if v1 is None or v2 is None:
+        try:
+            comparison = get_price_comparison(product, date1, date2)
+        except Exception:
+            return {"response": PRICE_ERROR_MESSAGE.format(product=product), "type": "price"}
+        if comparison is None:
             return {"response": f"{product}의 가격 정보가 없는 날짜가 있어 비교 정보를 출력 할 수 없습니다.", "type": "price"}
-        diff = v2 - v1
-        if diff > 0:
-            updown = "올랐습니다."
-        elif diff < 0:
-            updown = "내렸습니다."
-        else:
-            updown = "변동이 없습니다."
-        return {"response": f"{format_date(date1)} 기준 {product} 평균가는 {v1:.2f}원, {format_date(date2)} 기준 {product} 평균가는 {v2:.2f}원으로 {abs(diff):.2f}원 {updown}\n(해당 날짜의 모든 데이터 평균가 기준)", "type": "price"}
+        v1 = comparison["before"]["avg"]
+        v2 = comparison["after"]["avg"]
+        return {"response": f"{format_date(date1)} 기준 {product} 평균가는 {v1:.2f}원, {format_date(date2)} 기준 {product} 평균가는 {v2:.2f}원으로 {describe_change(comparison)}\n(해당 날짜의 모든 데이터 평균가 기준)", "type": "price"}
     else:
-        price = get_price(product, date1)
-        if price is None and date1 == datetime.now().strftime('%Y%m%d'):
-            # 오늘 데이터가 없으면 어제 데이터 안내
-            yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y%m%d')
-            price_yesterday = get_price(product, yesterday)
-            if price_yesterday is not None:
-                return {"response": f"시세 데이터는 00시 자정에 업데이트 되므로 최신 데이터는 어제 날짜 데이터입니다.\n{format_date(yesterday)}(어제) 기준 {product} {price_yesterday}", "type": "price"}
-            else:
-                # 오늘/어제 모두 없으면 최근 데이터 안내
-                recent_date, price_recent = get_latest_price(product)
-                if price_recent is not None:
-                    return {"response": f"{format_date(date1)} {product} 가격 정보를 찾을 수 없습니다.\n가장 최근의 {product} 가격 정보 업데이트일은 {format_date(recent_date)}입니다.\n{format_date(recent_date)} 기준 {product} {price_recent}", "type": "price"}
-                else:
-                    return {"response": f"2015년부터 현재까지 {product} 가격 정보가 한 건도 없습니다.", "type": "price"}
+        if date1 == kst_now().strftime('%Y%m%d'):
+            # 오늘 → 어제 → 가장 최근 순서의 대체 조회를 한 번의 쿼리로 처리
+            try:
+                latest = get_latest_price_until(product, date1)
+            except Exception:
+                return {"response": PRICE_ERROR_MESSAGE.format(product=product), "type": "price"}
+            if latest is None:
+                return {"response": f"2015년부터 현재까지 {product} 가격 정보가 한 건도 없습니다.", "type": "price"}
+            price_text = format_price_range(latest["max"], latest["min"])
+            if latest["tier"] == "exact":
+                return {"response": f"{format_date(date1)} 기준 {product} {price_text}", "type": "price"}
+            if latest["tier"] == "previous_day":
+                return {"response": f"시세 데이터는 00시 자정에 업데이트 되므로 최신 데이터는 어제 날짜 데이터입니다.\n{format_date(latest['date'])}(어제) 기준 {product} {price_text}", "type": "price"}
+            return {"response": f"{format_date(date1)} {product} 가격 정보를 찾을 수 없습니다.\n가장 최근의 {product} 가격 정보 업데이트일은 {format_date(latest['date'])}입니다.\n{format_date(latest['date'])} 기준 {product} {price_text}", "type": "price"}
+        try:
+            price = get_price(product, date1)
+        except Exception:
+            return {"response": PRICE_ERROR_MESSAGE.format(product=product), "type": "price"}
         if price is None:
             return {"response": f"{format_date(date1)} 기준 {product} 가격 정보를 찾을 수 없습니다.", "type": "price"}
         return {"response": f"{price}", "type": "price"}
 
+def handle_multi_price(products, date1, date2, compare, note=None):
+    """
+    여러 품목의 시세를 get_prices_batch 한 번으로 조회해 안내합니다. (note: 목록 앞에 붙일 안내 문구)
+    오늘 날짜 조회는 어제 데이터도 함께 가져와, 오늘 데이터가 없는 품목은 어제 기준으로,
+    어제 데이터도 없는 품목은 단일 품목 조회와 같이 가장 최근 날짜 기준으로 안내합니다.
+    """
+    now = kst_now()
+    today = now.strftime('%Y%m%d')
+    yesterday = (now - timedelta(days=1)).strftime('%Y%m%d')
+    if compare:
+        date1, date2 = sorted([date1, date2])
+        dates = [date1, date2]
+    elif date1 == today:
+        dates = [today, yesterday]
+    else:
+        dates = [date1]
+    try:
+        prices = get_prices_batch(products, dates)
+    except Exception:
+        return {"response": PRICE_ERROR_MESSAGE.format(product="요청하신 품목"), "type": "price"}
+    lines = []
+    for p in products:
+        by_date = prices.get(p, {})
+        if compare:
+            comparison = compare_price_stats(by_date.get(date1), by_date.get(date2))
+            if comparison is None:
+                lines.append(f"- {p}: 가격 정보가 없는 날짜가 있어 비교할 수 없습니다.")
+                continue
+            lines.append(f"- {p}: 평균가 {comparison['before']['avg']:.2f}원 → {comparison['after']['avg']:.2f}원으로 {describe_change(comparison)}")
+            continue
+        stats = by_date.get(date1)
+        label = format_date(date1)
+        if stats is None and date1 == today and by_date.get(yesterday):
+            stats = by_date[yesterday]
+            label = f"{format_date(yesterday)}(어제)"
+        if stats is None and date1 == today:
+            try:
+                latest = get_latest_price_until(p, today)
+            except Exception:
+                lines.append(f"- {p}: 가격 정보를 조회하는 중 오류가 발생했습니다.")
+                continue
+            if latest is None:
+                lines.append(f"- {p}: 가격 정보가 한 건도 없습니다.")
+                continue
+            stats = latest
+            label = f"가장 최근 업데이트일인 {format_date(latest['date'])}"
+        if stats is None:
+            lines.append(f"- {p}: {format_date(date1)} 기준 가격 정보를 찾을 수 없습니다.")
+        else:
+            lines.append(f"- {p}: {label} 기준 {format_price_range(stats['max'], stats['min'])}")
+    if compare:
+        header = f"{format_date(date1)} 대비 {format_date(date2)} 품목별 시세 변동입니다. (해당 날짜의 모든 데이터 평균가 기준)"
+    else:
+        header = "요청하신 품목별 시세입니다."
+    if note:
+        header = f"{note}\n{header}"
+    return {"response": header + "\n" + "\n".join(lines), "type": "price"}
+
+def compare_price_stats(before, after):
+    """두 날짜의 집계값(min/max/avg/count)으로 평균가 변동액과 변동률(%)을 계산합니다. 한쪽이라도 없으면 None"""
+    if before is None or after is None:
+        return None
+    diff = after["avg"] - before["avg"]
+    pct = (diff / before["avg"] * 100) if before["avg"] else None
+    return {"before": before, "after": after, "diff": diff, "pct": pct}
+
+def describe_change(comparison):
+    # 예: '100.00원(6.67%) 올랐습니다.'
+    diff = comparison["diff"]
+    if diff > 0:
+        updown = "올랐습니다."
+    elif diff < 0:
+        updown = "내렸습니다."
+    else:
+        updown = "변동이 없습니다."
+    pct = comparison["pct"]
+    pct_str = f"({abs(pct):.2f}%)" if pct is not None else ""
+    return f"{abs(diff):.2f}원{pct_str} {updown}"
+
+def format_price_range(max_price, min_price):
+    # 최고/최저가가 같으면 단일 가격, 다르면 범위로 안내하는 공통 문구
+    if max_price == min_price:
+        return f"가격은 {max_price}원입니다. (kg당 가격)"
+    return f"최고가는 {max_price}원, 최저가는 {min_price}원입니다. (kg당 가격)\n(가격 차이가 많이 나는 경우 원산지가 달라 생기는 차이 일 수 있습니다.)"
+
+@cached_price("range")
+@timed("oracle_query")
 def get_price(product_name, date):
-    # 오라클 DB에서 해당 날짜, 품목 kg당 가격 조회
+    # 오라클 DB에서 해당 날짜, 품목 kg당 가격 조회 (데이터가 없으면 None, 조회 오류는 예외로 전달)
     try:
-        conn = oracledb.connect(
-            user="YH",
-            password="0000",
-            dsn="116.36.205.25:1521/XEPDB1"
-        )
-        cur = conn.cursor()
         sql = """
             SELECT h.RECORDED_UNIT_PRICE
             FROM tb_price_api_history h
@@ -330,10 +334,10 @@ def get_price(product_name, date):
             WHERE d.LOW_CODE_NAME = :product_name
               AND h.RECORDED_DATE = TO_DATE(:p_date, 'YYYYMMDD')
         """
-        cur.execute(sql, product_name=product_name, p_date=date)
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, product_name=product_name, p_date=date)
+                rows = cur.fetchall()
         if rows:
             prices = [row[0] for row in rows if row[0] is not None]
             if not prices:
@@ -341,78 +345,156 @@ def get_price(product_name, date):
             max_price = max(prices)
             min_price = min(prices)
             date_str = format_date(date)
-            if max_price == min_price:
-                return f"{date_str} 기준 {product_name} 가격은 {max_price}원입니다. (kg당 가격)"
-            else:
-                return f"{date_str} 기준 {product_name} 최고가는 {max_price}원, 최저가는 {min_price}원입니다. (kg당 가격)\n(가격 차이가 많이 나는 경우 원산지가 달라 생기는 차이 일 수 있습니다.)"
+            return f"{date_str} 기준 {product_name} {format_price_range(max_price, min_price)}"
         else:
             return None
     except Exception as e:
         print(f"[DEBUG] DB 조회 오류: {e}")
-        return None
+        raise
 
-def get_latest_price(product_name):
-    # DB에서 해당 품목의 가장 최근 날짜와 kg당 가격 정보 반환 (YYYYMMDD, price 문자열)
+@cached_price("latest")
+@timed("oracle_query")
+def get_latest_price_until(product_name, date):
+    """
+    date(YYYYMMDD) 이하에서 가격 정보가 있는 가장 최근 날짜와 그 날의 최저/최고/평균가를 한 번의 쿼리로 조회합니다.
+    - 최근 날짜는 MAX(RECORDED_DATE) 서브쿼리로 구하므로 (LOW_CODE_VALUE, RECORDED_DATE) 인덱스의 범위 스캔으로 끝납니다.
+    - tier: 'exact'(요청 날짜), 'previous_day'(요청 전날), 'latest'(그 이전의 가장 최근 날짜)
+    - 데이터가 없으면 None 반환, 조회 오류는 예외로 전달 ('데이터 없음'과 구분하고 캐시하지 않음)
+    """
     try:
-        conn = oracledb.connect(
-            user="YH",
-            password="0000",
-            dsn="116.36.205.25:1521/XEPDB1"
-        )
-        cur = conn.cursor()
         sql = """
-            SELECT TO_CHAR(h.RECORDED_DATE, 'YYYYMMDD'), h.RECORDED_UNIT_PRICE
+            SELECT TO_CHAR(h.RECORDED_DATE, 'YYYYMMDD'),
+                   MIN(h.RECORDED_UNIT_PRICE), MAX(h.RECORDED_UNIT_PRICE), AVG(h.RECORDED_UNIT_PRICE)
             FROM tb_price_api_history h
             JOIN tb_code_detail d ON h.LOW_CODE_VALUE = d.LOW_CODE_VALUE
             WHERE d.LOW_CODE_NAME = :product_name
-            ORDER BY h.RECORDED_DATE DESC
+              AND h.RECORDED_UNIT_PRICE IS NOT NULL
+              AND h.RECORDED_DATE = (
+                  SELECT MAX(h2.RECORDED_DATE)
+                  FROM tb_price_api_history h2
+                  JOIN tb_code_detail d2 ON h2.LOW_CODE_VALUE = d2.LOW_CODE_VALUE
+                  WHERE d2.LOW_CODE_NAME = :product_name
+                    AND h2.RECORDED_UNIT_PRICE IS NOT NULL
+                    AND h2.RECORDED_DATE <= TO_DATE(:p_date, 'YYYYMMDD')
+              )
+            GROUP BY h.RECORDED_DATE
         """
-        cur.execute(sql, product_name=product_name)
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
-        if rows:
-            # 가장 최근 날짜의 가격 정보(여러 행일 경우 최고/최저가 포맷 재활용)
-            recent_date = rows[0][0]
-            prices = [row[1] for row in rows if row[0] == recent_date and row[1] is not None]
-            if not prices:
-                return recent_date, None
-            max_price = max(prices)
-            min_price = min(prices)
-            if max_price == min_price:
-                return recent_date, f"가격은 {max_price}원입니다. (kg당 가격)"
-            else:
-                return recent_date, f"최고가는 {max_price}원, 최저가는 {min_price}원입니다. (kg당 가격)\n(가격 차이가 많이 나는 경우 원산지가 달라 생기는 차이 일 수 있습니다.)"
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, product_name=product_name, p_date=date)
+                row = cur.fetchone()
+        if not row:
+            return None
+        recent_date, min_price, max_price, avg_price = row
+        previous_day = (datetime.strptime(date, "%Y%m%d") - timedelta(days=1)).strftime("%Y%m%d")
+        if recent_date == date:
+            tier = "exact"
+        elif recent_date == previous_day:
+            tier = "previous_day"
         else:
-            return None, None
+            tier = "latest"
+        return {"date": recent_date, "min": min_price, "max": max_price, "avg": avg_price, "tier": tier}
     except Exception as e:
         print(f"[DEBUG] DB 조회 오류(최신): {e}")
+        raise
+
+def get_latest_price(product_name):
+    # DB에서 해당 품목의 가장 최근 날짜와 kg당 가격 정보 반환 (YYYYMMDD, price 문자열), 조회 오류는 예외로 전달
+    latest = get_latest_price_until(product_name, kst_now().strftime('%Y%m%d'))
+    if latest is None:
         return None, None
+    return latest["date"], format_price_range(latest["max"], latest["min"])
 
-def get_avg_unit_price(product_name, date):
-    try:
-        conn = oracledb.connect(
-            user="YH",
-            password="0000",
-            dsn="116.36.205.25:1521/XEPDB1"
-        )
-        cur = conn.cursor()
-        sql = """
-            SELECT h.RECORDED_UNIT_PRICE
-            FROM tb_price_api_history h
-            JOIN tb_code_detail d ON h.LOW_CODE_VALUE = d.LOW_CODE_VALUE
-            WHERE d.LOW_CODE_NAME = :product_name
-              AND h.RECORDED_DATE = TO_DATE(:p_date, 'YYYYMMDD')
-        """
-        cur.execute(sql, product_name=product_name, p_date=date)
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
-        prices = [row[0] for row in rows if row[0] is not None]
-        if prices:
-            return sum(prices) / len(prices)
-        else:
-            return None
-    except Exception as e:
-        print(f"[DEBUG] DB 조회 오류(평균가): {e}")
-        return None
\ No newline at end of file
+def get_price_comparison(product_name, date1, date2):
+    """
+    두 날짜(date1: 이전, date2: 이후)의 AVG/MIN/MAX/COUNT를 RECORDED_DATE로 묶은 한 번의 쿼리로 조회하고
+    변동액(diff)과 변동률(pct, %)을 함께 반환합니다. 한쪽 날짜라도 데이터가 없으면 None, 조회 오류는 예외로 전달
+    """
+    by_date = get_prices_batch([product_name], [date1, date2]).get(product_name, {})
+    return compare_price_stats(by_date.get(date1), by_date.get(date2))
+
+# 쿼리 한 번에 넣는 최대 품목/날짜 수 (넘으면 나눠서 여러 번 조회)
+MAX_BATCH_PRODUCTS = 50
+MAX_BATCH_DATES = 92
+
+def get_prices_batch(product_names, dates=None, start_date=None, end_date=None):
+    """
+    여러 품목 × 여러 날짜의 최저/최고/평균가와 건수를 한 번의 쿼리로 조회합니다. (한도를 넘으면 나눠서 조회)
+    - dates: YYYYMMDD 목록 (IN 조건), 또는 start_date~end_date 범위 (BETWEEN 조건)
+    - 반환: {품목: {날짜: {"min", "max", "avg", "count"}}} (데이터가 없는 조합은 빠집니다)
+    - 이미 캐시된 (품목, 날짜) 조합은 다시 조회하지 않습니다.
+    - 조회 오류는 예외로 전달합니다. ('데이터 없음'인 빈 결과와 구분)
+    """
+    product_names = list(dict.fromkeys(product_names))
+    use_range = not dates and start_date and end_date
+    if use_range:
+        start = datetime.strptime(start_date, "%Y%m%d")
+        end = datetime.strptime(end_date, "%Y%m%d")
+        if start > end:
+            start, end = end, start
+        dates = [(start + timedelta(days=i)).strftime("%Y%m%d") for i in range((end - start).days + 1)]
+    dates = list(dict.fromkeys(dates or []))
+    if not product_names or not dates:
+        return {}
+
+    result = {}
+    missing_products = set()
+    missing_dates = set()
+    for p in product_names:
+        for d in dates:
+            stats = get_cached_price(p, d, "stats")
+            if stats is not None:
+                result.setdefault(p, {})[d] = stats
+            else:
+                missing_products.add(p)
+                missing_dates.add(d)
+    if not missing_products:
+        return result
+
+    query_products = [p for p in product_names if p in missing_products]
+    query_dates = [d for d in dates if d in missing_dates]
+    # 바인드 변수 수 제한을 넘지 않도록 MAX_BATCH_PRODUCTS × MAX_BATCH_DATES 단위로 나눠 조회 (잘라내지 않음)
+    for i in range(0, len(query_products), MAX_BATCH_PRODUCTS):
+        for j in range(0, len(query_dates), MAX_BATCH_DATES):
+            chunk_products = query_products[i:i + MAX_BATCH_PRODUCTS]
+            chunk_dates = query_dates[j:j + MAX_BATCH_DATES]
+            try:
+                rows = _query_price_stats(chunk_products, chunk_dates, use_range)
+            except Exception as e:
+                print(f"[DEBUG] DB 조회 오류(일괄): {e}")
+                raise
+            chunk_date_set = set(chunk_dates)
+            for name, d, min_price, max_price, avg_price, count in rows:
+                if d not in chunk_date_set:
+                    continue
+                stats = {"min": min_price, "max": max_price, "avg": avg_price, "count": count}
+                set_cached_price(name, d, "stats", stats)
+                result.setdefault(name, {})[d] = stats
+    return result
+
+def _query_price_stats(product_names, dates, use_range):
+    """품목 × 날짜별 (품목, 날짜, 최저, 최고, 평균, 건수) 행 목록 (use_range면 dates의 처음~끝 범위로 조회)"""
+    binds = {f"p{i}": p for i, p in enumerate(product_names)}
+    product_in = ", ".join(f":p{i}" for i in range(len(product_names)))
+    if use_range:
+        binds["d_start"] = dates[0]
+        binds["d_end"] = dates[-1]
+        date_cond = "h.RECORDED_DATE BETWEEN TO_DATE(:d_start, 'YYYYMMDD') AND TO_DATE(:d_end, 'YYYYMMDD')"
+    else:
+        binds.update({f"d{i}": d for i, d in enumerate(dates)})
+        date_cond = "h.RECORDED_DATE IN (" + ", ".join(f"TO_DATE(:d{i}, 'YYYYMMDD')" for i in range(len(dates))) + ")"
+    sql = f"""
+        SELECT d.LOW_CODE_NAME, TO_CHAR(h.RECORDED_DATE, 'YYYYMMDD'),
+               MIN(h.RECORDED_UNIT_PRICE), MAX(h.RECORDED_UNIT_PRICE),
+               AVG(h.RECORDED_UNIT_PRICE), COUNT(h.RECORDED_UNIT_PRICE)
+        FROM tb_price_api_history h
+        JOIN tb_code_detail d ON h.LOW_CODE_VALUE = d.LOW_CODE_VALUE
+        WHERE d.LOW_CODE_NAME IN ({product_in})
+          AND {date_cond}
+          AND h.RECORDED_UNIT_PRICE IS NOT NULL
+        GROUP BY d.LOW_CODE_NAME, h.RECORDED_DATE
+    """
+    with span("oracle_query"), get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql, binds)
+            return cur.fetchall()
@@ -1,4 +1,4 @@
-from product_list import PRODUCT_KEYWORDS
+from product_matcher import lookup_product, find_related_products
 import re
 
 def extract_item_name(user_message):
@@ -36,23 +36,16 @@ def handle_product_check(user_message):
         return {"response": "확인할 품목명을 찾지 못했습니다.", "type": "product_check"}
     # 부정형 질문 여부 확인
     is_negative = bool(re.search(r'안[ ]?(팔|있|판매|취급|구입|구매)', user_message))
-    # 정확 일치
-    if item in PRODUCT_KEYWORDS:
+    # 정확 일치 (공백 차이 무시)
+    exact = lookup_product(item)
+    if exact:
         if is_negative:
-            return {"response": f"아니오, {item}는(은) 판매하고 있습니다.", "type": "product_check"}
+            return {"response": f"아니오, {exact}는(은) 판매하고 있습니다.", "type": "product_check"}
         else:
-            return {"response": f"네, {item} 판매중입니다.", "type": "product_check"}
-    # 부분 일치(포함) 품목 안내 - 정확한 품목명이 포함된 경우만
+            return {"response": f"네, {exact} 판매중입니다.", "type": "product_check"}
+    # 부분 일치(포함) 품목 안내 - 2글자 이상인 검색어가 품목명(괄호 앞부분)에 포함된 경우
     # 예: "고추"로 검색하면 "건고추", "풋고추", "붉은고추" 등이 매칭되어야 함
-    related = []
-    for p in PRODUCT_KEYWORDS:
-        # 품목명이 검색어로 시작하거나, 검색어가 품목명의 일부인 경우
-        # 단, 검색어가 너무 짧으면 정확하지 않은 매칭을 피하기 위해 최소 길이 체크
-        product_name = p.split('(')[0]  # 괄호 앞부분만 비교
-        if (len(item) >= 2 and  # 최소 2글자 이상
-            (product_name.startswith(item) or 
-             (len(item) >= 2 and item in product_name))):  # 2글자 이상일 때 포함 검색
-            related.append(p)
+    related = find_related_products(item)
     
     if related:
         related_str = ", ".join(related)
@@ -1,21 +1,11 @@
-from dotenv import load_dotenv
-load_dotenv()
 import os
 import requests
-import json
-from openai import OpenAI
-import oracledb
+from clients import openai_client
+from summarizer import filter_ad_lines, collect_relevant, format_result
+from stream_events import emit
+from tavily_client import tavily_search
 
-def filter_ad_lines(text):
-    ad_keywords = [
-        "예약", "안전", "판매", "주문", "농부", "고객님", "화학비료", "유기물",
-        "배송", "구매", "블로그", "프로필", "문의", "상담", "신청", "이벤트", "할인", "특가", "무료", "배송비", "포장", "직거래", "도화농부"
-    ]
-    lines = text.split('\n')
-    filtered = [line for line in lines if not any(k in line for k in ad_keywords)]
-    return '\n'.join(filtered)
-
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = openai_client
 
 def extract_keywords(user_message):
     # 한글, 영문, 숫자 단어만 추출 (간단 버전)
@@ -31,8 +21,6 @@ def handle_product(user_message):
             print("[DEBUG] Tavily API 키가 설정되지 않음")
             return {"response": "농산물 정보 검색 서비스를 이용할 수 없습니다. 잠시 후 다시 시도해주세요.", "type": "product"}
         
-        tavily_url = "https://api.tavily.com/search"
-        headers = {"Content-Type": "application/json"}
         user_keywords = extract_keywords(user_message)
         filtered_results = []
         seen_urls = set()
@@ -41,40 +29,10 @@ def handle_product(user_message):
         max_tries = 7  # 7에서 3으로 줄임
         
         while len(filtered_results) < max_results_needed and tries < max_tries:
-            payload = {
-                "api_key": tavily_api_key,
-                "query": user_message,
-                "search_depth": "advanced",
-                "include_answer": False,
-                "include_raw_content": False,
-                "max_results": max_results_needed * 2  # 한 번에 여러 개 요청
-            }
-            
             print(f"[DEBUG] Tavily API 요청 시작 (시도 {tries + 1}): {user_message}")
-            tavily_resp = requests.post(tavily_url, headers=headers, data=json.dumps(payload), timeout=60)
-            
-            print(f"[DEBUG] Tavily API 응답 상태 코드: {tavily_resp.status_code}")
-            
-            # HTTP 상태 코드 확인
-            if tavily_resp.status_code != 200:
-                print(f"[DEBUG] Tavily API HTTP 오류: {tavily_resp.status_code}")
-                print(f"[DEBUG] 오류 응답 내용: {tavily_resp.text[:500]}")
-                tries += 1
-                continue
-            
-            # 응답 내용 확인
-            response_text = tavily_resp.text.strip()
-            if not response_text:
-                print("[DEBUG] Tavily API 응답이 비어있음")
-                tries += 1
-                continue
-            
-            # JSON 파싱 시도
-            try:
-                tavily_data = tavily_resp.json()
-            except json.JSONDecodeError as e:
-                print(f"[DEBUG] Tavily API JSON 파싱 오류: {e}")
-                print(f"[DEBUG] 응답 내용: {response_text[:500]}")
+            # 한 번에 여러 개 요청, 같은 질문은 캐시된 검색 결과 사용
+            tavily_data = tavily_search(user_message, "advanced", max_results_needed * 2, handler="product")
+            if tavily_data is None:
                 tries += 1
                 continue
             
@@ -86,41 +44,34 @@ def handle_product(user_message):
                 tries += 1
                 continue
             
+            new_results = []
             for obs in observations:
                 url = obs.get("url", "")
                 if url in seen_urls:
                     continue
                 seen_urls.add(url)
-                title = obs.get("title", "")
-                content = filter_ad_lines(obs.get("content", ""))
-                summary = ""
-                if content:
-                    try:
-                        prompt = (
-                            f"아래 내용을 '{user_message}'와 직접적으로 관련된 부분만 3~4문장으로 요약해줘. 관련 없는 뉴스, 광고, 예약, 판매, 블로그 안내, 농장명, 브랜드명, 고객 안내, 이벤트, 할인, 후기, 포장, 배송, 주문, 신청, 문의, 기타 정보는 절대 포함하지 마.\n\n"
-                            f"{content}"
-                        )
-                        completion = client.chat.completions.create(
-                            model="gpt-4o-2024-05-13",
-                            messages=[{"role": "user", "content": prompt}],
-                            max_tokens=400,
-                            temperature=0.5
-                        )
-                        summary = completion.choices[0].message.content.strip()
-                        summary = filter_ad_lines(summary)
-                    except Exception as e:
-                        print(f"[DEBUG] LLM 요약 오류: {e}")
-                        summary = content[:400]
-                if not any(k in summary for k in user_keywords):
-                    continue
+                new_results.append((obs.get("title", ""), filter_ad_lines(obs.get("content", "")), url))
+            if not new_results:
+                # 같은 요청은 캐시된 같은 결과가 돌아오므로 더 시도하지 않음
+                print("[DEBUG] 새로운 검색 결과 없음")
+                break
+            # 검색 결과별 요약을 동시에 요청하고, 관련 있는 결과만 순서대로 필요한 개수까지 선택
+            instruction = f"아래 내용을 '{user_message}'와 직접적으로 관련된 부분만 3~4문장으로 요약해줘. 관련 없는 뉴스, 광고, 예약, 판매, 블로그 안내, 농장명, 브랜드명, 고객 안내, 이벤트, 할인, 후기, 포장, 배송, 주문, 신청, 문의, 기타 정보는 절대 포함하지 마."
+            def select(index, summary, new_results=new_results):
+                title, _, url = new_results[index]
                 filtered_results.append((title, summary, url))
-                if len(filtered_results) == max_results_needed:
-                    break
+                # 스트리밍 요청이면 선택된 결과를 바로 전달
+                emit("result", {"index": len(filtered_results) - 1, "text": format_result(len(filtered_results), title, summary, url)})
+
+            collect_relevant(
+                "product", client, instruction,
+                [content for _, content, _ in new_results],
+                user_keywords, max_results_needed - len(filtered_results),
+                query=user_message, on_select=select
+            )
             tries += 1
         
-        obs_answer = ""
-        for i, (title, summary, url) in enumerate(filtered_results):
-            obs_answer += f"{i+1}. [{title}] {summary}\n출처: <a href='{url}' target='_blank'>{url}</a>\n\n"
+        obs_answer = "".join(format_result(i + 1, title, summary, url) for i, (title, summary, url) in enumerate(filtered_results))
         obs_answer = obs_answer.strip() if obs_answer else "관련 정보가 검색되지 않았습니다."
         return {"response": obs_answer, "type": "product"}
         
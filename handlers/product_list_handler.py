@@ -1,25 +1,8 @@
-from product_list import PRODUCT_KEYWORDS
+from product_catalog import get_catalog
 
 def handle_product_list(user_message):
-    # 상품을 카테고리별로 분류
-    categories = {
-        "식량작물": ["쌀","찹쌀","혼합곡","기장","콩","팥","녹두","메밀","고구마","감자","귀리","보리","수수","율무"],
-        "채소류": ["배추","양배추","시금치","상추","얼갈이배추","갓","연근","우엉","수박","참외","오이","호박","토마토","딸기","무","당근","열무","건고추","풋고추","붉은고추","피마늘","양파","파","생강","고춧가루","가지","미나리","깻잎","부추","피망","파프리카","멜론","깐마늘(국산)","깐마늘(수입)","브로콜리","양상추","청경채","케일","콩나물","절임배추","쑥","달래","두릅","로메인 상추","취나물","쥬키니호박","청양고추","대파","고사리","쪽파","다발무","겨울 배추","알배기배추","방울토마토"],
-        "특용작물": ["참깨","들깨","땅콩","느타리버섯","팽이버섯","새송이버섯","호두","아몬드","양송이버섯","표고버섯","더덕"],
-        "과일류": ["바나나","참다래","파인애플","오렌지","자몽","레몬","체리","건포도","건블루베리","망고","블루베리","아보카도","레드향","매실","무화과","복분자","샤인머스켓","곶감","골드키위","사과","배","복숭아","포도","감귤","단감"]
-    }
-    
-    response = "저희 사이트에서 취급하는 주요 상품 목록입니다:\n\n"
-    
-    for category, items in categories.items():
-        response += f"📦 {category} ({len(items)}종)\n"
-        response += f"   {', '.join(items)}"  # 모든 상품 표시
-        response += "\n\n"
-    
-    response += f"총 {len(PRODUCT_KEYWORDS)}가지의 농산물을 취급하고 있습니다.\n"
-    response += "특정 상품에 대한 자세한 정보가 필요하시면 언제든 말씀해 주세요!"
-    
+    # 카테고리별 상품 목록 안내 문구는 품목 카탈로그를 만들 때 미리 만들어 둠
     return {
-        "response": response,
+        "response": get_catalog().product_list_text,
         "type": "product_list"
-    } 
\ No newline at end of file
+    }
@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+# 사용자별 대화 히스토리 저장소 (최근 HISTORY_MAX_TURNS턴)
+# - 사용자 수 제한: 가장 오래 대화하지 않은 사용자부터 제거 (LRU)
+# - 유휴 만료: HISTORY_IDLE_TTL초 동안 대화가 없으면 제거
+# - 메모리 제한: 저장된 메시지 크기(UTF-8 바이트) 합계가 HISTORY_MAX_BYTES를 넘으면 오래된 사용자부터 제거
+HISTORY_MAX_USERS = int(os.getenv("HISTORY_MAX_USERS", "10000"))
+HISTORY_IDLE_TTL = int(os.getenv("HISTORY_IDLE_TTL", str(30 * 60)))
+HISTORY_MAX_BYTES = int(os.getenv("HISTORY_MAX_BYTES", str(32 * 1024 * 1024)))
+HISTORY_MAX_TURNS = int(os.getenv("HISTORY_MAX_TURNS", "3"))
+
+
+def _turn_size(turn):
+    return sum(len(text.encode("utf-8")) for text in turn)
+
+
+class HistoryStore:
+    """
+    user_id → deque((사용자 메시지, 봇 응답), maxlen=max_turns)
+    - get(user_id): 히스토리 복사본 (없거나 만료되면 빈 deque)
+    - append(user_id, user_message, bot_message): 한 턴 추가
+    - stats(): 사용자 수, 턴 수, 바이트 수, 사유별 제거 횟수
+    """
+
+    def __init__(self, max_users=HISTORY_MAX_USERS, idle_ttl=HISTORY_IDLE_TTL, max_bytes=HISTORY_MAX_BYTES, max_turns=HISTORY_MAX_TURNS):
+        self.max_users = max_users
+        self.idle_ttl = idle_ttl
+        self.max_bytes = max_bytes
+        self.max_turns = max_turns
+        self._data = OrderedDict()  # user_id -> [deque, last_access, bytes] (오래 대화하지 않은 순)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = {"lru": 0, "ttl": 0, "memory": 0}
+
+    def _remove(self, user_id, reason):
+        entry = self._data.pop(user_id)
+        self._bytes -= entry[2]
+        self.evictions[reason] += 1
+
+    def _expire(self, now):
+        # 접근 순서대로 정렬되어 있으므로 앞에서부터 만료된 사용자만 제거
+        while self._data:
+            user_id, entry = next(iter(self._data.items()))
+            if now - entry[1] < self.idle_ttl:
+                break
+            self._remove(user_id, "ttl")
+
+    def get(self, user_id):
+        with self._lock:
+            self._expire(time.time())
+            entry = self._data.get(user_id)
+            if entry is None:
+                return deque(maxlen=self.max_turns)
+            return deque(entry[0], maxlen=self.max_turns)
+
+    def append(self, user_id, user_message, bot_message):
+        turn = (user_message, bot_message)
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+            entry = self._data.get(user_id)
+            if entry is None:
+                entry = [deque(maxlen=self.max_turns), now, 0]
+                self._data[user_id] = entry
+            history = entry[0]
+            removed = _turn_size(history[0]) if len(history) == history.maxlen else 0
+            history.append(turn)
+            added = _turn_size(turn) - removed
+            entry[1] = now
+            entry[2] += added
+            self._bytes += added
+            self._data.move_to_end(user_id)
+            while len(self._data) > self.max_users:
+                self._remove(next(iter(self._data)), "lru")
+            while self._bytes > self.max_bytes and len(self._data) > 1:
+                self._remove(next(iter(self._data)), "memory")
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            self._expire(time.time())
+            return {
+                "users": len(self._data),
+                "max_users": self.max_users,
+                "turns": sum(len(entry[0]) for entry in self._data.values()),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": dict(self.evictions),
+            }
@@ -0,0 +1,182 @@
+import os
+import re
+import threading
+from product_matcher import find_mentions
+from handlers.faq_handler import CUSTOMER_SERVICE_INFO
+
+# LLM 분류기 앞단의 규칙 기반 분류기
+# 키워드/패턴으로 확실하게 분류되는 메시지는 LLM 호출 없이 바로 카테고리를 정하고,
+# 신뢰도가 ROUTER_MIN_CONFIDENCE 미만인 메시지만 LLM 분류기로 넘깁니다.
+ROUTER_MIN_CONFIDENCE = float(os.getenv("INTENT_ROUTER_MIN_CONFIDENCE", "0.8"))
+
+PRICE_WORDS = ["시세", "가격", "단가", "금액"]
+PRODUCT_INFO_WORDS = ["제철", "보관", "재배", "효능", "영양", "산지", "수확", "손질"]
+GREETING_WORDS = ["안녕", "반가워", "반갑"]
+DATE_TIME_WORDS = ["날짜", "몇시", "요일", "며칠", "몇일", "현재시간", "지금시간"]
+# 메시지 전체(공백 제거)가 인사/날짜·시간 질문일 때만 simple_info로 바로 분류
+# (예: '안녕하세요', '오늘 날짜 알려줘', '지금 몇시야?', '오늘 무슨 요일이야')
+GREETING_QUERY = re.compile(r'^(안녕|반가워|반갑)[가-힣]{0,5}[?!.~^]*$')
+DATE_TIME_QUERY = re.compile(
+    r'^(오늘|지금|현재)?(이|은)?(날짜|몇시|시간|무슨요일|요일|며칠|몇일)'
+    r'(이|은|는)?(야|이야|예요|에요|인가요|입니까|지|일까)?(알려줘|알려주세요|알려줄래)?[?!.~]*$'
+)
+# 한 글자 품목(무, 배, 파 등)은 조사만 붙은 단어로 쓰였을 때만 품목으로 인정 ('무슨', '배달'은 제외)
+SINGLE_SYLLABLE_PARTICLES = r'(?:[은는이가을를도의만]|이랑|랑|와|과)?'
+# FAQ 키(공백 제거) + FAQ에만 쓰이는 고객센터 표현
+# ('가입', '판매자'처럼 정책/교육 질문에도 흔한 단어는 넣지 않음: '농업인 보험 가입 지원 정책')
+FAQ_KEYWORDS = [k.replace(' ', '') for k in CUSTOMER_SERVICE_INFO] + ["환불", "고객센터", "상품등록"]
+# 정책/지원 질문에 쓰이는 단어 (다른 규칙에 걸려도 함께 있으면 LLM이 판단)
+POLICY_WORDS = ["정책", "지원", "보조금", "제도", "법령", "교육", "보험", "수출", "수입", "사업"]
+# 규칙에 걸렸지만 다른 의도의 단어가 함께 있는 메시지의 신뢰도 (ROUTER_MIN_CONFIDENCE 미만이라 LLM으로 넘어감)
+MIXED_CONFIDENCE = 0.6
+PRODUCT_CHECK_PATTERNS = ["도 팔", "도 있", "도 판매", "도 취급", "도 구입", "도 구매"]
+
+_stats_lock = threading.Lock()
+_rule_counts = {}
+_llm_count = 0
+
+
+def is_product_list_query(msg):
+    """
+    사용자의 질문이 '전체 품목 안내' 의도(예: 판매 품목, 상품 리스트 등)인지 판별하는 함수.
+    - '판매/취급/파는/전체/모든/전부' + '품목/상품/리스트/목록/종류' 조합이 포함된 경우 True 반환
+    - 또는 자주 쓰는 단일 패턴(전체 품목, 상품 리스트 등)이 포함된 경우 True 반환
+    - 그 외에는 False
+    """
+    patterns = [
+        ("판매", ["품목", "상품", "리스트", "목록", "종류"]),  # 예: '판매 품목', '판매 상품', ...
+        ("취급", ["품목", "상품", "리스트", "목록", "종류"]),  # 예: '취급 품목', ...
+        ("파는", ["품목", "상품", "리스트", "목록", "종류"]),  # 예: '파는 품목', ...
+        ("전체", ["품목", "상품", "리스트", "목록", "종류"]),  # 예: '전체 품목', ...
+        ("모든", ["품목", "상품", "리스트", "목록", "종류"]),  # 예: '모든 상품', ...
+        ("전부", ["품목", "상품", "리스트", "목록", "종류"]),  # 예: '전부 품목', ...
+    ]
+    for first, seconds in patterns:
+        # 두 그룹(예: '판매' + '품목')이 모두 포함된 경우 True
+        if first in msg and any(s in msg for s in seconds):
+            return True
+    # 자주 쓰는 단일 패턴(조합이 아니어도 바로 인식)
+    single_patterns = [
+        "상품 리스트", "품목 목록", "전부 뭐야", "무엇을 판매", "뭐 팔아"
+    ]
+    if any(p in msg for p in single_patterns):
+        return True
+    return False
+
+
+def is_product_check_query(msg):
+    """
+    사용자의 질문이 '고추도 팔아?', '망고도 있나요?', '감자 팔아?' 등 품목 판매 여부 확인 의도인지 판별하는 함수
+    - '도 팔', '도 있', ... 기존 패턴
+    - 품목명 + 동사(팔아, 있, 판매, 취급, 구입, 구매) 조합이 메시지에 포함되어 있으면 True
+    """
+    if any(p in msg for p in PRODUCT_CHECK_PATTERNS):
+        return True
+    # '도'가 없는 품목+동사 패턴도 인식
+    tokens = re.findall(r'[\w가-힣]+', msg)
+    verbs = ["팔아", "있", "판매", "취급", "구입", "구매"]
+    for t in tokens:
+        for v in verbs:
+            if t.endswith(v):
+                return True
+    return False
+
+
+def find_clear_products(msg):
+    """
+    메시지에서 품목으로 확실히 쓰인 것만 반환 (등장 순서, 중복 제거)
+    두 글자 이상으로 매칭됐거나, 한 글자 매칭이 조사만 붙은 독립된 단어인 경우
+    """
+    compact = re.sub(r'\s+', '', msg)
+    products = []
+    for start, end, p in find_mentions(msg):
+        if end - start < 2:
+            word = re.escape(compact[start:end])
+            if not re.search(rf'(?<![가-힣]){word}{SINGLE_SYLLABLE_PARTICLES}(?![가-힣])', msg):
+                continue
+        if p not in products:
+            products.append(p)
+    return products
+
+
+def route_intent(user_message):
+    """
+    규칙 기반으로 (카테고리, 신뢰도 0~1)를 반환합니다. 판단할 근거가 없으면 ('search', 0.0)
+    정책/지원 단어가 함께 있으면 ('감자 재배 지원 정책') 신뢰도를 MIXED_CONFIDENCE로 낮춰 LLM이 판단하게 합니다.
+    """
+    msg = user_message.strip()
+    compact = re.sub(r'\s+', '', msg)
+    category, confidence = _match_rules(msg, compact)
+    if confidence > MIXED_CONFIDENCE and category != "simple_info" and any(w in compact for w in POLICY_WORDS):
+        return category, MIXED_CONFIDENCE
+    return category, confidence
+
+
+def _match_rules(msg, compact):
+    products = find_clear_products(msg)
+    has_price_word = any(w in compact for w in PRICE_WORDS)
+    has_info_word = any(w in compact for w in PRODUCT_INFO_WORDS)
+
+    if has_price_word:
+        return ("price", 0.95) if products else ("price", 0.7)
+    if any(k in compact for k in FAQ_KEYWORDS):
+        # '딸기 배송 중 보관 방법'처럼 품목/품목 정보 단어가 함께 있으면 FAQ가 아닐 수 있음
+        if products or has_info_word:
+            return "faq", MIXED_CONFIDENCE
+        return "faq", 0.85
+    if is_product_list_query(msg):
+        return "product_list", 0.9
+    # '고추도 팔아?', '배추는 안팔아?', '감자 살 수 있어?' 처럼 판매 여부를 묻는 게 분명한 패턴
+    strong_check = any(p in msg for p in PRODUCT_CHECK_PATTERNS) or re.search(r'안[ ]?(팔|판매|취급)|살[ ]?수[ ]?있', msg)
+    if strong_check or is_product_check_query(msg):
+        if products:
+            return "product_check", 0.9
+        if strong_check:
+            return "product_check", 0.85
+        return "product_check", 0.5
+    if products and has_info_word:
+        return "product", 0.85
+    if GREETING_QUERY.match(compact) or DATE_TIME_QUERY.match(compact):
+        return "simple_info", 0.9
+    # 인사/날짜 단어가 들어 있어도 다른 질문일 수 있으므로 ('지난주 금요일 발표된 정책') LLM이 판단
+    if not products and any(w in compact for w in GREETING_WORDS + DATE_TIME_WORDS):
+        return "simple_info", 0.5
+    return "search", 0.0
+
+
+def _route(user_message):
+    """규칙 분류기의 신뢰도가 충분하면 카테고리를, 아니면 None을 반환하고 경로별 처리 건수를 집계합니다."""
+    global _llm_count
+    category, confidence = route_intent(user_message)
+    print(f"[DEBUG] 규칙 분류: {category} (신뢰도 {confidence:.2f})")
+    with _stats_lock:
+        if confidence >= ROUTER_MIN_CONFIDENCE:
+            _rule_counts[category] = _rule_counts.get(category, 0) + 1
+            return category
+        _llm_count += 1
+    return None
+
+
+def classify(user_message, llm_classifier):
+    """
+    규칙 분류기의 신뢰도가 충분하면 그 결과를, 아니면 llm_classifier(user_message) 결과를 반환합니다.
+    경로별 처리 건수를 집계합니다.
+    """
+    return _route(user_message) or llm_classifier(user_message)
+
+
+async def classify_async(user_message, llm_classifier):
+    """classify의 비동기 버전 (llm_classifier는 async 함수)"""
+    return _route(user_message) or await llm_classifier(user_message)
+
+
+def get_router_stats():
+    with _stats_lock:
+        rule_total = sum(_rule_counts.values())
+        total = rule_total + _llm_count
+        return {
+            "rule": dict(_rule_counts),
+            "rule_total": rule_total,
+            "llm": _llm_count,
+            "llm_skipped_ratio": round(rule_total / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,181 @@
+import os
+import threading
+from metrics import Counter, current_timer
+from price_cache import kst_now
+
+# LLM 토큰 사용량/비용 집계
+# - chat_completion(client, stage, **kwargs): chat.completions.create를 호출하고 응답의 usage(입력/출력 토큰)를 단계(stage)별로 기록
+#   (스트리밍 호출은 stream_options.include_usage로 마지막 조각의 usage를 받아 record_usage로 기록)
+# - 요청 하나의 합계(request_usage)는 대화 로그의 llm_usage 필드에 함께 저장
+# - 카테고리/사용자/날짜별 합계는 GET /usage, 단계/모델/카테고리별 토큰 수와 비용은 GET /metrics
+# 모델별 100만 토큰당 가격 (USD, 입력/출력), 목록에 없는 모델은 비용 0으로 집계
+MODEL_PRICES = {
+    "gpt-4o-2024-05-13": (5.00, 15.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+# 사용자/카테고리별 합계를 메모리에 보관하는 일수
+LLM_USAGE_DAYS = int(os.getenv("LLM_USAGE_DAYS", "7"))
+# GET /usage에 보여주는 사용자 수 (토큰을 많이 쓴 순)
+LLM_USAGE_TOP_USERS = int(os.getenv("LLM_USAGE_TOP_USERS", "20"))
+# 하루에 사용자별 합계를 보관하는 최대 사용자 수 (넘으면 사용량이 적은 사용자부터 '기타 사용자' 합계로 합침)
+LLM_USAGE_MAX_USERS = int(os.getenv("LLM_USAGE_MAX_USERS", "10000"))
+
+LLM_CALLS = Counter("chatbot_llm_calls_total", "LLM calls by stage and model", ("stage", "model"))
+LLM_TOKENS = Counter("chatbot_llm_tokens_total", "LLM tokens by stage, model and type (prompt/completion)", ("stage", "model", "type"))
+LLM_COST = Counter("chatbot_llm_cost_usd_total", "Estimated LLM cost in USD by stage and model", ("stage", "model"))
+CATEGORY_TOKENS = Counter("chatbot_llm_category_tokens_total", "LLM tokens used by /chat requests per category and type", ("category", "type"))
+CATEGORY_COST = Counter("chatbot_llm_category_cost_usd_total", "Estimated LLM cost in USD of /chat requests per category", ("category",))
+
+
+def _model_price(model):
+    if model in MODEL_PRICES:
+        return MODEL_PRICES[model]
+    # 'gpt-4o-mini-2024-07-18' 같은 날짜 붙은 모델명은 가장 긴 접두어로 찾음
+    for name in sorted(MODEL_PRICES, key=len, reverse=True):
+        if model and model.startswith(name):
+            return MODEL_PRICES[name]
+    return (0.0, 0.0)
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    input_price, output_price = _model_price(model)
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+
+def record_usage(stage, model, usage):
+    """LLM 호출 한 번의 사용량 기록 (usage가 없는 응답은 토큰 0으로 호출 수만 집계)"""
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+    model = model or "unknown"
+    cost = estimate_cost(model, prompt_tokens, completion_tokens)
+    LLM_CALLS.inc(stage=stage, model=model)
+    LLM_TOKENS.inc(prompt_tokens, stage=stage, model=model, type="prompt")
+    LLM_TOKENS.inc(completion_tokens, stage=stage, model=model, type="completion")
+    LLM_COST.inc(cost, stage=stage, model=model)
+    timer = current_timer()
+    if timer is not None:
+        timer.llm_calls.append({
+            "stage": stage,
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cost_usd": cost,
+        })
+
+
+def chat_completion(client, stage, **kwargs):
+    completion = client.chat.completions.create(**kwargs)
+    record_usage(stage, getattr(completion, "model", None) or kwargs.get("model"), getattr(completion, "usage", None))
+    return completion
+
+
+async def chat_completion_async(client, stage, **kwargs):
+    completion = await client.chat.completions.create(**kwargs)
+    record_usage(stage, getattr(completion, "model", None) or kwargs.get("model"), getattr(completion, "usage", None))
+    return completion
+
+
+def _empty_totals():
+    return {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "cost_usd": 0.0}
+
+
+def _add(totals, prompt_tokens, completion_tokens, cost, calls=1):
+    totals["calls"] += calls
+    totals["prompt_tokens"] += prompt_tokens
+    totals["completion_tokens"] += completion_tokens
+    totals["total_tokens"] += prompt_tokens + completion_tokens
+    totals["cost_usd"] += cost
+
+
+def request_usage():
+    """현재 요청에서 호출한 LLM 사용량 합계와 단계별 합계 (요청 밖이면 None)"""
+    timer = current_timer()
+    if timer is None:
+        return None
+    usage = _empty_totals()
+    usage["by_stage"] = {}
+    for call in list(timer.llm_calls):
+        _add(usage, call["prompt_tokens"], call["completion_tokens"], call["cost_usd"])
+        stage = usage["by_stage"].setdefault(call["stage"], {**_empty_totals(), "model": call["model"]})
+        _add(stage, call["prompt_tokens"], call["completion_tokens"], call["cost_usd"])
+    usage["cost_usd"] = round(usage["cost_usd"], 6)
+    for stage in usage["by_stage"].values():
+        stage["cost_usd"] = round(stage["cost_usd"], 6)
+    return usage
+
+
+class UsageAggregator:
+    """
+    날짜(YYYYMMDD, KST)별 카테고리/사용자 LLM 사용량 합계 (최근 days일만 보관)
+    - record(user_id, category, usage): 요청 하나의 request_usage() 결과를 더함
+    - report(day=None): 그날의 전체/카테고리별 합계와 사용량이 많은 사용자 top_users명
+    - 하루 사용자 수가 max_users를 넘으면 사용량이 적은 사용자를 other_users 합계로 합쳐 메모리를 제한
+    """
+
+    def __init__(self, days=LLM_USAGE_DAYS, top_users=LLM_USAGE_TOP_USERS, max_users=LLM_USAGE_MAX_USERS):
+        self.days = days
+        self.top_users = top_users
+        self.max_users = max_users
+        self._days = {}  # day -> {"total", "categories", "users", "other_users", "trimmed_users"}
+        self._lock = threading.Lock()
+
+    def record(self, user_id, category, usage, day=None):
+        day = day or kst_now().strftime("%Y%m%d")
+        args = (usage["prompt_tokens"], usage["completion_tokens"], usage["cost_usd"], usage["calls"])
+        with self._lock:
+            entry = self._days.get(day)
+            if entry is None:
+                entry = self._days[day] = {"total": _empty_totals(), "categories": {}, "users": {}, "other_users": _empty_totals(), "trimmed_users": 0}
+                for old in sorted(self._days)[:-self.days]:
+                    del self._days[old]
+            _add(entry["total"], *args)
+            entry["total"]["requests"] = entry["total"].get("requests", 0) + 1
+            _add(entry["categories"].setdefault(category, _empty_totals()), *args)
+            _add(entry["users"].setdefault(user_id, _empty_totals()), *args)
+            if len(entry["users"]) > self.max_users:
+                self._trim_users(entry)
+
+    def _trim_users(self, entry):
+        """사용량이 적은 사용자를 max_users의 90%만 남을 때까지 other_users로 합침 (매 요청마다 정렬하지 않도록 여유를 둠)"""
+        keep = int(self.max_users * 0.9)
+        users = sorted(entry["users"].items(), key=lambda item: item[1]["total_tokens"], reverse=True)
+        for _, totals in users[keep:]:
+            _add(entry["other_users"], totals["prompt_tokens"], totals["completion_tokens"], totals["cost_usd"], totals["calls"])
+        entry["trimmed_users"] += len(users) - keep
+        entry["users"] = dict(users[:keep])
+
+    def report(self, day=None):
+        day = day or kst_now().strftime("%Y%m%d")
+        with self._lock:
+            entry = self._days.get(day)
+            if entry is None:
+                return {"day": day, "total": _empty_totals(), "categories": {}, "top_users": [], "days": sorted(self._days)}
+            users = sorted(entry["users"].items(), key=lambda item: item[1]["total_tokens"], reverse=True)[:self.top_users]
+            return {
+                "day": day,
+                "total": _rounded(entry["total"]),
+                "categories": {c: _rounded(t) for c, t in entry["categories"].items()},
+                "top_users": [{"user_id": u, **_rounded(t)} for u, t in users],
+                "user_count": len(entry["users"]),
+                "trimmed_users": entry["trimmed_users"],
+                "other_users": _rounded(entry["other_users"]),
+                "days": sorted(self._days),
+            }
+
+
+def _rounded(totals):
+    return dict(totals, cost_usd=round(totals["cost_usd"], 6))
+
+
+usage_totals = UsageAggregator()
+
+
+def record_request(user_id, category, usage):
+    """요청이 끝날 때 호출: 카테고리별 카운터와 날짜별 카테고리/사용자 합계에 더함"""
+    if usage is None:
+        return
+    CATEGORY_TOKENS.inc(usage["prompt_tokens"], category=category, type="prompt")
+    CATEGORY_TOKENS.inc(usage["completion_tokens"], category=category, type="completion")
+    CATEGORY_COST.inc(usage["cost_usd"], category=category)
+    usage_totals.record(user_id, category, usage)
@@ -0,0 +1,328 @@
+"""
+부하 테스트용 로컬 대체 서비스 (외부 API 비용 없이, 운영 DB에 접속하지 않고 /chat 부하 테스트)
+
+- FakeOpenAIServer: OpenAI 호환 /v1/chat/completions (분류/일괄 요약 JSON/일반 답변/스트리밍)
+- FakeTavilyServer: Tavily /search (질문 단어가 들어간 검색 결과)
+- PriceDatabase: tb_price_api_history / tb_code_detail 모양의 SQLite 시세 테이블
+  (oracle_pool.set_connection_factory에 connect를 넘기면 시세 조회가 이 DB를 사용)
+- InMemoryCollection: 대화 로그 insert_many를 메모리에 저장하는 MongoDB 컬렉션 대체
+
+응답 지연은 LatencyModel로 지정합니다. (fixed:0.2 / uniform:0.1,0.5 / normal:0.3,0.1 / lognormal:0.8,0.5)
+"""
+import json
+import math
+import os
+import random
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class LatencyModel:
+    """
+    응답 지연(초) 분포
+    - fixed:a           항상 a초
+    - uniform:a,b       a~b초 균등 분포
+    - normal:mean,sd    정규 분포 (0 미만은 0)
+    - lognormal:median,sigma  로그 정규 분포 (LLM 응답처럼 오른쪽 꼬리가 긴 지연)
+    """
+
+    def __init__(self, spec="fixed:0", seed=None):
+        self.spec = spec
+        kind, _, args = spec.partition(":")
+        self.kind = kind
+        self.args = [float(a) for a in args.split(",") if a]
+        if kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"알 수 없는 지연 분포: {spec} (fixed/uniform/normal/lognormal)")
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self):
+        with self._lock:
+            if self.kind == "fixed":
+                return self.args[0] if self.args else 0.0
+            if self.kind == "uniform":
+                return self._random.uniform(self.args[0], self.args[1])
+            if self.kind == "normal":
+                return max(0.0, self._random.gauss(self.args[0], self.args[1]))
+            return self._random.lognormvariate(math.log(self.args[0]), self.args[1])
+
+    def sleep(self):
+        delay = self.sample()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+class _FakeServer:
+    """ThreadingHTTPServer를 백그라운드 스레드에서 실행하는 공통 부분"""
+
+    def __init__(self, handler_class, host="127.0.0.1", port=0):
+        self.calls = {}
+        self._calls_lock = threading.Lock()
+        server = self
+
+        class Handler(handler_class):
+            owner = server
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name=type(self).__name__, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name):
+        with self._calls_lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class _JSONHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _estimate_tokens(text):
+    # 한국어는 대략 1~2글자당 1토큰
+    return max(1, len(text) // 2)
+
+
+class _OpenAIHandler(_JSONHandler):
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_json(404, {"error": {"message": f"not found: {self.path}"}})
+            return
+        request = self.read_json()
+        prompt = "\n".join(str(m.get("content", "")) for m in request.get("messages", []))
+        kind, content = self.owner.answer(prompt, request)
+        self.owner.count(kind)
+        self.owner.latency.sleep()
+        if request.get("stream"):
+            self.send_stream(request, content)
+            return
+        prompt_tokens, completion_tokens = _estimate_tokens(prompt), _estimate_tokens(content)
+        self.send_json(200, {
+            "id": f"chatcmpl-fake-{time.time_ns()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4o-2024-05-13"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+        })
+
+    def send_stream(self, request, content):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        base = {"id": f"chatcmpl-fake-{time.time_ns()}", "object": "chat.completion.chunk", "created": int(time.time()), "model": request.get("model", "gpt-4o-2024-05-13")}
+        pieces = [content[i:i + 8] for i in range(0, len(content), 8)] or [""]
+        for piece in pieces:
+            chunk = dict(base, choices=[{"index": 0, "delta": {"content": piece}, "finish_reason": None}])
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+        chunk = dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        if (request.get("stream_options") or {}).get("include_usage"):
+            prompt = "\n".join(str(m.get("content", "")) for m in request.get("messages", []))
+            prompt_tokens, completion_tokens = _estimate_tokens(prompt), _estimate_tokens(content)
+            chunk = dict(base, choices=[], usage={"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens})
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.close_connection = True
+
+
+class FakeOpenAIServer(_FakeServer):
+    """
+    OpenAI 호환 chat completions 서버
+    - 의도 분류 프롬프트: classify_answers(질문 → 카테고리)에 있으면 그 카테고리, 없으면 'search'
+    - response_format=json_object (검색 결과 일괄 요약): [번호]별 요약 JSON
+    - 그 외: 짧은 한국어 답변 (stream=True면 SSE 조각으로)
+    - calls: 요청 종류별 호출 수 (classify / batch_summary / completion)
+    """
+
+    def __init__(self, latency=None, classify_answers=None, host="127.0.0.1", port=0):
+        super().__init__(_OpenAIHandler, host, port)
+        self.latency = latency or LatencyModel()
+        self.classify_answers = dict(classify_answers or {})
+
+    @property
+    def base_url(self):
+        return f"{self.url}/v1"
+
+    def answer(self, prompt, request):
+        if "카테고리(영어 소문자만" in prompt:
+            m = re.search(r'질문: "(.*)"', prompt)
+            question = m.group(1) if m else ""
+            return "classify", self.classify_answers.get(question, "search")
+        if (request.get("response_format") or {}).get("type") == "json_object":
+            indexes = [int(i) for i in re.findall(r'^\[(\d+)\]$', prompt, re.M)]
+            results = [{"index": i, "summary": f"검색 결과 {i}번의 핵심 내용을 정리한 요약입니다.", "relevant": True} for i in indexes]
+            return "batch_summary", json.dumps({"results": results}, ensure_ascii=False)
+        return "completion", "문의하신 내용에 대한 안내입니다. 오늘은 {date}이며 자세한 내용은 고객센터로 문의해주세요."
+
+
+class _TavilyHandler(_JSONHandler):
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/search"):
+            self.send_json(404, {"detail": f"not found: {self.path}"})
+            return
+        request = self.read_json()
+        query = request.get("query", "")
+        self.owner.count("search")
+        self.owner.latency.sleep()
+        self.send_json(200, {"query": query, "results": self.owner.results_for(query, int(request.get("max_results", 5)))})
+
+
+class FakeTavilyServer(_FakeServer):
+    """Tavily /search 대체 서버 (질문 단어를 포함한 검색 결과를 max_results개 반환, 같은 질문이면 같은 URL)"""
+
+    def __init__(self, latency=None, host="127.0.0.1", port=0):
+        super().__init__(_TavilyHandler, host, port)
+        self.latency = latency or LatencyModel()
+
+    @property
+    def search_url(self):
+        return f"{self.url}/search"
+
+    def results_for(self, query, max_results):
+        words = " ".join(re.findall(r'[가-힣A-Za-z0-9]+', query))
+        key = abs(hash(query)) % 100000
+        return [{
+            "title": f"{words} 관련 소식 {i + 1}",
+            "url": f"https://example.com/{key}/{i}",
+            "content": f"{words}에 대한 최근 정보입니다. 산지 동향과 유통 현황, 재배 관리 방법을 정리했습니다. ({i + 1})",
+            "score": round(1 - i * 0.05, 2),
+        } for i in range(max_results)]
+
+
+class _Cursor:
+    def __init__(self, conn, latency):
+        self._cursor = conn.cursor()
+        self._latency = latency
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+    def execute(self, sql, params=None, **kwargs):
+        self._latency.sleep()
+        self._cursor.execute(PriceDatabase.to_sqlite(sql), params if params is not None else kwargs)
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+
+class _Connection:
+    def __init__(self, path, latency):
+        self._conn = sqlite3.connect(path, timeout=5)
+        self._latency = latency
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._conn.close()
+
+    def cursor(self):
+        return _Cursor(self._conn, self._latency)
+
+
+class PriceDatabase:
+    """
+    오라클 시세 테이블과 같은 모양의 SQLite DB
+    - tb_code_detail(LOW_CODE_VALUE, LOW_CODE_NAME)
+    - tb_price_api_history(LOW_CODE_VALUE, RECORDED_DATE 'YYYYMMDD', RECORDED_UNIT_PRICE)
+    품목별로 오늘부터 days일 전까지 하루 rows_per_day건(산지별 가격)을 만듭니다.
+    price_handler의 오라클 SQL은 TO_DATE/TO_CHAR만 바꿔서 그대로 실행합니다.
+    """
+
+    def __init__(self, products, days=60, rows_per_day=3, latency=None, path=None, seed=0):
+        self.latency = latency or LatencyModel()
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="loadtest_price_", suffix=".sqlite3")
+            os.close(fd)
+        self.path = path
+        rng = random.Random(seed)
+        today = datetime.now()
+        conn = sqlite3.connect(path)
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS tb_code_detail")
+            conn.execute("DROP TABLE IF EXISTS tb_price_api_history")
+            conn.execute("CREATE TABLE tb_code_detail (LOW_CODE_VALUE TEXT PRIMARY KEY, LOW_CODE_NAME TEXT NOT NULL)")
+            conn.execute("CREATE TABLE tb_price_api_history (LOW_CODE_VALUE TEXT NOT NULL, RECORDED_DATE TEXT NOT NULL, RECORDED_UNIT_PRICE REAL)")
+            conn.execute("CREATE INDEX idx_price_code_date ON tb_price_api_history (LOW_CODE_VALUE, RECORDED_DATE)")
+            conn.execute("CREATE INDEX idx_code_name ON tb_code_detail (LOW_CODE_NAME)")
+            history = []
+            for i, name in enumerate(products):
+                code = f"{i:04d}"
+                conn.execute("INSERT INTO tb_code_detail VALUES (?, ?)", (code, name))
+                base = rng.randint(500, 20000)
+                for day in range(days):
+                    date = (today - timedelta(days=day)).strftime("%Y%m%d")
+                    for _ in range(rows_per_day):
+                        history.append((code, date, round(base * rng.uniform(0.8, 1.2))))
+            conn.executemany("INSERT INTO tb_price_api_history VALUES (?, ?, ?)", history)
+        conn.close()
+
+    @staticmethod
+    def to_sqlite(sql):
+        sql = re.sub(r"TO_DATE\((:\w+),\s*'YYYYMMDD'\)", r"\1", sql)
+        return re.sub(r"TO_CHAR\(([\w.]+),\s*'YYYYMMDD'\)", r"\1", sql)
+
+    def connect(self):
+        return _Connection(self.path, self.latency)
+
+    def close(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class InMemoryCollection:
+    """대화 로그 MongoDB 컬렉션 대체 (insert_many만 지원)"""
+
+    def __init__(self, latency=None):
+        self.latency = latency or LatencyModel()
+        self.documents = []
+        self._lock = threading.Lock()
+
+    def insert_many(self, documents, ordered=True):
+        self.latency.sleep()
+        with self._lock:
+            self.documents.extend(documents)
+
+    def count_documents(self, _filter=None):
+        with self._lock:
+            return len(self.documents)
@@ -0,0 +1,265 @@
+"""
+/chat 부하 테스트 (외부 서비스 대신 loadtest/fake_services.py의 로컬 대체 서비스 사용)
+
+    python loadtest/run_loadtest.py --rps 20 --duration 30
+    python loadtest/run_loadtest.py --rps 50 --duration 60 --server asgi --openai-latency lognormal:0.8,0.5
+    python loadtest/run_loadtest.py --mix price=50,faq=50 --no-cache --json result.json
+
+- 챗봇 앱을 이 프로세스에서 실행하고 (Flask 스레드 서버 또는 uvicorn ASGI)
+  OpenAI/Tavily는 가짜 HTTP 서버, 오라클 시세는 SQLite, MongoDB 대화 로그는 메모리 컬렉션으로 바꿉니다.
+- 카테고리 비율(--mix)대로 질문을 골라 목표 RPS로 보내고 (이전 요청 완료를 기다리지 않는 open-loop)
+  카테고리별 p50/p95/p99 지연 시간과 처리량을 출력합니다.
+- 지연 시간은 예정된 전송 시각부터 응답까지 (부하 발생기가 밀려서 늦게 보낸 시간도 포함)
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fake_services import FakeOpenAIServer, FakeTavilyServer, PriceDatabase, InMemoryCollection, LatencyModel  # noqa: E402
+
+# 카테고리별 질문 (실제 문의 유형을 본뜬 고정 목록)
+QUERIES = {
+    "price": [
+        "오늘 배추 시세 알려줘", "감자 가격 얼마야?", "어제 양파 가격이랑 오늘 가격 비교해줘", "저번주 금요일 사과 시세",
+        "상추, 배추, 무 오늘 시세", "이번주 월요일 고구마 가격", "대파 시세 어때?", "복숭아 시세 알려줘",
+    ],
+    "faq": [
+        "반품 가능한가요?", "배송 언제되나요?", "결제 방법 알려주세요", "회원가입 어떻게 하나요?",
+        "상품 등록 제한이 뭐가 있어?", "판매자인데 구매도 가능해?", "고객센터 연락처 알려줘", "교환하려면 어떻게 해?",
+    ],
+    "product": [
+        "상추 보관 방법 알려주세요", "감자 제철 시기 언제인가요?", "복숭아는 언제가 제철이야?", "딸기 재배법 알려줘",
+        "요즘 수박이 나와?", "고구마 주요 산지가 어디야?",
+    ],
+    "policy": [
+        "최근 시행된 농업 정책 알려줘", "농업 지원 제도 뭐가 있어?", "스마트팜 지원 정책 알려줘", "청년 농업인 지원 제도",
+    ],
+    "export": [
+        "최근 농산물 수출입 동향", "딸기 수출 실적 알려줘", "농산물 수출 통계",
+    ],
+    "search": [
+        "최근 농업 뉴스 알려줘", "올해 배추 작황 어때?", "농산물 도매시장 동향", "이상기후 농업 피해 소식",
+    ],
+    "simple_info": [
+        "안녕", "오늘 날짜 알려줘", "지금 몇시야?", "반가워",
+    ],
+    "product_list": [
+        "판매하는 품목이 뭐야?", "취급 품목 알려줘", "전체 상품 리스트 보여줘",
+    ],
+    "product_check": [
+        "고추도 팔아?", "망고도 있나요?", "수박도 판매해?", "배추는 안팔아?", "감자 살 수 있어?",
+    ],
+}
+DEFAULT_MIX = "price=25,faq=20,product=15,search=10,policy=8,export=4,simple_info=8,product_list=5,product_check=5"
+
+
+def parse_mix(spec):
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in QUERIES:
+            raise SystemExit(f"알 수 없는 카테고리: {name} ({', '.join(QUERIES)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values, p):
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(p / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def disable_caches():
+    """--no-cache: 답변/분류/Tavily/시세 캐시를 끄고 매 요청이 핸들러를 끝까지 거치게 함 (앱 import 전에 호출)"""
+    for name in ("FAQ", "PRODUCT", "POLICY", "EXPORT", "SEARCH"):
+        os.environ[f"ANSWER_CACHE_TTL_{name}"] = "0"
+    os.environ["CLASSIFY_CACHE_MAX_ENTRIES"] = "0"
+    os.environ["TAVILY_CACHE_MAX_ENTRIES"] = "0"
+    os.environ["PRICE_CACHE_MAX_ENTRIES"] = "0"
+
+
+def start_app(server, host, port):
+    """챗봇 앱을 백그라운드 스레드에서 실행하고 주소를 반환"""
+    if server == "asgi":
+        import uvicorn
+        import asgi
+        config = uvicorn.Config(asgi.application, host=host, port=port, log_level="warning", access_log=False)
+        uv = uvicorn.Server(config)
+        threading.Thread(target=uv.run, name="uvicorn", daemon=True).start()
+        while not uv.started:
+            time.sleep(0.05)
+        port = uv.servers[0].sockets[0].getsockname()[1]
+
+        def stop():
+            uv.should_exit = True
+        return f"http://{host}:{port}", stop
+    from werkzeug.serving import make_server
+    import agriculture_chatbot
+    httpd = make_server(host, port, agriculture_chatbot.app, threaded=True)
+    threading.Thread(target=httpd.serve_forever, name="flask", daemon=True).start()
+    return f"http://{host}:{httpd.server_port}", httpd.shutdown
+
+
+def drive(base_url, mix, rps, duration, concurrency, users, seed, timeout):
+    """목표 RPS로 /chat 요청을 보내고 [(카테고리, 지연 시간, 성공 여부)] 반환"""
+    import requests
+    rng = random.Random(seed)
+    categories = list(mix)
+    weights = [mix[c] for c in categories]
+    local = threading.local()
+    samples = []
+    samples_lock = threading.Lock()
+
+    def send(category, message, user_id, scheduled):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        try:
+            r = session.post(f"{base_url}/chat", json={"message": message, "user_id": user_id}, timeout=timeout)
+            ok = r.status_code == 200 and "response" in r.json()
+        except Exception:
+            ok = False
+        latency = time.perf_counter() - scheduled
+        with samples_lock:
+            samples.append((category, latency, ok))
+
+    total = int(rps * duration)
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="loadtest") as executor:
+        start = time.perf_counter()
+        for i in range(total):
+            scheduled = start + i / rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            category = rng.choices(categories, weights)[0]
+            executor.submit(send, category, rng.choice(QUERIES[category]), f"loadtest-{rng.randrange(users)}", scheduled)
+    elapsed = time.perf_counter() - start
+    return samples, elapsed
+
+
+def summarize(samples, elapsed):
+    rows = {}
+    for category in sorted({s[0] for s in samples}) + ["all"]:
+        selected = [s for s in samples if category == "all" or s[0] == category]
+        latencies = sorted(s[1] for s in selected)
+        rows[category] = {
+            "requests": len(selected),
+            "errors": sum(1 for s in selected if not s[2]),
+            "throughput_rps": round(len(selected) / elapsed, 2),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+            "max_ms": round((latencies[-1] if latencies else 0) * 1000, 1),
+        }
+    return rows
+
+
+def print_report(rows, elapsed, extra):
+    print(f"\n{'category':14s} {'req':>6s} {'err':>5s} {'rps':>7s} {'p50(ms)':>9s} {'p95(ms)':>9s} {'p99(ms)':>9s} {'max(ms)':>9s}")
+    for category, r in rows.items():
+        print(f"{category:14s} {r['requests']:6d} {r['errors']:5d} {r['throughput_rps']:7.2f} {r['p50_ms']:9.1f} {r['p95_ms']:9.1f} {r['p99_ms']:9.1f} {r['max_ms']:9.1f}")
+    print(f"\n경과 시간 {elapsed:.1f}초")
+    for name, value in extra.items():
+        print(f"{name}: {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/chat 부하 테스트 (로컬 대체 서비스 사용)")
+    parser.add_argument("--rps", type=float, default=10, help="목표 초당 요청 수")
+    parser.add_argument("--duration", type=float, default=30, help="요청을 보내는 시간(초)")
+    parser.add_argument("--concurrency", type=int, default=256, help="부하 발생기의 최대 동시 요청 수")
+    parser.add_argument("--users", type=int, default=200, help="요청에 사용할 user_id 수")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="카테고리별 비율 (예: price=30,faq=20)")
+    parser.add_argument("--server", choices=["flask", "asgi"], default="flask")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="챗봇 앱 포트 (0이면 빈 포트)")
+    parser.add_argument("--openai-latency", default="lognormal:0.6,0.4")
+    parser.add_argument("--tavily-latency", default="lognormal:0.8,0.3")
+    parser.add_argument("--db-latency", default="uniform:0.005,0.02")
+    parser.add_argument("--mongo-latency", default="fixed:0.01")
+    parser.add_argument("--no-cache", action="store_true", help="답변/분류/검색/시세 캐시 끄기")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="앱의 [DEBUG] 출력 표시")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+    mix = parse_mix(args.mix)
+
+    classify_answers = {q: c for c, qs in QUERIES.items() for q in qs}
+    openai_server = FakeOpenAIServer(LatencyModel(args.openai_latency, args.seed), classify_answers).start()
+    tavily_server = FakeTavilyServer(LatencyModel(args.tavily_latency, args.seed + 1)).start()
+    workdir = tempfile.mkdtemp(prefix="loadtest_")
+    # 앱 import 전에 외부 서비스 주소와 로컬 파일 경로를 바꿈
+    os.environ.update({
+        "OPENAI_API_KEY": "loadtest",
+        "OPENAI_BASE_URL": openai_server.base_url,
+        "TAVILY_API_KEY": "loadtest",
+        "TAVILY_API_URL": tavily_server.search_url,
+        "TAVILY_CACHE_PATH": "",
+        "SESSION_BACKEND": "memory",
+        # 품목 목록도 SQLite의 tb_code_detail에서 읽음
+        "PRODUCT_CATALOG_FROM_DB": "true",
+        "CHAT_LOG_SPILL_PATH": os.path.join(workdir, "chat_log_spill.jsonl"),
+    })
+    os.environ.pop("CLASSIFY_CACHE_PATH", None)
+    if args.no_cache:
+        disable_caches()
+
+    import oracle_pool
+    from product_list import PRODUCT_KEYWORDS
+    price_db = PriceDatabase(PRODUCT_KEYWORDS, latency=LatencyModel(args.db_latency, args.seed + 2), path=os.path.join(workdir, "price.sqlite3"))
+    oracle_pool.set_connection_factory(price_db.connect)
+    import agriculture_chatbot
+    import llm_accounting
+    mongo = InMemoryCollection(LatencyModel(args.mongo_latency, args.seed + 3))
+    agriculture_chatbot.chat_log_writer.collection = mongo
+
+    base_url, stop_app = start_app(args.server, args.host, args.port)
+    print(f"[부하 테스트] {base_url} ({args.server}) {args.rps} rps × {args.duration}초, OpenAI {args.openai_latency}, Tavily {args.tavily_latency}")
+    real_stdout = sys.stdout
+    if not args.verbose:
+        sys.stdout = open(os.devnull, "w")
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    try:
+        samples, elapsed = drive(base_url, mix, args.rps, args.duration, args.concurrency, args.users, args.seed, args.timeout)
+        agriculture_chatbot.chat_log_writer.close()
+    finally:
+        if not args.verbose:
+            sys.stdout.close()
+            sys.stdout = real_stdout
+        stop_app()
+        openai_server.stop()
+        tavily_server.stop()
+        oracle_pool.set_connection_factory(None)
+
+    rows = summarize(samples, elapsed)
+    extra = {
+        "openai_calls": dict(openai_server.calls),
+        "tavily_calls": dict(tavily_server.calls),
+        "chat_logs_saved": mongo.count_documents(),
+        "llm_usage_by_category": llm_accounting.usage_totals.report()["categories"],
+    }
+    print_report(rows, elapsed, extra)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "elapsed_seconds": round(elapsed, 2), "categories": rows, **extra}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json}")
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import contextvars
+import inspect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# 요청 처리 단계별 소요 시간 측정
+# - request_timer(): /chat 요청 하나의 측정 범위 (분류 카테고리와 단계별 소요 시간을 모아 요청이 끝날 때 히스토그램에 기록)
+# - span(stage) / @timed(stage): 단계 하나의 소요 시간 (요청 밖에서 실행되면 category="background"로 바로 기록)
+# - render_metrics(): Prometheus 텍스트 형식 (GET /metrics)
+# 요청 본문에 "debug_timing": true를 넣거나 METRICS_TIMING_IN_RESPONSE=true면 응답에 단계별 소요 시간(timings)을 붙입니다.
+METRICS_TIMING_IN_RESPONSE = os.getenv("METRICS_TIMING_IN_RESPONSE", "false").lower() == "true"
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry = []
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = list(zip(labelnames, values)) + (extra or [])
+    if not pairs:
+        return ""
+    escaped = [(k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for k, v in pairs]
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def _format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=DURATION_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}  # 라벨 값 -> [버킷별 개수, 합계, 개수]
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (bucket_counts, total, count) in sorted(self._values.items()):
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', _format_value(bound))])} {bucket_count}")
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', '+Inf')])} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total!r}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+STAGE_DURATION = Histogram("chatbot_stage_duration_seconds", "Time spent in each stage of /chat (stage=total is the whole request)", ("category", "stage"))
+REQUESTS = Counter("chatbot_requests_total", "Chat requests by category and status", ("category", "status"))
+
+
+class RequestTimer:
+    """요청 하나의 카테고리와 단계별 소요 시간 [(단계, 초), ...], LLM 호출 사용량 (llm_accounting)"""
+
+    def __init__(self):
+        self.category = "unknown"
+        self.status = "ok"
+        self.spans = []
+        self.llm_calls = []
+        self.started = time.perf_counter()
+        self.total = None
+
+    def breakdown(self):
+        """{"total_ms", "stages": {단계: {"count", "ms"}}} (동시에 실행된 단계는 합계가 total보다 클 수 있음)"""
+        stages = {}
+        for stage, seconds in list(self.spans):
+            entry = stages.setdefault(stage, {"count": 0, "ms": 0.0})
+            entry["count"] += 1
+            entry["ms"] += seconds * 1000
+        for entry in stages.values():
+            entry["ms"] = round(entry["ms"], 1)
+        total = self.total if self.total is not None else time.perf_counter() - self.started
+        return {"category": self.category, "total_ms": round(total * 1000, 1), "stages": stages}
+
+
+_current = contextvars.ContextVar("request_timer", default=None)
+
+
+@contextmanager
+def request_timer():
+    timer = RequestTimer()
+    token = _current.set(timer)
+    try:
+        yield timer
+    except Exception:
+        timer.status = "error"
+        raise
+    finally:
+        _current.reset(token)
+        timer.total = time.perf_counter() - timer.started
+        for stage, seconds in list(timer.spans):
+            STAGE_DURATION.observe(seconds, category=timer.category, stage=stage)
+        STAGE_DURATION.observe(timer.total, category=timer.category, stage="total")
+        REQUESTS.inc(category=timer.category, status=timer.status)
+
+
+def current_timer():
+    return _current.get()
+
+
+def set_category(category):
+    timer = _current.get()
+    if timer is not None:
+        timer.category = category
+
+
+def _record(stage, seconds):
+    timer = _current.get()
+    if timer is None:
+        STAGE_DURATION.observe(seconds, category="background", stage=stage)
+    else:
+        timer.spans.append((stage, seconds))
+
+
+@contextmanager
+def span(stage):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(stage, time.perf_counter() - started)
+
+
+def timed(stage):
+    """함수 호출 시간을 stage로 기록하는 데코레이터 (async 함수도 지원)"""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def render_metrics():
+    lines = []
+    for metric in list(_registry):
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,70 @@
+import os
+import threading
+
+# 오라클 세션 풀 (프로세스당 1회 생성, 모든 시세 조회가 공유)
+# 접속 정보와 풀 크기는 환경 변수로 조정할 수 있습니다.
+_pool = None
+_pool_lock = threading.Lock()
+# 지정하면 오라클 풀 대신 이 함수로 연결을 만듦 (부하 테스트용 로컬 DB 등)
+_connection_factory = None
+
+
+def _pool_settings(oracledb):
+    return {
+        "user": os.getenv("ORACLE_USER", "YH"),
+        "password": os.getenv("ORACLE_PASSWORD", "0000"),
+        "dsn": os.getenv("ORACLE_DSN", "116.36.205.25:1521/XEPDB1"),
+        "min": int(os.getenv("ORACLE_POOL_MIN", "1")),
+        "max": int(os.getenv("ORACLE_POOL_MAX", "4")),
+        "increment": int(os.getenv("ORACLE_POOL_INCREMENT", "1")),
+        # 세션이 모두 사용 중이면 wait_timeout(ms) 동안만 대기 후 오류
+        "getmode": oracledb.POOL_GETMODE_TIMEDWAIT,
+        "wait_timeout": int(os.getenv("ORACLE_POOL_WAIT_TIMEOUT_MS", "3000")),
+        # ping_interval(초) 이상 쉬고 있던 세션은 대여 전에 상태 확인
+        "ping_interval": int(os.getenv("ORACLE_POOL_PING_INTERVAL", "60")),
+        # 유휴 세션 정리 시간(초)
+        "timeout": int(os.getenv("ORACLE_POOL_IDLE_TIMEOUT", "300")),
+    }
+
+
+def get_pool():
+    """
+    공유 오라클 세션 풀을 반환합니다. 최초 호출 시 한 번만 생성됩니다.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # oracledb는 시세 조회가 처음 있을 때 불러옴 (기동 시간 단축)
+                import oracledb
+                settings = _pool_settings(oracledb)
+                _pool = oracledb.create_pool(**settings)
+                print(f"[DEBUG] 오라클 세션 풀 생성 (min={settings['min']}, max={settings['max']})")
+    return _pool
+
+
+def get_connection():
+    """
+    풀에서 세션을 빌려옵니다. with 블록이 끝나면 풀로 반납됩니다.
+    예) with get_connection() as conn:
+    """
+    if _connection_factory is not None:
+        return _connection_factory()
+    return get_pool().acquire()
+
+
+def set_connection_factory(factory):
+    """
+    시세 조회 연결을 오라클 풀 대신 factory()로 만듭니다. (None이면 다시 오라클 풀 사용)
+    factory()는 oracledb 연결처럼 with 블록과 cursor()를 지원해야 합니다.
+    """
+    global _connection_factory
+    _connection_factory = factory
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close(force=True)
+            _pool = None
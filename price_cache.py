@@ -0,0 +1,75 @@
+import os
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from cache_utils import LRUCache
+from metrics import Counter
+
+# 시세 데이터는 매일 00시(한국 시간)에 갱신됩니다.
+# - 지난 날짜의 조회 결과는 바뀌지 않으므로 만료 없이 보관
+# - 오늘(또는 그 이후) 날짜 기준 조회 결과는 다음 자정(KST)에 만료
+# 한국은 일광 절약 시간이 없으므로 고정 +9시간 (pytz 시간대보다 now() 호출이 몇 배 빠름, 요청마다 여러 번 호출됨)
+KST = timezone(timedelta(hours=9), "KST")
+
+_cache = LRUCache(max_size=int(os.getenv("PRICE_CACHE_MAX_ENTRIES", "2048")))
+PRICE_CACHE_LOOKUPS = Counter("chatbot_price_cache_lookups_total", "Price cache lookups by aggregate and result (hit/miss)", ("aggregate", "result"))
+
+
+def kst_now():
+    """현재 한국 시간 (KST 시간대가 붙은 datetime, '오늘' 판단은 캐시 만료와 같은 KST 기준)"""
+    return datetime.now(KST)
+
+
+def _lookup(key):
+    value = _cache.get(key)
+    PRICE_CACHE_LOOKUPS.inc(aggregate=key[2], result="miss" if value is None else "hit")
+    return value
+
+
+def next_kst_midnight():
+    """다음 한국 시간 자정의 epoch 초"""
+    now = datetime.now(KST)
+    tomorrow = (now + timedelta(days=1)).date()
+    midnight = datetime(tomorrow.year, tomorrow.month, tomorrow.day, tzinfo=KST)
+    return midnight.timestamp()
+
+
+def expires_at_for(date):
+    """date(YYYYMMDD)가 오늘(KST) 이전이면 None(만료 없음), 아니면 다음 자정"""
+    today = kst_now().strftime('%Y%m%d')
+    if date < today:
+        return None
+    return next_kst_midnight()
+
+
+def cached_price(aggregate):
+    """
+    (품목, 날짜, 집계 종류)를 키로 시세 조회 결과를 캐시하는 데코레이터.
+    감싸는 함수는 (product_name, date) 를 받아야 하며, None 결과(정보 없음/조회 오류)는 캐시하지 않습니다.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(product_name, date):
+            key = (product_name, date, aggregate)
+            value = _lookup(key)
+            if value is not None:
+                return value
+            value = func(product_name, date)
+            if value is not None:
+                _cache.set(key, value, expires_at_for(date))
+            return value
+        return wrapper
+    return decorator
+
+
+def get_cached_price(product_name, date, aggregate):
+    return _lookup((product_name, date, aggregate))
+
+
+def set_cached_price(product_name, date, aggregate, value):
+    if value is not None:
+        _cache.set((product_name, date, aggregate), value, expires_at_for(date))
+
+
+def get_price_cache_stats():
+    """크기, 적중/실패 횟수, 적중률 (/health의 price_cache)"""
+    return _cache.stats()
@@ -0,0 +1,219 @@
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from product_list import PRODUCT_KEYWORDS, PRODUCT_CATEGORIES, PRODUCT_ALIASES
+from oracle_pool import get_connection
+from metrics import span
+
+# 취급 품목 카탈로그
+# - 품목 목록은 오라클 tb_code_detail(LOW_CODE_VALUE, LOW_CODE_NAME)에서 읽고, 읽지 못하면 product_list.py의 목록을 사용
+# - 한 번 만들 때 품목명↔코드, 카테고리별 품목, 별칭 색인과 전체 품목 안내 문구를 미리 만들어 둠 (이후 읽기 전용)
+# - get_catalog()는 현재 카탈로그를 반환하고, 다시 읽을 시간이 지났으면 백그라운드 스레드에서 DB를 읽어 통째로 교체
+#   (PRODUCT_CATALOG_FROM_DB=true일 때만, 기동 시에는 product_list.py 목록으로 시작하고 첫 사용 시 DB 목록으로 바뀜)
+# - DB에서는 시세 이력이 있는 코드만 품목으로 읽고, PRODUCT_CATALOG_CODE_GROUP을 지정하면 그 코드 그룹만 읽음
+PRODUCT_CATALOG_FROM_DB = os.getenv("PRODUCT_CATALOG_FROM_DB", "false").lower() == "true"
+# 품목 코드 그룹 값과 그 값이 들어 있는 tb_code_detail 컬럼 (그룹 값이 비어 있으면 그룹으로 거르지 않음)
+PRODUCT_CATALOG_CODE_GROUP = os.getenv("PRODUCT_CATALOG_CODE_GROUP", "")
+PRODUCT_CATALOG_GROUP_COLUMN = os.getenv("PRODUCT_CATALOG_GROUP_COLUMN", "HIGH_CODE_VALUE")
+# DB에서 품목 목록을 다시 읽는 간격(초), 0이면 처음 한 번만 읽음
+PRODUCT_CATALOG_RELOAD_INTERVAL = float(os.getenv("PRODUCT_CATALOG_RELOAD_INTERVAL", "3600"))
+# DB에서 읽지 못했을 때 다시 시도하기까지 기다리는 시간(초)
+PRODUCT_CATALOG_RETRY_INTERVAL = float(os.getenv("PRODUCT_CATALOG_RETRY_INTERVAL", "60"))
+
+OTHER_CATEGORY = "기타"
+PRODUCT_LIST_HEADER = "저희 사이트에서 취급하는 주요 상품 목록입니다:\n\n"
+PRODUCT_LIST_FOOTER = "특정 상품에 대한 자세한 정보가 필요하시면 언제든 말씀해 주세요!"
+
+
+# 단어 끝 조사 (별칭 찾을 때 제거)
+_PARTICLE_SUFFIX = re.compile(r'(이랑|랑|은|는|이|가|을|를|도|의|와|과|만)$')
+
+
+def normalize(text):
+    # 공백을 모두 제거 (방울 토마토 → 방울토마토)
+    return re.sub(r'\s+', '', text)
+
+
+class ProductCatalog:
+    """
+    품목 목록과 색인 (만든 뒤에는 바꾸지 않으므로 여러 스레드가 잠금 없이 읽음)
+    - names: 품목명 목록 (product_list.py 순서, DB에만 있는 품목은 코드 순서로 뒤에), name_by_key: 공백 제거한 이름 → 품목명
+    - code_by_name / name_by_code: 품목명 ↔ LOW_CODE_VALUE (product_list.py 목록이면 비어 있음)
+    - categories: 카테고리 → 품목 목록, category_by_name: 품목명 → 카테고리
+    - aliases: 공백 제거한 별칭 → 품목 목록
+    - product_list_text: 전체 품목 안내 문구
+    """
+
+    def __init__(self, products, source="static", categories=PRODUCT_CATEGORIES, aliases=PRODUCT_ALIASES):
+        """products: [(품목명, 코드 또는 None), ...]"""
+        self.source = source
+        self.loaded_at = datetime.now()
+        self.names = []
+        seen = set()
+        self.name_by_key = {}
+        self.code_by_name = {}
+        self.name_by_code = {}
+        for name, code in products:
+            if name in seen:
+                continue
+            seen.add(name)
+            self.names.append(name)
+            self.name_by_key.setdefault(normalize(name), name)
+            if code is not None:
+                self.code_by_name[name] = code
+                self.name_by_code.setdefault(code, name)
+
+        self.categories = {}
+        self.category_by_name = {}
+        for category, items in categories.items():
+            items = [item for item in items if item in seen and item not in self.category_by_name]
+            if items:
+                self.categories[category] = items
+                for item in items:
+                    self.category_by_name[item] = category
+        others = [name for name in self.names if name not in self.category_by_name]
+        if others:
+            self.categories.setdefault(OTHER_CATEGORY, []).extend(others)
+            for name in others:
+                self.category_by_name[name] = OTHER_CATEGORY
+
+        self.aliases = {}
+        for alias, items in aliases.items():
+            items = [item for item in items if item in seen]
+            if items and alias not in seen:
+                self.aliases[normalize(alias)] = items
+
+        self.product_list_text = self._render_product_list()
+
+    def _render_product_list(self):
+        parts = [PRODUCT_LIST_HEADER]
+        for category, items in self.categories.items():
+            parts.append(f"📦 {category} ({len(items)}종)\n   {', '.join(items)}\n\n")
+        parts.append(f"총 {len(self.names)}가지의 농산물을 취급하고 있습니다.\n")
+        parts.append(PRODUCT_LIST_FOOTER)
+        return "".join(parts)
+
+    def resolve(self, term):
+        """품목명이면 [품목명], 별칭이면 별칭의 품목 목록, 둘 다 아니면 []"""
+        key = normalize(term)
+        if key in self.name_by_key:
+            return [self.name_by_key[key]]
+        return list(self.aliases.get(key, []))
+
+    def find_aliases(self, text):
+        """메시지의 단어(조사 제외) 중 별칭인 것 [(별칭, 품목 목록), ...] (예: '고추 가격' → [('고추', [건고추, ...])])"""
+        found = []
+        for word in re.findall(r'[가-힣A-Za-z0-9]+', text):
+            for key in (word, _PARTICLE_SUFFIX.sub("", word)):
+                if key in self.aliases:
+                    if all(alias != key for alias, _ in found):
+                        found.append((key, list(self.aliases[key])))
+                    break
+        return found
+
+    def stats(self):
+        return {
+            "source": self.source,
+            "products": len(self.names),
+            "categories": len(self.categories),
+            "aliases": len(self.aliases),
+            "loaded_at": self.loaded_at.isoformat(timespec="seconds"),
+        }
+
+
+def static_catalog():
+    return ProductCatalog([(name, None) for name in PRODUCT_KEYWORDS], source="static")
+
+
+def load_catalog_from_db(code_group=PRODUCT_CATALOG_CODE_GROUP, group_column=PRODUCT_CATALOG_GROUP_COLUMN):
+    """
+    tb_code_detail로 카탈로그를 만듭니다. 품목이 하나도 없으면 None
+    품목이 아닌 코드가 섞이지 않도록 시세 이력(tb_price_api_history)이 있는 코드만, code_group을 주면 그 그룹만 읽습니다.
+    """
+    sql = """
+        SELECT d.LOW_CODE_VALUE, d.LOW_CODE_NAME
+        FROM tb_code_detail d
+        WHERE d.LOW_CODE_NAME IS NOT NULL
+          AND EXISTS (SELECT 1 FROM tb_price_api_history h WHERE h.LOW_CODE_VALUE = d.LOW_CODE_VALUE)
+    """
+    params = {}
+    if code_group:
+        # 컬럼명은 바인드 변수로 넘길 수 없으므로 식별자 형식만 허용
+        if not re.fullmatch(r'[A-Za-z_][A-Za-z0-9_]*', group_column):
+            raise ValueError(f"잘못된 코드 그룹 컬럼명: {group_column}")
+        sql += f"  AND d.{group_column} = :code_group\n"
+        params["code_group"] = code_group
+    sql += "        ORDER BY d.LOW_CODE_VALUE"
+    with span("catalog_load"):
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, **params)
+                rows = cur.fetchall()
+    codes = {}
+    for code, name in rows:
+        name = str(name).strip()
+        if name and name not in codes:
+            codes[name] = str(code)
+    if not codes:
+        return None
+    # 같은 길이로 매칭된 품목의 우선순위가 바뀌지 않도록 product_list.py에 있는 품목은 그 순서를 따름
+    known = set(PRODUCT_KEYWORDS)
+    ordered = [name for name in PRODUCT_KEYWORDS if name in codes]
+    ordered += [name for name in codes if name not in known]
+    return ProductCatalog([(name, codes[name]) for name in ordered], source="db")
+
+
+_catalog = static_catalog()
+_lock = threading.Lock()
+_next_reload = 0.0 if PRODUCT_CATALOG_FROM_DB else float("inf")
+_reloading = False
+_counts = {"reloads": 0, "failures": 0}
+
+
+def peek_catalog():
+    """현재 카탈로그 (다시 읽기를 시작하지 않음)"""
+    return _catalog
+
+
+def get_catalog():
+    """현재 카탈로그를 반환하고, 다시 읽을 시간이 지났으면 백그라운드에서 DB 목록을 읽기 시작합니다."""
+    global _reloading
+    if time.monotonic() >= _next_reload and not _reloading:
+        with _lock:
+            # 읽는 동안 다른 요청이 스레드를 또 만들지 않음
+            if time.monotonic() >= _next_reload and not _reloading:
+                _reloading = True
+                threading.Thread(target=reload_catalog, name="product-catalog-reload", daemon=True).start()
+    return _catalog
+
+
+def reload_catalog():
+    """
+    DB에서 품목 목록을 다시 읽어 카탈로그를 교체합니다.
+    읽지 못하거나 비어 있으면 기존 카탈로그를 그대로 두고 PRODUCT_CATALOG_RETRY_INTERVAL초 뒤에 다시 시도합니다.
+    """
+    global _catalog, _next_reload, _reloading
+    try:
+        catalog = load_catalog_from_db()
+    except Exception as e:
+        catalog = None
+        print(f"[DEBUG] 품목 목록 DB 조회 오류: {e}")
+    with _lock:
+        _reloading = False
+        if catalog is None:
+            _counts["failures"] += 1
+            _next_reload = time.monotonic() + PRODUCT_CATALOG_RETRY_INTERVAL
+            return _catalog
+        _catalog = catalog
+        _counts["reloads"] += 1
+        _next_reload = time.monotonic() + PRODUCT_CATALOG_RELOAD_INTERVAL if PRODUCT_CATALOG_RELOAD_INTERVAL > 0 else float("inf")
+    print(f"[DEBUG] 품목 목록 갱신: {len(catalog.names)}개 (tb_code_detail)")
+    return catalog
+
+
+def catalog_stats():
+    with _lock:
+        counts = dict(_counts)
+    return {**_catalog.stats(), **counts}
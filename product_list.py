@@ -1,3 +1,29 @@
 PRODUCT_KEYWORDS = [
     "바나나", "참다래", "파인애플", "오렌지", "자몽", "레몬", "체리", "건포도", "건블루베리", "망고", "블루베리", "아보카도", "레드향", "매실", "무화과", "복분자", "샤인머스켓", "곶감", "골드키위", "쌀", "찹쌀", "혼합곡", "기장", "콩", "팥", "녹두", "메밀", "고구마", "감자", "귀리", "보리", "수수", "율무", "배추", "양배추", "시금치", "상추", "얼갈이배추", "갓", "연근", "우엉", "수박", "참외", "오이", "호박", "토마토", "딸기", "무", "당근", "열무", "건고추", "풋고추", "붉은고추", "피마늘", "양파", "파", "생강", "고춧가루", "가지", "미나리", "깻잎", "부추", "피망", "파프리카", "멜론", "깐마늘(국산)", "깐마늘(수입)", "브로콜리", "양상추", "청경채", "케일", "콩나물", "절임배추", "쑥", "달래", "두릅", "로메인 상추", "취나물", "쥬키니호박", "청양고추", "대파", "고사리", "쪽파", "다발무", "겨울 배추", "알배기배추", "방울토마토", "참깨", "들깨", "땅콩", "느타리버섯", "팽이버섯", "새송이버섯", "호두", "아몬드", "양송이버섯", "표고버섯", "더덕", "사과", "배", "복숭아", "포도", "감귤", "단감"
-] 
\ No newline at end of file
+] 
+
+# 전체 품목 안내에 쓰는 카테고리별 품목 (카테고리에 없는 품목은 "기타"로 안내)
+PRODUCT_CATEGORIES = {
+    "식량작물": ["쌀","찹쌀","혼합곡","기장","콩","팥","녹두","메밀","고구마","감자","귀리","보리","수수","율무"],
+    "채소류": ["배추","양배추","시금치","상추","얼갈이배추","갓","연근","우엉","수박","참외","오이","호박","토마토","딸기","무","당근","열무","건고추","풋고추","붉은고추","피마늘","양파","파","생강","고춧가루","가지","미나리","깻잎","부추","피망","파프리카","멜론","깐마늘(국산)","깐마늘(수입)","브로콜리","양상추","청경채","케일","콩나물","절임배추","쑥","달래","두릅","로메인 상추","취나물","쥬키니호박","청양고추","대파","고사리","쪽파","다발무","겨울 배추","알배기배추","방울토마토"],
+    "특용작물": ["참깨","들깨","땅콩","느타리버섯","팽이버섯","새송이버섯","호두","아몬드","양송이버섯","표고버섯","더덕"],
+    "과일류": ["바나나","참다래","파인애플","오렌지","자몽","레몬","체리","건포도","건블루베리","망고","블루베리","아보카도","레드향","매실","무화과","복분자","샤인머스켓","곶감","골드키위","사과","배","복숭아","포도","감귤","단감"]
+}
+
+# 품목 별칭/통칭 → 품목 목록 (예: '고추' → 건고추, 풋고추, 붉은고추, 청양고추)
+# 품목이 하나인 별칭은 메시지에서 그 품목을 말한 것으로 인식합니다.
+PRODUCT_ALIASES = {
+    "고추": ["건고추", "풋고추", "붉은고추", "청양고추"],
+    "마늘": ["피마늘", "깐마늘(국산)", "깐마늘(수입)"],
+    "깐마늘": ["깐마늘(국산)", "깐마늘(수입)"],
+    "키위": ["참다래", "골드키위"],
+    "고추가루": ["고춧가루"],
+    "샤인머스캣": ["샤인머스켓"],
+    "귤": ["감귤"],
+    "밀감": ["감귤"],
+    "알배추": ["알배기배추"],
+    "방토": ["방울토마토"],
+    "로메인": ["로메인 상추"],
+    "주키니": ["쥬키니호박"],
+    "주키니호박": ["쥬키니호박"],
+}
@@ -0,0 +1,143 @@
+import threading
+from product_catalog import get_catalog, peek_catalog, normalize
+
+# 품목명을 포함하지만 품목이 아닌 단어 (예: '옥수수' 안의 '수수', '배송' 안의 '배')
+# 트라이에 '막는 단어'로 넣어 두면 해당 구간은 품목으로 인식하지 않습니다.
+NON_PRODUCT_WORDS = ["옥수수", "배송", "무엇", "무료"]
+
+_END = ""  # 트라이 노드에서 단어 끝을 표시하는 키 (값: 품목명, 막는 단어는 None)
+_lock = threading.Lock()
+_matcher = None
+
+
+def build_matcher(keywords=None, catalog=None):
+    """
+    품목 목록으로 매처를 만들어 전역 매처를 교체합니다.
+    keywords를 주지 않으면 품목 카탈로그(product_catalog)로 만들고, 카탈로그가 교체되면 다음 조회 때 다시 만듭니다.
+    - trie: 공백을 제거한 품목명(과 품목이 하나인 별칭)의 글자 트라이
+    - exact: 공백 제거한 이름(과 품목이 하나인 별칭) → 품목명
+    - rank: 품목명 → 목록 순서 (같은 길이 매칭이 여러 개일 때 우선순위)
+    - related: 품목명(괄호 앞부분)의 2글자 이상 부분 문자열 → 그 문자열을 포함하는 품목 목록 (별칭의 품목 포함)
+    """
+    global _matcher
+    aliases = {}
+    if keywords is None:
+        catalog = catalog or get_catalog()
+        keywords = catalog.names
+        aliases = catalog.aliases
+    keywords = list(keywords)
+    trie = {}
+    for word in NON_PRODUCT_WORDS:
+        _insert(trie, normalize(word), None)
+    exact = {}
+    rank = {}
+    related = {}
+    for i, p in enumerate(keywords):
+        key = normalize(p)
+        _insert(trie, key, p)
+        exact.setdefault(key, p)
+        rank.setdefault(p, i)
+        base = p.split('(')[0]
+        for start in range(len(base)):
+            for end in range(start + 2, len(base) + 1):
+                items = related.setdefault(base[start:end], [])
+                if p not in items:
+                    items.append(p)
+    for alias, items in aliases.items():
+        if len(items) == 1:
+            _insert(trie, alias, items[0])
+            exact.setdefault(alias, items[0])
+        merged = related.setdefault(alias, [])
+        merged[:0] = [p for p in items if p not in merged]
+    # keywords로 직접 만든 매처는 카탈로그가 바뀌어도 그대로 사용
+    matcher = {"trie": trie, "exact": exact, "rank": rank, "related": related, "catalog": catalog}
+    with _lock:
+        _matcher = matcher
+    return matcher
+
+
+rebuild_matcher = build_matcher
+
+
+def _insert(trie, key, value):
+    node = trie
+    for ch in key:
+        node = node.setdefault(ch, {})
+    # 실제 품목이 막는 단어보다 우선
+    if node.get(_END) is None:
+        node[_END] = value
+
+
+def _get_matcher():
+    matcher = _matcher
+    if matcher is None:
+        return build_matcher(catalog=peek_catalog())
+    if matcher["catalog"] is not None:
+        catalog = get_catalog()
+        if matcher["catalog"] is not catalog:
+            return build_matcher(catalog=catalog)
+    return matcher
+
+
+def find_mentions(text):
+    """
+    공백을 제거한 메시지를 한 번 훑으며 품목 언급을 찾습니다. [(시작, 끝, 품목명), ...]
+    각 위치에서 가장 긴 매칭을 택하고, 매칭된 구간은 건너뜁니다(겹침 없음).
+    """
+    trie = _get_matcher()["trie"]
+    s = normalize(text)
+    mentions = []
+    i = 0
+    n = len(s)
+    while i < n:
+        node = trie
+        j = i
+        match_end = -1
+        match_value = None
+        while j < n and s[j] in node:
+            node = node[s[j]]
+            j += 1
+            if _END in node:
+                match_end = j
+                match_value = node[_END]
+        if match_end == -1:
+            i += 1
+            continue
+        if match_value is not None:
+            mentions.append((i, match_end, match_value))
+        i = match_end
+    return mentions
+
+
+def find_products(text):
+    """메시지에 언급된 모든 품목 (등장 순서, 중복 제거)"""
+    products = []
+    for _, _, p in find_mentions(text):
+        if p not in products:
+            products.append(p)
+    return products
+
+
+def find_product(text):
+    """메시지에 언급된 품목 중 가장 긴 품목명 하나 (길이가 같으면 품목 목록 순서), 없으면 None"""
+    rank = _get_matcher()["rank"]
+    best = None
+    for start, end, p in find_mentions(text):
+        if best is None or (end - start, -rank[p]) > (best[1] - best[0], -rank[best[2]]):
+            best = (start, end, p)
+    return best[2] if best else None
+
+
+def lookup_product(name):
+    """공백 차이를 무시하고 정확히 일치하는 품목명을 반환, 없으면 None"""
+    return _get_matcher()["exact"].get(normalize(name))
+
+
+def find_related_products(item):
+    """item(2글자 이상)을 이름에 포함하는 품목 목록 (예: '고추' → 건고추, 풋고추, 붉은고추, 청양고추)"""
+    if len(item) < 2:
+        return []
+    return list(_get_matcher()["related"].get(item, []))
+
+
+build_matcher(catalog=peek_catalog())
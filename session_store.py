@@ -0,0 +1,158 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from history_store import HistoryStore, HISTORY_IDLE_TTL, HISTORY_MAX_TURNS
+
+# 대화 히스토리(세션) 저장소 선택
+# 여러 워커 프로세스/서버로 /chat을 실행하면 프로세스 메모리의 히스토리는 공유되지 않으므로
+# ('상품 목록을 알려드릴까요?' → '응' 후속 질문, 시세 질문의 이전 품목 찾기)
+# 공유 저장소(SQLite 파일 또는 Redis)를 사용합니다.
+# 모든 저장소는 같은 인터페이스를 가집니다.
+# - get(user_id): 최근 턴 deque((사용자 메시지, 봇 응답), ...) (없거나 만료되면 빈 deque)
+# - append(user_id, user_message, bot_message): 한 턴 추가 후 최근 max_turns턴만 남김 (원자적)
+# - stats(): 저장소 상태
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory")  # memory / sqlite / redis
+SESSION_SQLITE_PATH = os.getenv("SESSION_SQLITE_PATH", os.path.join(".cache", "sessions.sqlite3"))
+SESSION_REDIS_URL = os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0")
+SESSION_KEY_PREFIX = os.getenv("SESSION_KEY_PREFIX", "chatbot:history:")
+
+
+class SQLiteSessionStore:
+    """
+    한 서버의 여러 워커 프로세스가 공유하는 SQLite 파일 저장소
+    마지막 대화 후 idle_ttl초가 지난 사용자의 히스토리는 만료
+    """
+
+    PURGE_EVERY = 500
+
+    def __init__(self, path=SESSION_SQLITE_PATH, max_turns=HISTORY_MAX_TURNS, idle_ttl=HISTORY_IDLE_TTL):
+        self.path = path
+        self.max_turns = max_turns
+        self.idle_ttl = idle_ttl
+        self._local = threading.local()
+        self._appends = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS session_turns ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT NOT NULL, "
+            "user_message TEXT NOT NULL, bot_message TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_session_turns_user ON session_turns (user_id, seq)")
+
+    def _conn(self):
+        # 스레드별 연결 (autocommit, 트랜잭션은 BEGIN IMMEDIATE로 직접 관리)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def get(self, user_id):
+        rows = self._conn().execute(
+            "SELECT user_message, bot_message, created_at FROM session_turns WHERE user_id = ? ORDER BY seq DESC LIMIT ?",
+            (user_id, self.max_turns)
+        ).fetchall()
+        if not rows or rows[0][2] <= time.time() - self.idle_ttl:
+            return deque(maxlen=self.max_turns)
+        return deque(((u, b) for u, b, _ in reversed(rows)), maxlen=self.max_turns)
+
+    def append(self, user_id, user_message, bot_message):
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 만료된 히스토리는 이어 붙이지 않음
+            conn.execute(
+                "DELETE FROM session_turns WHERE user_id = ? AND (SELECT MAX(created_at) FROM session_turns WHERE user_id = ?) <= ?",
+                (user_id, user_id, now - self.idle_ttl)
+            )
+            conn.execute(
+                "INSERT INTO session_turns (user_id, user_message, bot_message, created_at) VALUES (?, ?, ?, ?)",
+                (user_id, user_message, bot_message, now)
+            )
+            conn.execute(
+                "DELETE FROM session_turns WHERE user_id = ? AND seq NOT IN "
+                "(SELECT seq FROM session_turns WHERE user_id = ? ORDER BY seq DESC LIMIT ?)",
+                (user_id, user_id, self.max_turns)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._appends += 1
+        if self._appends % self.PURGE_EVERY == 0:
+            self.purge_expired()
+
+    def purge_expired(self):
+        self._conn().execute(
+            "DELETE FROM session_turns WHERE user_id IN "
+            "(SELECT user_id FROM session_turns GROUP BY user_id HAVING MAX(created_at) <= ?)",
+            (time.time() - self.idle_ttl,)
+        )
+
+    def stats(self):
+        users, turns = self._conn().execute(
+            "SELECT COUNT(DISTINCT user_id), COUNT(*) FROM session_turns WHERE user_id IN "
+            "(SELECT user_id FROM session_turns GROUP BY user_id HAVING MAX(created_at) > ?)",
+            (time.time() - self.idle_ttl,)
+        ).fetchone()
+        return {"backend": "sqlite", "users": users, "turns": turns}
+
+
+class RedisSessionStore:
+    """
+    여러 서버가 공유하는 Redis(호환 서버) 저장소 (redis 패키지 필요)
+    사용자별 리스트에 턴을 JSON으로 추가하고 최근 max_turns개만 남긴 뒤 idle_ttl 만료를 갱신 (MULTI/EXEC)
+    """
+
+    def __init__(self, url=SESSION_REDIS_URL, max_turns=HISTORY_MAX_TURNS, idle_ttl=HISTORY_IDLE_TTL, prefix=SESSION_KEY_PREFIX):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("SESSION_BACKEND=redis 사용 시 redis 패키지가 필요합니다. (pip install redis)") from e
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.max_turns = max_turns
+        self.idle_ttl = idle_ttl
+        self.prefix = prefix
+
+    def _key(self, user_id):
+        return f"{self.prefix}{user_id}"
+
+    def get(self, user_id):
+        items = self.client.lrange(self._key(user_id), -self.max_turns, -1)
+        return deque((tuple(json.loads(item)) for item in items), maxlen=self.max_turns)
+
+    def append(self, user_id, user_message, bot_message):
+        key = self._key(user_id)
+        pipe = self.client.pipeline(transaction=True)
+        pipe.rpush(key, json.dumps([user_message, bot_message], ensure_ascii=False))
+        pipe.ltrim(key, -self.max_turns, -1)
+        pipe.expire(key, self.idle_ttl)
+        pipe.execute()
+
+    def stats(self):
+        return {"backend": "redis", "host": self.client.connection_pool.connection_kwargs.get("host")}
+
+
+class MemorySessionStore(HistoryStore):
+    """프로세스 메모리 저장소 (워커 프로세스 하나일 때)"""
+
+    def stats(self):
+        return {"backend": "memory", **super().stats()}
+
+
+def create_session_store(backend=SESSION_BACKEND):
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "sqlite":
+        return SQLiteSessionStore()
+    if backend == "redis":
+        return RedisSessionStore()
+    raise ValueError(f"알 수 없는 SESSION_BACKEND: {backend} (memory/sqlite/redis)")
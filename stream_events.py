@@ -0,0 +1,141 @@
+import contextvars
+import json
+from contextlib import contextmanager
+from metrics import timed
+from llm_accounting import chat_completion, chat_completion_async, record_usage
+
+# /chat/stream 응답용 이벤트 전달 모듈
+# 요청을 처리하는 스레드에 emit 함수를 등록해 두면 핸들러가 작업이 끝나는 대로 이벤트를 보냅니다.
+# (등록되지 않은 일반 /chat 요청에서는 emit 호출이 아무 일도 하지 않음)
+# 이벤트: category(분류 결과) → result(검색 결과 하나) / token(LLM 응답 조각) → done(최종 응답) / error
+_emitter = contextvars.ContextVar("stream_emitter", default=None)
+
+
+@contextmanager
+def streaming(emit_func):
+    """with 블록 안에서 emit(event, data)가 emit_func(event, data)로 전달됩니다."""
+    token = _emitter.set(emit_func)
+    try:
+        yield
+    finally:
+        _emitter.reset(token)
+
+
+def is_streaming():
+    return _emitter.get() is not None
+
+
+def emit(event, data):
+    emit_func = _emitter.get()
+    if emit_func is not None:
+        try:
+            emit_func(event, data)
+        except Exception as e:
+            print(f"[DEBUG] 스트림 이벤트 전달 오류: {e}")
+
+
+def format_sse(event, data):
+    """Server-Sent Events 형식 문자열"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+class _PlaceholderBuffer:
+    """
+    스트리밍 조각에서 {date}/{time} 같은 자리표시자를 치환합니다.
+    자리표시자가 조각 경계에서 잘릴 수 있으므로, 닫히지 않은 '{' 이후는 다음 조각이 올 때까지 보류
+    """
+
+    def __init__(self, replacements):
+        self.replacements = replacements or {}
+        self.max_len = max((len(k) for k in self.replacements), default=0)
+        self.pending = ""
+
+    def _replace(self, text):
+        for key, value in self.replacements.items():
+            text = text.replace(key, value)
+        return text
+
+    def feed(self, chunk):
+        text = self.pending + chunk
+        self.pending = ""
+        if self.replacements:
+            start = text.rfind("{")
+            if start != -1 and "}" not in text[start:] and len(text) - start < self.max_len:
+                text, self.pending = text[:start], text[start:]
+        return self._replace(text)
+
+    def flush(self):
+        text, self.pending = self.pending, ""
+        return self._replace(text)
+
+
+@timed("llm_answer")
+def complete_text(client, replacements=None, **kwargs):
+    """
+    chat.completions.create(**kwargs) 결과 텍스트(strip, 자리표시자 치환 후)를 반환합니다.
+    스트리밍 요청 처리 중이면 stream=True로 호출해 받은 조각을 token 이벤트로 바로 보냅니다.
+    토큰 사용량은 llm_accounting에 llm_answer 단계로 기록합니다.
+    """
+    if not is_streaming():
+        completion = chat_completion(client, "llm_answer", **kwargs)
+        text = completion.choices[0].message.content.strip()
+        return _PlaceholderBuffer(replacements)._replace(text)
+
+    buffer = _PlaceholderBuffer(replacements)
+    parts = []
+    started = False
+    usage, model = None, kwargs.get("model")
+    for chunk in client.chat.completions.create(stream=True, stream_options={"include_usage": True}, **kwargs):
+        # 사용량은 choices가 빈 마지막 조각에 담겨 옴
+        if getattr(chunk, "usage", None):
+            usage, model = chunk.usage, getattr(chunk, "model", None) or model
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content or ""
+        if not started:
+            # 응답 앞 공백은 보내지 않음 (일반 응답의 strip과 맞춤)
+            delta = delta.lstrip()
+            started = bool(delta)
+        text = buffer.feed(delta)
+        if text:
+            parts.append(text)
+            emit("token", {"text": text})
+    text = buffer.flush()
+    if text:
+        parts.append(text)
+        emit("token", {"text": text})
+    record_usage("llm_answer", model, usage)
+    return "".join(parts).strip()
+
+
+@timed("llm_answer")
+async def complete_text_async(client, replacements=None, **kwargs):
+    """complete_text의 비동기 버전 (client는 AsyncOpenAI)"""
+    if not is_streaming():
+        completion = await chat_completion_async(client, "llm_answer", **kwargs)
+        text = completion.choices[0].message.content.strip()
+        return _PlaceholderBuffer(replacements)._replace(text)
+
+    buffer = _PlaceholderBuffer(replacements)
+    parts = []
+    started = False
+    usage, model = None, kwargs.get("model")
+    async for chunk in await client.chat.completions.create(stream=True, stream_options={"include_usage": True}, **kwargs):
+        if getattr(chunk, "usage", None):
+            usage, model = chunk.usage, getattr(chunk, "model", None) or model
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content or ""
+        if not started:
+            delta = delta.lstrip()
+            started = bool(delta)
+        text = buffer.feed(delta)
+        if text:
+            parts.append(text)
+            emit("token", {"text": text})
+    text = buffer.flush()
+    if text:
+        parts.append(text)
+        emit("token", {"text": text})
+    record_usage("llm_answer", model, usage)
+    return "".join(parts).strip()
@@ -0,0 +1,229 @@
+import contextvars
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from metrics import timed
+from llm_accounting import chat_completion
+from stream_events import is_streaming
+
+# 웹 검색 결과 요약 공통 모듈 (search/product/policy/export 핸들러가 공유)
+# 검색 결과별 LLM 요약을 스레드 풀에서 동시에 호출하고, 결과는 원래 순서대로 돌려줍니다.
+SUMMARY_POOL_SIZE = int(os.getenv("SUMMARY_POOL_SIZE", "16"))
+# 핸들러별 동시 요약 호출 수 제한 (OpenAI 속도 제한 보호, 동시에 처리 중인 모든 요청 합산)
+HANDLER_CONCURRENCY = {
+    "search": int(os.getenv("SUMMARY_CONCURRENCY_SEARCH", "3")),
+    "product": int(os.getenv("SUMMARY_CONCURRENCY_PRODUCT", "3")),
+    "policy": int(os.getenv("SUMMARY_CONCURRENCY_POLICY", "5")),
+    "export": int(os.getenv("SUMMARY_CONCURRENCY_EXPORT", "3")),
+}
+DEFAULT_CONCURRENCY = 3
+# batch: 모든 검색 결과를 한 번의 LLM 호출로 요약 (JSON 응답 파싱 실패 시 per_item으로 대체)
+# per_item: 검색 결과마다 요약 호출
+SUMMARY_MODE = os.getenv("SUMMARY_MODE", "batch")
+# 스트리밍 요청(/chat/stream)의 요약 방식: per_item이면 결과별로 요약해 끝나는 대로(순서대로) 보내고,
+# batch면 한 번의 호출이 끝난 뒤 한꺼번에 보냄 (호출 수는 적지만 첫 결과가 늦음)
+SUMMARY_STREAM_MODE = os.getenv("SUMMARY_STREAM_MODE", "per_item")
+BATCH_MAX_TOKENS = 4000
+
+_executor = ThreadPoolExecutor(max_workers=SUMMARY_POOL_SIZE, thread_name_prefix="summary")
+_semaphores = {name: threading.BoundedSemaphore(n) for name, n in HANDLER_CONCURRENCY.items()}
+_semaphores_lock = threading.Lock()
+
+
+def filter_ad_lines(text):
+    ad_keywords = [
+        "예약", "안전", "판매", "주문", "농부", "고객님", "화학비료", "유기물",
+        "배송", "구매", "블로그", "프로필", "문의", "상담", "신청", "이벤트", "할인", "특가", "무료", "배송비", "포장", "직거래", "도화농부"
+    ]
+    lines = text.split('\n')
+    filtered = [line for line in lines if not any(k in line for k in ad_keywords)]
+    return '\n'.join(filtered)
+
+
+def format_result(number, title, summary, url):
+    """검색 결과 하나를 응답 형식(번호. [제목] 요약 + 출처 링크)으로 만듭니다."""
+    return f"{number}. [{title}] {summary}\n출처: <a href='{url}' target='_blank'>{url}</a>\n\n"
+
+
+def _get_semaphore(handler_name):
+    with _semaphores_lock:
+        if handler_name not in _semaphores:
+            _semaphores[handler_name] = threading.BoundedSemaphore(DEFAULT_CONCURRENCY)
+        return _semaphores[handler_name]
+
+
+@timed("summarize_item")
+def summarize_one(client, instruction, content):
+    """검색 결과 본문 하나를 요약합니다. 요약 실패 시 본문 앞부분(400자)을 사용"""
+    if not content:
+        return ""
+    try:
+        prompt = f"{instruction}\n\n{content}"
+        completion = chat_completion(
+            client, "summarize_item",
+            model="gpt-4o-2024-05-13",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=400,
+            temperature=0.5
+        )
+        summary = completion.choices[0].message.content.strip()
+        return filter_ad_lines(summary)
+    except Exception as e:
+        print(f"[DEBUG] LLM 요약 오류: {e}")
+        return content[:400]
+
+
+def _parse_relevant(value):
+    """JSON의 relevant 값을 엄격하게 해석 (true 또는 문자열 "true"만 관련 있음, "false"/"0" 등은 관련 없음)"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return value.strip().lower() == "true"
+    return False
+
+
+@timed("summarize_batch")
+def summarize_batch(client, instruction, contents, query=None):
+    """
+    contents 전체를 한 번의 LLM 호출로 요약합니다.
+    응답은 {"results": [{"index", "summary", "relevant"}]} JSON이며, {인덱스: (요약, 관련 여부)}를 반환합니다.
+    빈 본문은 요청에 넣지 않습니다. 호출/파싱에 실패하면 None
+    """
+    items = [(i, c) for i, c in enumerate(contents) if c]
+    if not items:
+        return {}
+    if query:
+        relevance_rule = f"relevant는 요약이 질문 '{query}'와 직접 관련 있으면 true, 관련 없으면 false로 해."
+    else:
+        relevance_rule = "relevant는 항상 true로 해."
+    blocks = "\n\n".join(f"[{i}]\n{c}" for i, c in items)
+    prompt = (
+        f"{instruction}\n"
+        "아래 [번호]로 구분된 검색 결과 각각에 위 요약 지시를 적용해. "
+        f"{relevance_rule}\n"
+        '반드시 다음 JSON 형식으로만 답해: {"results": [{"index": 번호, "summary": "요약", "relevant": true}]}\n\n'
+        f"{blocks}"
+    )
+    try:
+        completion = chat_completion(
+            client, "summarize_batch",
+            model="gpt-4o-2024-05-13",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=min(400 * len(items), BATCH_MAX_TOKENS),
+            temperature=0.5,
+            response_format={"type": "json_object"}
+        )
+        data = json.loads(completion.choices[0].message.content)
+        parsed = {}
+        for item in data.get("results", []):
+            index = int(item["index"])
+            summary = filter_ad_lines(str(item.get("summary", "")).strip())
+            # relevant가 빠진 결과는 질문이 있으면 관련 없음으로 봄
+            relevant = _parse_relevant(item.get("relevant", query is None))
+            parsed[index] = (summary, relevant and bool(summary))
+        return parsed
+    except Exception as e:
+        print(f"[DEBUG] 일괄 요약 오류, 개별 요약으로 대체: {e}")
+        return None
+
+
+def _summary_mode():
+    return SUMMARY_STREAM_MODE if is_streaming() else SUMMARY_MODE
+
+
+def summarize_contents(handler_name, client, instruction, contents, keywords=None, query=None, on_result=None):
+    """
+    contents(본문 목록)를 요약해 [(요약, 관련 여부), ...]를 원래 순서대로 반환합니다.
+    on_result(인덱스, 요약, 관련 여부)는 결과가 준비되는 대로 원래 순서대로 호출됩니다. (스트리밍용)
+    - batch 모드: 한 번의 호출로 요약하고 LLM이 판단한 relevant 값을 관련 여부로 사용
+      (query가 없으면 관련 여부는 항상 True, 응답에서 빠진 결과는 개별 요약으로 보충,
+       keywords가 주어지면 요약에 키워드가 하나라도 포함돼야 관련 있음)
+    - per_item 모드(또는 batch 실패 시): 결과별 요약을 동시에 호출하고,
+      keywords가 주어지면 요약에 키워드가 하나라도 포함됐는지로 관련 여부 판단
+    """
+    if _summary_mode() == "batch" and contents:
+        batch = _summarize_batch_with_fill(handler_name, client, instruction, contents, keywords, query)
+        if batch is not None:
+            if on_result is not None:
+                for i, (summary, relevant) in enumerate(batch):
+                    on_result(i, summary, relevant)
+            return batch
+    return _summarize_per_item(handler_name, client, instruction, contents, keywords, on_result)
+
+
+def _summarize_batch_with_fill(handler_name, client, instruction, contents, keywords, query):
+    batch = summarize_batch(client, instruction, contents, query)
+    if batch is None:
+        return None
+    if keywords:
+        # LLM 판단과 함께 개별 요약 모드와 같은 키워드 검사도 통과해야 관련 있음
+        batch = {i: (summary, relevant and any(k in summary for k in keywords)) for i, (summary, relevant) in batch.items()}
+    missing = [i for i, c in enumerate(contents) if c and i not in batch]
+    if missing:
+        fallback = _summarize_per_item(handler_name, client, instruction, [contents[i] for i in missing], keywords)
+        batch.update(zip(missing, fallback))
+    return [batch.get(i, ("", False)) for i in range(len(contents))]
+
+
+def _summarize_per_item(handler_name, client, instruction, contents, keywords=None, on_result=None):
+    """
+    결과별 요약을 동시에 호출합니다. 핸들러별 세마포어로 동시 호출 수를 제한합니다. (슬롯이 없으면 제출하는 쪽이 대기)
+    on_result(인덱스, 요약, 관련 여부)는 앞의 결과가 모두 끝난 결과부터 순서대로 바로 호출됩니다.
+    """
+    semaphore = _get_semaphore(handler_name)
+
+    def task(content):
+        try:
+            return summarize_one(client, instruction, content)
+        finally:
+            semaphore.release()
+
+    futures = []
+    for content in contents:
+        semaphore.acquire()
+        try:
+            # 요청별 측정/스트리밍 상태(contextvars)를 풀 스레드에서도 사용
+            futures.append(_executor.submit(contextvars.copy_context().run, task, content))
+        except Exception:
+            semaphore.release()
+            raise
+    results = []
+    for i, future in enumerate(futures):
+        summary = future.result()
+        relevant = True if keywords is None else any(k in summary for k in keywords)
+        results.append((summary, relevant))
+        if on_result is not None:
+            on_result(i, summary, relevant)
+    return results
+
+
+def collect_relevant(handler_name, client, instruction, contents, keywords, needed, query=None, on_select=None):
+    """
+    contents를 앞에서부터 요약해 관련 있는 결과를 최대 needed개 [(contents 인덱스, 요약), ...]로 반환합니다.
+    on_select(contents 인덱스, 요약)는 결과가 선택되는 대로 순서대로 호출됩니다. (스트리밍용)
+    - batch 모드: 전체를 한 번에 요약한 뒤 관련 있는 결과를 앞에서부터 선택
+    - per_item 모드(또는 batch 실패 시): 아직 모자란 개수만큼씩 묶어서 동시에 요약하므로,
+      필요한 개수가 모이면 남은 결과는 요약하지 않습니다.
+    """
+    selected = []
+
+    def select(index, summary, relevant):
+        if relevant and len(selected) < needed:
+            selected.append((index, summary))
+            if on_select is not None:
+                on_select(index, summary)
+
+    if _summary_mode() == "batch" and contents:
+        results = _summarize_batch_with_fill(handler_name, client, instruction, contents, keywords, query)
+        if results is not None:
+            for i, (summary, relevant) in enumerate(results):
+                select(i, summary, relevant)
+            return selected
+    i = 0
+    while i < len(contents) and len(selected) < needed:
+        wave = contents[i:i + needed - len(selected)]
+        _summarize_per_item(handler_name, client, instruction, wave, keywords,
+                            on_result=lambda offset, summary, relevant, start=i: select(start + offset, summary, relevant))
+        i += len(wave)
+    return selected
@@ -0,0 +1,169 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from cache_utils import LRUCache
+from clients import get_http_session
+from metrics import span
+
+# Tavily 검색 공통 클라이언트
+# (query, search_depth, max_results)가 같은 검색은 캐시된 결과를 사용합니다.
+# 메모리 LRU 캐시 앞단 + 재시작 후에도 유지되는 로컬 SQLite 캐시
+TAVILY_URL = os.getenv("TAVILY_API_URL", "https://api.tavily.com/search")
+# 핸들러별 캐시 유지 시간(초): 정책/수출 정보는 몇 시간, 뉴스성 검색은 몇 분
+TAVILY_CACHE_TTL = {
+    "search": int(os.getenv("TAVILY_CACHE_TTL_SEARCH", str(10 * 60))),
+    "product": int(os.getenv("TAVILY_CACHE_TTL_PRODUCT", str(12 * 3600))),
+    "policy": int(os.getenv("TAVILY_CACHE_TTL_POLICY", str(6 * 3600))),
+    "export": int(os.getenv("TAVILY_CACHE_TTL_EXPORT", str(6 * 3600))),
+}
+TAVILY_CACHE_DEFAULT_TTL = 10 * 60
+TAVILY_CACHE_MAX_ENTRIES = int(os.getenv("TAVILY_CACHE_MAX_ENTRIES", "512"))
+# 빈 문자열이면 디스크 캐시를 사용하지 않음
+TAVILY_CACHE_PATH = os.getenv("TAVILY_CACHE_PATH", os.path.join(".cache", "tavily_cache.sqlite3"))
+
+
+class _DiskCache:
+    """만료 시각이 있는 key/value SQLite 저장소"""
+
+    PURGE_EVERY = 100
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tavily_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM tavily_cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def set(self, key, value, expires_at):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tavily_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), expires_at)
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                self._conn.execute("DELETE FROM tavily_cache WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+
+    def size(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tavily_cache WHERE expires_at > ?", (time.time(),)).fetchone()[0]
+
+
+_memory = LRUCache(max_size=TAVILY_CACHE_MAX_ENTRIES)
+_disk = None
+_disk_hits = 0
+_api_calls = 0
+_stats_lock = threading.Lock()
+
+if TAVILY_CACHE_PATH:
+    try:
+        _disk = _DiskCache(TAVILY_CACHE_PATH)
+    except Exception as e:
+        print(f"[DEBUG] Tavily 디스크 캐시를 열 수 없습니다: {e}")
+
+
+def _cache_key(query, search_depth, max_results):
+    return json.dumps([query, search_depth, max_results], ensure_ascii=False)
+
+
+def tavily_search(query, search_depth="advanced", max_results=5, handler=None, timeout=60):
+    """
+    Tavily 검색 결과(JSON dict)를 반환합니다. HTTP 오류/빈 응답/JSON 파싱 오류 시 None
+    - 결과가 있는 응답만 handler별 TTL 동안 캐시합니다.
+    - 네트워크 오류(requests.exceptions.RequestException)는 호출한 쪽에서 처리합니다.
+    """
+    global _disk_hits, _api_calls
+    key = _cache_key(query, search_depth, max_results)
+    data = _memory.get(key)
+    if data is not None:
+        print(f"[DEBUG] Tavily 캐시 적중(메모리): {query}")
+        return data
+    if _disk is not None:
+        try:
+            cached = _disk.get(key)
+        except Exception as e:
+            print(f"[DEBUG] Tavily 디스크 캐시 조회 오류: {e}")
+            cached = None
+        if cached is not None:
+            data, expires_at = cached
+            _memory.set(key, data, expires_at)
+            with _stats_lock:
+                _disk_hits += 1
+            print(f"[DEBUG] Tavily 캐시 적중(디스크): {query}")
+            return data
+
+    payload = {
+        "api_key": os.getenv("TAVILY_API_KEY"),
+        "query": query,
+        "search_depth": search_depth,
+        "include_answer": False,
+        "include_raw_content": False,
+        "max_results": max_results
+    }
+    headers = {"Content-Type": "application/json"}
+    with _stats_lock:
+        _api_calls += 1
+    with span("tavily_http"):
+        tavily_resp = get_http_session().post(TAVILY_URL, headers=headers, data=json.dumps(payload), timeout=timeout)
+    print(f"[DEBUG] Tavily API 응답 상태 코드: {tavily_resp.status_code}")
+
+    # HTTP 상태 코드 확인
+    if tavily_resp.status_code != 200:
+        print(f"[DEBUG] Tavily API HTTP 오류: {tavily_resp.status_code}")
+        print(f"[DEBUG] 오류 응답 내용: {tavily_resp.text[:500]}")
+        return None
+
+    # 응답 내용 확인
+    response_text = tavily_resp.text.strip()
+    if not response_text:
+        print("[DEBUG] Tavily API 응답이 비어있음")
+        return None
+
+    # JSON 파싱 시도
+    try:
+        data = tavily_resp.json()
+    except json.JSONDecodeError as e:
+        print(f"[DEBUG] Tavily API JSON 파싱 오류: {e}")
+        print(f"[DEBUG] 응답 내용: {response_text[:500]}")
+        return None
+
+    if data.get("results"):
+        expires_at = time.time() + TAVILY_CACHE_TTL.get(handler, TAVILY_CACHE_DEFAULT_TTL)
+        _memory.set(key, data, expires_at)
+        if _disk is not None:
+            try:
+                _disk.set(key, data, expires_at)
+            except Exception as e:
+                print(f"[DEBUG] Tavily 디스크 캐시 저장 오류: {e}")
+    return data
+
+
+def get_tavily_cache_stats():
+    memory = _memory.stats()
+    with _stats_lock:
+        disk_hits = _disk_hits
+        api_calls = _api_calls
+    total = memory["hits"] + disk_hits + api_calls
+    return {
+        "memory_size": memory["size"],
+        "memory_hits": memory["hits"],
+        "disk_size": _disk.size() if _disk is not None else 0,
+        "disk_hits": disk_hits,
+        "api_calls": api_calls,
+        "hit_rate": round((memory["hits"] + disk_hits) / total, 4) if total else 0.0,
+    }
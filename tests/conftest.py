@@ -0,0 +1,49 @@
+import os
+import sys
+
+# 저장소 최상위 모듈(agriculture_chatbot, handlers 등)을 import할 수 있도록 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sqlite3
+
+import pytest
+
+import oracle_pool
+import price_cache
+from loadtest.fake_services import PriceDatabase
+
+PRODUCTS = ["사과", "배", "감자", "양파", "대파"]
+
+
+@pytest.fixture
+def price_db(tmp_path):
+    """빈 SQLite 시세 테이블 (품목 코드만 있음), add_price로 가격 행을 추가"""
+    db = PriceDatabase(PRODUCTS, days=0, path=str(tmp_path / "price.sqlite3"))
+    oracle_pool.set_connection_factory(db.connect)
+    price_cache._cache.clear()
+    yield db
+    oracle_pool.set_connection_factory(None)
+    price_cache._cache.clear()
+
+
+@pytest.fixture
+def add_price(price_db):
+    def add(name, date, *prices):
+        conn = sqlite3.connect(price_db.path)
+        with conn:
+            code = conn.execute("SELECT LOW_CODE_VALUE FROM tb_code_detail WHERE LOW_CODE_NAME = ?", (name,)).fetchone()[0]
+            conn.executemany("INSERT INTO tb_price_api_history VALUES (?, ?, ?)", [(code, date, p) for p in prices])
+        conn.close()
+    return add
+
+
+@pytest.fixture
+def broken_db():
+    """연결할 때마다 오류가 나는 시세 DB"""
+    def connect():
+        raise RuntimeError("DB 연결 실패")
+    oracle_pool.set_connection_factory(connect)
+    price_cache._cache.clear()
+    yield
+    oracle_pool.set_connection_factory(None)
+    price_cache._cache.clear()
@@ -0,0 +1,41 @@
+from answer_cache import AnswerCache, is_cacheable_question
+
+RESULT = {"response": "감자 제철은 6~7월입니다.", "type": "product"}
+HISTORY = [("반품 가능한가요?", "제품 수령 후 2일 이내 반품 신청 가능합니다.")]
+
+
+def test_similar_question_of_same_category_hits_across_users():
+    cache = AnswerCache()
+    assert cache.store("감자 제철 언제야?", "product", RESULT)
+    assert cache.lookup("감자 제철 언제야", "product") == RESULT
+    assert cache.stats()["hits"] == 1
+
+
+def test_other_category_does_not_hit():
+    cache = AnswerCache()
+    cache.store("감자 제철 언제야?", "product", RESULT)
+    assert cache.lookup("감자 제철 언제야?", "search") is None
+
+
+def test_different_product_or_detail_does_not_hit():
+    cache = AnswerCache()
+    cache.store("감자 제철 언제야?", "product", RESULT)
+    cache.store("청년농업인 지원사업 신청 방법", "policy", {"response": "방법", "type": "policy"})
+    assert cache.lookup("고구마 제철 언제야?", "product") is None
+    assert cache.lookup("청년농업인 지원사업 신청 자격", "policy") is None
+
+
+def test_returning_users_hit_unless_they_refer_to_the_conversation():
+    cache = AnswerCache()
+    cache.store("감자 제철 언제야?", "product", RESULT)
+    assert cache.lookup("감자 제철 언제야?", "product", HISTORY) == RESULT
+    assert not is_cacheable_question("그거 더 자세히 알려줘", HISTORY)
+    assert not is_cacheable_question("감자는?", HISTORY)
+    assert not cache.store("그럼 감자 제철은?", "product", RESULT, HISTORY)
+
+
+def test_time_dependent_and_error_answers_are_not_stored():
+    cache = AnswerCache()
+    assert not cache.store("오늘 감자 시세", "price", {"response": "1000원", "type": "price"})
+    assert not cache.store("오늘 감자 제철 뉴스", "search", {"response": "뉴스", "type": "search"})
+    assert not cache.store("감자 효능 알려줘", "product", {"response": "관련 정보가 검색되지 않았습니다.", "type": "product"})
@@ -0,0 +1,39 @@
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("asgiref")
+import agriculture_chatbot as chatbot  # noqa: E402
+import asgi  # noqa: E402
+
+
+class ThreadRecorder:
+    """호출된 메서드와 호출한 스레드를 기록하는 세션 저장소/답변 캐시 대체"""
+
+    def __init__(self, calls, **returns):
+        self.calls = calls
+        self.returns = returns
+
+    def __getattr__(self, name):
+        def method(*args):
+            self.calls.append((name, threading.get_ident()))
+            return self.returns.get(name)
+        return method
+
+
+def test_session_store_and_answer_cache_do_not_block_event_loop(monkeypatch):
+    calls = []
+    monkeypatch.setattr(chatbot, "user_histories", ThreadRecorder(calls, get=[]))
+    monkeypatch.setattr(chatbot, "answer_cache", ThreadRecorder(calls))
+    monkeypatch.setattr(chatbot, "dispatch_handler", lambda category, message, history: {"response": "답변", "type": category})
+    monkeypatch.setattr(chatbot, "finish_chat", lambda *args: calls.append(("finish", threading.get_ident())))
+
+    async def run():
+        result = await asgi.process_chat_async("u1", "반품 가능한가요?")
+        return result, threading.get_ident()
+
+    result, loop_thread = asyncio.run(run())
+    assert result == {"response": "답변", "type": "faq"}
+    assert [name for name, _ in calls] == ["get", "lookup", "store", "finish"]
+    assert all(thread != loop_thread for _, thread in calls)
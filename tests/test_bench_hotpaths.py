@@ -0,0 +1,35 @@
+import pytest
+
+from benchmarks import bench_hotpaths
+from benchmarks.bench_hotpaths import CALIBRATION, compare
+
+BASELINE = {
+    CALIBRATION: {"ops_per_sec": 1000.0},
+    "parse_korean_date": {"ops_per_sec": 100000.0, "peak_kb": 5.0},
+}
+
+
+def test_regression_fails_check():
+    results = {"parse_korean_date": {"ops_per_sec": 60000.0, "peak_kb": 5.0}}
+    assert compare(results, BASELINE, 0.3, calibration=1000.0)
+
+
+def test_slower_machine_is_calibrated_not_failed():
+    results = {"parse_korean_date": {"ops_per_sec": 60000.0, "peak_kb": 5.0}}
+    assert compare(results, BASELINE, 0.3, calibration=600.0) == []
+
+
+def test_memory_growth_fails_check():
+    results = {"parse_korean_date": {"ops_per_sec": 100000.0, "peak_kb": 20.0}}
+    assert compare(results, BASELINE, 0.3, calibration=1000.0)
+
+
+def test_check_exits_nonzero_on_failure(monkeypatch, tmp_path, capsys):
+    path = tmp_path / "baseline.json"
+    path.write_text('{"find_products": {"ops_per_sec": 1e12, "peak_kb": 100}}', encoding="utf-8")
+    monkeypatch.setattr("sys.argv", ["bench_hotpaths.py", "-k", "find_products", "--min-time", "0.01", "--repeat", "1",
+                                     "--check", "--baseline", str(path)])
+    with pytest.raises(SystemExit) as exit_info:
+        bench_hotpaths.main()
+    assert exit_info.value.code == 1
+    assert "[실패] find_products" in capsys.readouterr().out
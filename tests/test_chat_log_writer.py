@@ -0,0 +1,101 @@
+import json
+import os
+from datetime import datetime
+
+from pymongo.errors import BulkWriteError
+
+from chat_log_writer import ChatLogWriter
+
+
+class FakeCollection:
+    """insert_many만 지원하는 MongoDB 컬렉션 대체 (down이면 연결 오류, reject에 든 n은 서버가 거부)"""
+
+    def __init__(self):
+        self.documents = []
+        self.down = False
+        self.reject = set()
+
+    def insert_many(self, documents, ordered=True):
+        if self.down:
+            raise ConnectionError("MongoDB 연결 실패")
+        errors = []
+        for i, doc in enumerate(documents):
+            if doc["n"] in self.reject:
+                errors.append({"index": i, "code": 121, "errmsg": "검증 실패"})
+            else:
+                self.documents.append(doc)
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": len(documents) - len(errors)})
+
+
+def spilled_lines(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line)["n"] for line in f]
+
+
+def test_outage_spills_and_next_success_replays_with_datetimes(tmp_path):
+    collection = FakeCollection()
+    path = str(tmp_path / "spill.jsonl")
+    writer = ChatLogWriter(collection, spill_path=path)
+    collection.down = True
+    writer._flush([{"n": 1, "timestamp": datetime(2025, 1, 1, 9, 30)}])
+    assert spilled_lines(path) == [1]
+
+    collection.down = False
+    writer._flush([{"n": 2}])
+    assert sorted(doc["n"] for doc in collection.documents) == [1, 2]
+    assert collection.documents[-1]["timestamp"] == datetime(2025, 1, 1, 9, 30)
+    assert not os.path.exists(path)
+    assert writer.stats()["replayed"] == 1
+
+
+def test_partial_bulk_failure_spills_only_rejected_documents(tmp_path):
+    collection = FakeCollection()
+    collection.reject = {2}
+    path = str(tmp_path / "spill.jsonl")
+    writer = ChatLogWriter(collection, spill_path=path)
+    writer._flush([{"n": 1}, {"n": 2}, {"n": 3}])
+    assert sorted(doc["n"] for doc in collection.documents) == [1, 3]
+    assert spilled_lines(path) == [2]
+
+    # 다시 거부되면 버리고, 이미 저장된 1, 3은 중복 저장되지 않음
+    writer._flush([{"n": 4}])
+    assert sorted(doc["n"] for doc in collection.documents) == [1, 3, 4]
+    assert spilled_lines(path) == []
+    assert writer.stats()["dropped"] == 1
+
+
+def test_spill_file_is_capped(tmp_path):
+    collection = FakeCollection()
+    collection.down = True
+    path = str(tmp_path / "spill.jsonl")
+    writer = ChatLogWriter(collection, spill_path=path, spill_max_bytes=100)
+    writer._flush([{"n": i, "text": "가" * 10} for i in range(10)])
+    stats = writer.stats()
+    assert os.path.getsize(path) <= 100
+    assert stats["spilled"] == len(spilled_lines(path)) > 0
+    assert stats["spill_overflow"] == stats["dropped"] == 10 - stats["spilled"]
+
+
+def test_leftover_replay_file_is_not_overwritten(tmp_path):
+    collection = FakeCollection()
+    path = str(tmp_path / "spill.jsonl")
+    with open(f"{path}.replay", "w", encoding="utf-8") as f:
+        f.write(json.dumps({"n": 1}) + "\n")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"n": 2}) + "\n")
+    writer = ChatLogWriter(collection, spill_path=path)
+    writer._flush([{"n": 3}])
+    assert sorted(doc["n"] for doc in collection.documents) == [1, 2, 3]
+    assert not os.path.exists(f"{path}.replay")
+
+
+def test_close_writes_queued_logs(tmp_path):
+    collection = FakeCollection()
+    writer = ChatLogWriter(collection, spill_path=str(tmp_path / "spill.jsonl"), flush_interval=60)
+    for i in range(5):
+        assert writer.submit({"n": i})
+    writer.close(timeout=5)
+    assert sorted(doc["n"] for doc in collection.documents) == [0, 1, 2, 3, 4]
@@ -0,0 +1,79 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import agriculture_chatbot as chatbot
+from stream_events import complete_text, emit, format_sse, streaming
+
+
+class Recorder:
+    """세션 저장소/답변 캐시 대체 (호출만 받고 아무것도 저장하지 않음)"""
+
+    def __getattr__(self, name):
+        return lambda *args: [] if name == "get" else None
+
+
+def parse_sse(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        event_line, data_line = block.split("\n")
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    return events
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(chatbot, "user_histories", Recorder())
+    monkeypatch.setattr(chatbot, "answer_cache", Recorder())
+    monkeypatch.setattr(chatbot, "finish_chat", lambda *args: None)
+    monkeypatch.setattr(chatbot, "classify_category", lambda message: "search")
+    return chatbot.app.test_client()
+
+
+def test_stream_sends_category_then_results_then_done(client, monkeypatch):
+    def dispatch(category, message, history):
+        emit("result", {"title": "첫 번째"})
+        emit("result", {"title": "두 번째"})
+        return {"response": "요약 답변", "type": "search"}
+
+    monkeypatch.setattr(chatbot, "dispatch_handler", dispatch)
+    response = client.post("/chat/stream", json={"message": "사과 작황", "user_id": "u1"})
+
+    assert response.mimetype == "text/event-stream"
+    assert parse_sse(response.get_data(as_text=True)) == [
+        ("category", {"category": "search"}),
+        ("result", {"title": "첫 번째"}),
+        ("result", {"title": "두 번째"}),
+        ("done", {"response": "요약 답변", "type": "search"}),
+    ]
+
+
+def test_stream_reports_handler_errors(client, monkeypatch):
+    def dispatch(category, message, history):
+        raise RuntimeError("검색 실패")
+
+    monkeypatch.setattr(chatbot, "dispatch_handler", dispatch)
+    events = parse_sse(client.post("/chat/stream", json={"message": "사과 작황"}).get_data(as_text=True))
+    assert events[-1] == ("error", {"error": "검색 실패"})
+
+
+def chunk(content):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))], usage=None)
+
+
+def test_complete_text_streams_tokens_with_split_placeholders():
+    chunks = [chunk("  오늘은 "), chunk("{da"), chunk("te}입니다")]
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: iter(chunks))))
+    events = []
+
+    with streaming(lambda event, data: events.append((event, data))):
+        text = complete_text(fake, replacements={"{date}": "2024년 1월 1일"}, model="gpt-4o", messages=[])
+
+    assert text == "오늘은 2024년 1월 1일입니다"
+    assert "".join(data["text"] for event, data in events) == text
+    assert all(event == "token" for event, _ in events)
+
+
+def test_format_sse_keeps_korean_text():
+    assert format_sse("token", {"text": "안녕"}) == 'event: token\ndata: {"text": "안녕"}\n\n'
@@ -0,0 +1,67 @@
+import asyncio
+import os
+import threading
+
+import classify_cache
+from cache_utils import LRUCache
+from classify_cache import cached_classifier, normalize_message
+
+
+def test_normalize_drops_spaces_punctuation_and_endings():
+    assert normalize_message("반품 가능한가요?") == normalize_message("반품가능") == "반품가능"
+    assert normalize_message("Hello!!") == "hello"
+
+
+def test_same_question_is_classified_once(monkeypatch):
+    monkeypatch.setattr(classify_cache, "_cache", LRUCache())
+    calls = []
+
+    @cached_classifier
+    def classify(message):
+        calls.append(message)
+        return "faq"
+
+    assert classify("반품 가능한가요?") == "faq"
+    assert classify("반품가능") == "faq"
+    assert calls == ["반품 가능한가요?"]
+
+
+def test_async_classifier_is_cached(monkeypatch):
+    monkeypatch.setattr(classify_cache, "_cache", LRUCache())
+    calls = []
+
+    @cached_classifier
+    async def classify(message):
+        calls.append(message)
+        return "policy"
+
+    async def run():
+        return [await classify("직불금 신청 방법"), await classify("직불금 신청 방법?")]
+
+    assert asyncio.run(run()) == ["policy", "policy"]
+    assert len(calls) == 1
+
+
+def test_concurrent_writes_save_every_n_and_restore(monkeypatch, tmp_path):
+    path = str(tmp_path / "classify.json")
+    monkeypatch.setattr(classify_cache, "_cache", LRUCache())
+    monkeypatch.setattr(classify_cache, "CLASSIFY_CACHE_PATH", path)
+    monkeypatch.setattr(classify_cache, "CLASSIFY_CACHE_SAVE_EVERY", 10)
+    monkeypatch.setattr(classify_cache, "_writes_since_save", 0)
+    classify = cached_classifier(lambda message: "search")
+
+    def worker(k):
+        for j in range(20):
+            classify(f"질문 {k}번 {j}")
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert classify_cache._writes_since_save == 0
+    assert os.listdir(tmp_path) == ["classify.json"]
+
+    restored = LRUCache()
+    assert restored.load(path) == 100
+    assert restored.get(normalize_message("질문 3번 7")) == "search"
@@ -0,0 +1,49 @@
+import threading
+
+import clients
+from clients import _LazyClient, get_http_session, get_openai_client
+
+
+def test_http_session_is_shared_and_pooled(monkeypatch):
+    monkeypatch.setattr(clients, "_http_session", None)
+    monkeypatch.setattr(clients, "HTTP_POOL_MAXSIZE", 7)
+    sessions = []
+    threads = [threading.Thread(target=lambda: sessions.append(get_http_session())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert all(s is sessions[0] for s in sessions)
+    adapter = sessions[0].get_adapter("https://api.tavily.com/search")
+    assert adapter._pool_maxsize == 7
+
+
+def test_openai_client_is_created_once(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(clients, "_openai_client", None)
+
+    assert get_openai_client() is get_openai_client()
+
+
+def test_lazy_client_builds_on_first_attribute_access():
+    created = []
+
+    class Client:
+        chat = "chat-api"
+
+    def factory():
+        created.append(Client())
+        return created[-1]
+
+    lazy = _LazyClient(factory)
+    assert created == []
+    assert lazy.chat == "chat-api"
+    assert len(created) == 1
+
+
+def test_handlers_share_the_registry_client():
+    from handlers import export_handler, faq_handler, policy_handler, product_handler, search_handler
+
+    for module in (export_handler, faq_handler, policy_handler, product_handler, search_handler):
+        assert module.client is clients.openai_client
@@ -0,0 +1,76 @@
+import pytest
+import requests
+
+from loadtest.fake_services import FakeOpenAIServer, FakeTavilyServer, InMemoryCollection, LatencyModel, PriceDatabase
+
+
+def test_latency_model_distributions():
+    assert LatencyModel("fixed:0.2").sample() == 0.2
+    uniform = LatencyModel("uniform:0.1,0.3", seed=1)
+    assert all(0.1 <= uniform.sample() <= 0.3 for _ in range(100))
+    normal = LatencyModel("normal:0,1", seed=1)
+    assert all(normal.sample() >= 0 for _ in range(100))
+    with pytest.raises(ValueError):
+        LatencyModel("poisson:1")
+
+
+def test_price_database_runs_oracle_sql(tmp_path):
+    db = PriceDatabase(["사과", "배"], days=3, rows_per_day=2, path=str(tmp_path / "price.sqlite3"))
+    sql = PriceDatabase.to_sqlite(
+        "SELECT TO_CHAR(h.RECORDED_DATE, 'YYYYMMDD'), COUNT(*) FROM tb_price_api_history h "
+        "JOIN tb_code_detail c ON c.LOW_CODE_VALUE = h.LOW_CODE_VALUE "
+        "WHERE c.LOW_CODE_NAME = :name AND h.RECORDED_DATE <= TO_DATE(:until, 'YYYYMMDD') GROUP BY h.RECORDED_DATE"
+    )
+    assert "TO_CHAR" not in sql and "TO_DATE" not in sql
+
+    with db.connect() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql, {"name": "사과", "until": "99991231"})
+            rows = cur.fetchall()
+    assert len(rows) == 3
+    assert all(count == 2 for _, count in rows)
+
+
+@pytest.fixture
+def openai_server():
+    server = FakeOpenAIServer(classify_answers={"반품 가능한가요?": "faq"}).start()
+    yield server
+    server.stop()
+
+
+def test_fake_openai_classifies_and_counts_calls(openai_server):
+    prompt = '아래 질문의 카테고리(영어 소문자만 답해)\n질문: "반품 가능한가요?"'
+    response = requests.post(f"{openai_server.base_url}/chat/completions",
+                             json={"model": "gpt-4o", "messages": [{"role": "user", "content": prompt}]}, timeout=5)
+
+    body = response.json()
+    assert body["choices"][0]["message"]["content"] == "faq"
+    assert body["usage"]["total_tokens"] > 0
+    assert openai_server.calls == {"classify": 1}
+
+
+def test_fake_openai_streams_chunks_with_usage(openai_server):
+    response = requests.post(f"{openai_server.base_url}/chat/completions", timeout=5, json={
+        "model": "gpt-4o", "stream": True, "stream_options": {"include_usage": True},
+        "messages": [{"role": "user", "content": "오늘 날짜 알려줘"}],
+    })
+    lines = [line for line in response.text.split("\n\n") if line]
+    assert lines[-1] == "data: [DONE]"
+    assert '"usage"' in lines[-2]
+
+
+def test_fake_tavily_returns_requested_results():
+    server = FakeTavilyServer().start()
+    try:
+        response = requests.post(server.search_url, json={"query": "사과 수출", "max_results": 3}, timeout=5)
+    finally:
+        server.stop()
+    results = response.json()["results"]
+    assert len(results) == 3
+    assert all("사과 수출" in r["content"] for r in results)
+
+
+def test_in_memory_collection_counts_documents():
+    collection = InMemoryCollection()
+    collection.insert_many([{"a": 1}, {"a": 2}], ordered=False)
+    assert collection.count_documents({}) == 2
@@ -0,0 +1,44 @@
+import pytest
+
+from handlers import faq_handler
+from handlers.faq_handler import CUSTOMER_SERVICE_INFO, covers_question, handle_faq, search_faq
+
+
+@pytest.fixture
+def llm_prompts(monkeypatch):
+    """LLM 호출 대신 프롬프트를 기록하고 고정 답변을 반환"""
+    prompts = []
+
+    def complete_text(client, **kwargs):
+        prompts.append(kwargs["messages"][0]["content"])
+        return "LLM 답변"
+
+    monkeypatch.setattr(faq_handler, "complete_text", complete_text)
+    return prompts
+
+
+@pytest.mark.parametrize("question, key", [
+    ("반품 가능한가요?", "반품"),
+    ("배송 얼마나 걸려요", "배송"),
+    ("카카오페이 되나요", "결제"),
+    ("고객센터 전화번호 알려줘", "고객센터 연락처"),
+    ("판매자인데 구매 가능해?", "판매자 구매"),
+])
+def test_clear_questions_get_canned_answer_without_llm(llm_prompts, question, key):
+    assert handle_faq(question) == {"response": CUSTOMER_SERVICE_INFO[key], "type": "customer_service"}
+    assert llm_prompts == []
+
+
+def test_uncovered_words_go_to_llm_with_top_candidates_only(llm_prompts):
+    assert not covers_question("회원가입", "회원 탈퇴 어떻게 해요")
+
+    assert handle_faq("회원 탈퇴 어떻게 해요")["response"] == "LLM 답변"
+    prompt = llm_prompts[0]
+    assert f"- 회원가입: {CUSTOMER_SERVICE_INFO['회원가입']}" in prompt
+    assert prompt.count("\n- ") == faq_handler.FAQ_TOP_K
+
+
+def test_search_ranks_paraphrase_owner_first():
+    matches = search_faq("택배가 안 와요 어디에 물어봐요")
+    assert matches[0][0] == "배송 문의"
+    assert len(matches) <= faq_handler.FAQ_TOP_K
@@ -0,0 +1,46 @@
+import history_store
+from history_store import HistoryStore
+
+
+def test_keeps_only_recent_turns():
+    store = HistoryStore(max_turns=2)
+    for i in range(3):
+        store.append("u1", f"질문{i}", f"답변{i}")
+    assert list(store.get("u1")) == [("질문1", "답변1"), ("질문2", "답변2")]
+
+
+def test_least_recent_user_is_evicted_first():
+    store = HistoryStore(max_users=2)
+    store.append("u1", "a", "b")
+    store.append("u2", "a", "b")
+    store.append("u1", "c", "d")
+    store.append("u3", "a", "b")
+    assert len(store.get("u2")) == 0
+    assert len(store.get("u1")) == 2
+    assert store.stats()["evictions"]["lru"] == 1
+
+
+def test_idle_users_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(history_store.time, "time", lambda: now[0])
+    store = HistoryStore(idle_ttl=60)
+    store.append("u1", "a", "b")
+    now[0] += 61
+    assert len(store.get("u1")) == 0
+    assert store.stats()["evictions"]["ttl"] == 1
+
+
+def test_memory_limit_evicts_oldest_users():
+    store = HistoryStore(max_bytes=100)
+    store.append("u1", "가" * 20, "b")
+    store.append("u2", "가" * 20, "b")
+    assert store.stats()["bytes"] <= 100
+    assert len(store.get("u1")) == 0
+    assert store.stats()["evictions"]["memory"] == 1
+
+
+def test_health_reports_history_stats():
+    import agriculture_chatbot
+    payload = agriculture_chatbot.app.test_client().get("/health").get_json()
+    assert payload["status"] == "healthy"
+    assert {"users", "max_users", "evictions"} <= set(payload["history"])
@@ -0,0 +1,40 @@
+import pytest
+
+from intent_router import ROUTER_MIN_CONFIDENCE, find_clear_products, route_intent
+
+
+@pytest.mark.parametrize("message, category", [
+    ("반품 가능한가요?", "faq"),
+    ("회원가입 어떻게 해요", "faq"),
+    ("사과 가격 알려줘", "price"),
+    ("감자 재배 방법", "product"),
+    ("고추도 팔아?", "product_check"),
+    ("판매 품목 알려줘", "product_list"),
+    ("안녕하세요", "simple_info"),
+    ("오늘 날짜 알려줘", "simple_info"),
+])
+def test_clear_messages_skip_llm(message, category):
+    routed, confidence = route_intent(message)
+    assert routed == category
+    assert confidence >= ROUTER_MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize("message", [
+    "농업인 보험 가입 지원 정책",
+    "청년 농업인 판매자 교육 프로그램",
+    "딸기 배송 중 보관 방법",
+    "감자 재배 지원 정책",
+    "양파 가격 안정 지원 정책",
+    "지난주 금요일 발표된 정책",
+    "오늘 배추 작황 어때",
+])
+def test_mixed_or_policy_messages_go_to_llm(message):
+    _, confidence = route_intent(message)
+    assert confidence < ROUTER_MIN_CONFIDENCE
+
+
+def test_single_syllable_products_need_their_own_word():
+    assert find_clear_products("무 가격") == ["무"]
+    assert find_clear_products("배는 얼마야") == ["배"]
+    assert find_clear_products("무슨 요일이야") == []
+    assert find_clear_products("배달 언제 와") == []
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta, timezone
+
+import llm_accounting
+from llm_accounting import UsageAggregator, estimate_cost
+
+
+def usage(tokens):
+    return {"calls": 1, "prompt_tokens": tokens, "completion_tokens": 0, "total_tokens": tokens, "cost_usd": tokens / 1000}
+
+
+def test_cost_uses_longest_model_prefix():
+    assert estimate_cost("gpt-4o-mini-2024-07-18", 1_000_000, 0) == 0.15
+    assert estimate_cost("unknown-model", 1_000_000, 1_000_000) == 0.0
+
+
+def test_day_bucket_uses_kst(monkeypatch):
+    # UTC 2025-01-20 16:00 = KST 2025-01-21 01:00
+    now = datetime(2025, 1, 20, 16, 0, tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=9)))
+    monkeypatch.setattr(llm_accounting, "kst_now", lambda: now)
+    totals = UsageAggregator()
+    totals.record("u1", "faq", usage(10))
+    assert totals.report()["day"] == "20250121"
+    assert totals.report("20250121")["total"]["total_tokens"] == 10
+
+
+def test_old_days_are_dropped():
+    totals = UsageAggregator(days=2)
+    for day in ["20250101", "20250102", "20250103"]:
+        totals.record("u1", "faq", usage(1), day=day)
+    assert totals.report("20250103")["days"] == ["20250102", "20250103"]
+
+
+def test_per_user_totals_are_capped_without_losing_usage():
+    totals = UsageAggregator(max_users=10, top_users=3)
+    for i in range(25):
+        totals.record(f"u{i}", "faq", usage(i + 1), day="20250101")
+    report = totals.report("20250101")
+    assert report["user_count"] <= 10
+    assert report["trimmed_users"] + report["user_count"] == 25
+    assert [u["user_id"] for u in report["top_users"]] == ["u24", "u23", "u22"]
+    kept = sum(t["total_tokens"] for t in totals._days["20250101"]["users"].values())
+    assert kept + report["other_users"]["total_tokens"] == report["total"]["total_tokens"] == sum(range(1, 26))
@@ -0,0 +1,71 @@
+import pytest
+
+import agriculture_chatbot as chatbot
+import metrics
+from metrics import Counter, Histogram, request_timer, set_category, span, timed
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = []
+    monkeypatch.setattr(metrics, "_registry", registry)
+    return registry
+
+
+def test_histogram_renders_cumulative_buckets(registry):
+    histogram = Histogram("stage_seconds", "test", ("stage",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage="classify")
+    histogram.observe(0.5, stage="classify")
+
+    lines = histogram.render()
+    assert 'stage_seconds_bucket{stage="classify",le="0.1"} 1' in lines
+    assert 'stage_seconds_bucket{stage="classify",le="1"} 2' in lines
+    assert 'stage_seconds_bucket{stage="classify",le="+Inf"} 2' in lines
+    assert 'stage_seconds_count{stage="classify"} 2' in lines
+
+
+def test_counter_escapes_label_values(registry):
+    counter = Counter("requests_total", "test", ("category",))
+    counter.inc(category='a"b')
+    counter.inc(2, category='a"b')
+    assert counter.render()[-1] == 'requests_total{category="a\\"b"} 3'
+
+
+def test_request_timer_collects_stages_by_category(monkeypatch):
+    observed = []
+    monkeypatch.setattr(metrics.STAGE_DURATION, "observe", lambda value, **labels: observed.append(labels))
+
+    @timed("handler")
+    def handler():
+        with span("tavily_http"):
+            pass
+
+    with request_timer() as timer:
+        set_category("search")
+        handler()
+
+    breakdown = timer.breakdown()
+    assert breakdown["category"] == "search"
+    assert set(breakdown["stages"]) == {"handler", "tavily_http"}
+    assert {"category": "search", "stage": "total"} in observed
+
+
+def test_span_outside_request_is_recorded_as_background(monkeypatch):
+    observed = []
+    monkeypatch.setattr(metrics.STAGE_DURATION, "observe", lambda value, **labels: observed.append(labels))
+    with span("chat_log_flush"):
+        pass
+    assert observed == [{"category": "background", "stage": "chat_log_flush"}]
+
+
+def test_metrics_endpoint_and_debug_timing(monkeypatch):
+    monkeypatch.setattr(chatbot, "process_chat", lambda user_id, message: {"response": "답변", "type": "faq"})
+    client = chatbot.app.test_client()
+
+    body = client.post("/chat", json={"message": "반품 가능한가요?", "debug_timing": True}).get_json()
+    assert body["response"] == "답변"
+    assert "total_ms" in body["timings"]
+
+    response = client.get("/metrics")
+    assert response.mimetype == "text/plain"
+    assert "# TYPE chatbot_stage_duration_seconds histogram" in response.get_data(as_text=True)
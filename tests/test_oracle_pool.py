@@ -0,0 +1,69 @@
+import sys
+import threading
+import types
+
+import pytest
+
+import oracle_pool
+
+
+@pytest.fixture
+def fake_oracledb(monkeypatch):
+    """oracledb.create_pool 호출을 기록하는 가짜 모듈 (실제 DB에 접속하지 않음)"""
+    created = []
+
+    class Pool:
+        def __init__(self, settings):
+            self.settings = settings
+            self.acquired = 0
+            self.closed = False
+
+        def acquire(self):
+            self.acquired += 1
+            return f"conn{self.acquired}"
+
+        def close(self, force=False):
+            self.closed = force
+
+    def create_pool(**settings):
+        pool = Pool(settings)
+        created.append(pool)
+        return pool
+
+    module = types.SimpleNamespace(create_pool=create_pool, POOL_GETMODE_TIMEDWAIT="timedwait")
+    monkeypatch.setitem(sys.modules, "oracledb", module)
+    monkeypatch.setenv("ORACLE_POOL_MAX", "7")
+    oracle_pool.close_pool()
+    oracle_pool.set_connection_factory(None)
+    yield created
+    oracle_pool.close_pool()
+
+
+def test_pool_is_created_once_and_shared(fake_oracledb):
+    threads = [threading.Thread(target=oracle_pool.get_connection) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(fake_oracledb) == 1
+    pool = fake_oracledb[0]
+    assert pool.acquired == 8
+    assert pool.settings["max"] == 7
+    assert pool.settings["getmode"] == "timedwait"
+
+
+def test_connection_factory_bypasses_pool(fake_oracledb):
+    oracle_pool.set_connection_factory(lambda: "local")
+    try:
+        assert oracle_pool.get_connection() == "local"
+    finally:
+        oracle_pool.set_connection_factory(None)
+    assert fake_oracledb == []
+
+
+def test_close_pool_releases_sessions(fake_oracledb):
+    oracle_pool.get_connection()
+    oracle_pool.close_pool()
+    assert fake_oracledb[0].closed
+    oracle_pool.get_connection()
+    assert len(fake_oracledb) == 2
@@ -0,0 +1,33 @@
+import pytest
+
+import agriculture_chatbot
+
+
+@pytest.fixture
+def client():
+    return agriculture_chatbot.app.test_client()
+
+
+def test_price_batch_returns_rows_and_omits_missing(client, add_price):
+    add_price("사과", "20240101", 1000, 3000)
+    response = client.post("/price/batch", json={"products": "사과, 감자", "dates": ["20240101"]})
+    assert response.status_code == 200
+    assert response.get_json()["prices"] == {"사과": {"20240101": {"min": 1000, "max": 3000, "avg": 2000, "count": 2}}}
+
+
+def test_price_batch_date_range(client, add_price):
+    add_price("배", "20240101", 100)
+    add_price("배", "20240103", 300)
+    response = client.post("/price/batch", json={"products": ["배"], "start_date": "20240103", "end_date": "20240101"})
+    assert sorted(response.get_json()["prices"]["배"]) == ["20240101", "20240103"]
+
+
+def test_price_batch_rejects_bad_input(client, price_db):
+    assert client.post("/price/batch", json={"dates": ["20240101"]}).status_code == 400
+    assert client.post("/price/batch", json={"products": ["사과"], "dates": ["언젠가"]}).status_code == 400
+
+
+def test_price_batch_query_failure_is_not_empty_result(client, broken_db):
+    response = client.post("/price/batch", json={"products": ["사과"], "dates": ["20240101"]})
+    assert response.status_code == 503
+    assert "prices" not in response.get_json()
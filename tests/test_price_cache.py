@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+import cache_utils
+import price_cache
+from price_cache import KST, cached_price, expires_at_for, kst_now, next_kst_midnight
+
+
+def test_next_midnight_is_kst():
+    midnight = datetime.fromtimestamp(next_kst_midnight(), KST)
+    assert (midnight.hour, midnight.minute, midnight.second) == (0, 0, 0)
+    assert midnight.date() == (kst_now() + timedelta(days=1)).date()
+    assert kst_now().utcoffset() == timedelta(hours=9)
+
+
+def test_past_dates_never_expire_and_today_expires_at_midnight():
+    assert expires_at_for("20200101") is None
+    assert expires_at_for(kst_now().strftime("%Y%m%d")) == next_kst_midnight()
+
+
+def test_today_result_is_refetched_after_kst_midnight(monkeypatch):
+    price_cache._cache.clear()
+    calls = []
+
+    @cached_price("test")
+    def lookup(product_name, date):
+        calls.append(date)
+        return f"{product_name} {len(calls)}"
+
+    today = kst_now().strftime("%Y%m%d")
+    assert lookup("사과", today) == "사과 1"
+    assert lookup("사과", today) == "사과 1"
+    assert lookup("사과", "20200101") == "사과 2"
+
+    after_midnight = next_kst_midnight() + 1
+    monkeypatch.setattr(cache_utils.time, "time", lambda: after_midnight)
+    assert lookup("사과", today) == "사과 3"
+    assert lookup("사과", "20200101") == "사과 2"
+    price_cache._cache.clear()
+
+
+def test_missing_prices_are_not_cached():
+    price_cache._cache.clear()
+    calls = []
+
+    @cached_price("test")
+    def lookup(product_name, date):
+        calls.append(date)
+        return None
+
+    lookup("배", "20200101")
+    lookup("배", "20200101")
+    assert len(calls) == 2
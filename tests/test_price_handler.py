@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+import pytest
+
+from handlers import price_handler
+from handlers.price_handler import get_latest_price_until, get_prices_batch, handle_multi_price, handle_price
+from price_cache import kst_now
+
+
+def test_latest_price_falls_back_to_previous_and_latest_day(add_price):
+    add_price("사과", "20240103", 1000, 1200)
+    add_price("사과", "20240101", 900)
+    assert get_latest_price_until("사과", "20240103")["tier"] == "exact"
+    assert get_latest_price_until("사과", "20240104")["tier"] == "previous_day"
+    latest = get_latest_price_until("사과", "20240110")
+    assert (latest["tier"], latest["date"], latest["min"], latest["max"]) == ("latest", "20240103", 1000, 1200)
+    assert get_latest_price_until("배", "20240110") is None
+
+
+def test_batch_returns_stats_per_product_and_date(add_price):
+    add_price("사과", "20240101", 1000, 2000)
+    add_price("배", "20240102", 3000)
+    prices = get_prices_batch(["사과", "배", "감자"], ["20240101", "20240102"])
+    assert prices["사과"]["20240101"] == {"min": 1000, "max": 2000, "avg": 1500, "count": 2}
+    assert list(prices["배"]) == ["20240102"]
+    assert "감자" not in prices
+
+
+def test_batch_splits_large_requests_without_dropping_any(add_price, monkeypatch):
+    monkeypatch.setattr(price_handler, "MAX_BATCH_PRODUCTS", 2)
+    monkeypatch.setattr(price_handler, "MAX_BATCH_DATES", 1)
+    for name in ["사과", "배", "감자", "양파", "대파"]:
+        add_price(name, "20240101", 100)
+        add_price(name, "20240102", 200)
+    prices = get_prices_batch(["사과", "배", "감자", "양파", "대파"], ["20240101", "20240102"])
+    assert sum(len(by_date) for by_date in prices.values()) == 10
+
+
+def test_batch_query_error_is_raised_not_empty(broken_db):
+    with pytest.raises(RuntimeError):
+        get_prices_batch(["사과", "배"], ["20240101"])
+
+
+def test_price_answers_report_query_errors(broken_db):
+    error = "조회하는 중 오류가 발생했습니다"
+    assert error in handle_price("사과 2024년 1월 1일 가격")["response"]
+    assert error in handle_price("사과 오늘 가격")["response"]
+    assert error in handle_multi_price(["사과", "배"], "20240101", "20240101", False)["response"]
+
+
+def test_multi_price_uses_yesterday_then_latest_for_today(add_price):
+    yesterday = (kst_now() - timedelta(days=1)).strftime("%Y%m%d")
+    add_price("사과", yesterday, 1000)
+    add_price("배", "20240101", 2000)
+    today = kst_now().strftime("%Y%m%d")
+    response = handle_multi_price(["사과", "배", "감자"], today, today, False)["response"]
+    assert "(어제) 기준 가격은 1000" in response
+    assert "가장 최근 업데이트일인 2024년 1월 1일 기준 가격은 2000" in response
+    assert "감자: 가격 정보가 한 건도 없습니다" in response
+
+
+def test_comparison_uses_grouped_stats_for_both_dates(add_price):
+    add_price("양파", "20240101", 1000, 1000)
+    add_price("양파", "20240108", 1000, 1400)
+    comparison = price_handler.get_price_comparison("양파", "20240101", "20240108")
+    assert comparison["before"]["count"] == 2
+    assert comparison["diff"] == 200
+    assert comparison["pct"] == 20
+    response = handle_price("양파 2024년 1월 8일이랑 2024년 1월 1일 가격 비교")["response"]
+    assert "1000.00원, 2024년 1월 8일 기준 양파 평균가는 1200.00원으로 200.00원(20.00%) 올랐습니다." in response
+
+
+def test_comparison_missing_date_differs_from_query_error(add_price, monkeypatch):
+    add_price("양파", "20240101", 1000)
+    message = "양파 2024년 1월 1일이랑 2024년 1월 8일 가격 비교"
+    assert "가격 정보가 없는 날짜가 있어" in handle_price(message)["response"]
+
+    def fail(*args):
+        raise RuntimeError("DB 연결 실패")
+    monkeypatch.setattr(price_handler, "_query_price_stats", fail)
+    response = handle_price("양파 2024년 1월 2일이랑 2024년 1월 9일 가격 비교")["response"]
+    assert "조회하는 중 오류가 발생했습니다" in response
@@ -0,0 +1,62 @@
+import sqlite3
+
+import pytest
+
+import oracle_pool
+import price_cache
+import product_catalog
+from handlers.price_handler import handle_price
+from loadtest.fake_services import PriceDatabase
+from product_catalog import ProductCatalog, load_catalog_from_db, static_catalog
+
+
+def test_static_catalog_indexes_names_categories_and_aliases():
+    catalog = static_catalog()
+    assert catalog.resolve("방울 토마토") == ["방울토마토"]
+    assert catalog.resolve("고추") == ["건고추", "풋고추", "붉은고추", "청양고추"]
+    assert catalog.resolve("없는품목") == []
+    assert catalog.find_aliases("고추랑 귤 가격") == [("고추", catalog.aliases["고추"]), ("귤", ["감귤"])]
+    assert "총 " + str(len(catalog.names)) + "가지" in catalog.product_list_text
+
+
+def test_unknown_category_items_go_to_other():
+    catalog = ProductCatalog([("사과", "0001"), ("새품목", "0999")], source="db")
+    assert catalog.category_by_name["새품목"] == product_catalog.OTHER_CATEGORY
+    assert catalog.name_by_code["0999"] == "새품목"
+    assert catalog.code_by_name["사과"] == "0001"
+
+
+@pytest.fixture
+def catalog_db(tmp_path):
+    db = PriceDatabase(["사과", "건고추", "풋고추", "비료"], days=0, path=str(tmp_path / "price.sqlite3"))
+    conn = sqlite3.connect(db.path)
+    with conn:
+        conn.execute("ALTER TABLE tb_code_detail ADD COLUMN HIGH_CODE_VALUE TEXT")
+        conn.execute("UPDATE tb_code_detail SET HIGH_CODE_VALUE = 'AGRI' WHERE LOW_CODE_NAME != '비료'")
+        # 비료(0003)는 시세 이력이 있어도 품목 그룹이 아님, 풋고추(0002)는 시세 이력이 없음
+        conn.executemany("INSERT INTO tb_price_api_history VALUES (?, '20240101', ?)",
+                         [("0000", 1000), ("0001", 5000), ("0003", 300)])
+    conn.close()
+    oracle_pool.set_connection_factory(db.connect)
+    price_cache._cache.clear()
+    yield db
+    oracle_pool.set_connection_factory(None)
+    price_cache._cache.clear()
+
+
+def test_db_catalog_reads_priced_codes_in_the_group(catalog_db):
+    assert set(load_catalog_from_db(code_group="").names) == {"사과", "건고추", "비료"}
+
+    catalog = load_catalog_from_db(code_group="AGRI")
+    assert set(catalog.names) == {"사과", "건고추"}
+    assert catalog.source == "db"
+    assert catalog.resolve("고추") == ["건고추"]
+    with pytest.raises(ValueError):
+        load_catalog_from_db(code_group="AGRI", group_column="HIGH_CODE_VALUE; DROP TABLE x")
+
+
+def test_price_question_for_alias_answers_each_variety(catalog_db, monkeypatch):
+    monkeypatch.setattr(product_catalog, "_catalog", load_catalog_from_db(code_group="AGRI"))
+    response = handle_price("고추 2024년 1월 1일 가격")["response"]
+    assert "건고추" in response
+    assert "5000" in response
@@ -0,0 +1,23 @@
+from product_matcher import find_product, find_products, find_related_products, lookup_product
+
+
+def test_longest_match_wins_and_spaces_are_ignored():
+    assert find_products("방울 토마토랑 토마토 가격") == ["방울토마토", "토마토"]
+    assert find_product("청양고추 시세") == "청양고추"
+
+
+def test_blocking_words_are_not_products():
+    assert find_products("옥수수 가격") == []
+    assert find_products("수수랑 옥수수") == ["수수"]
+    assert find_products("배송 언제 와요") == []
+
+
+def test_single_variety_alias_maps_to_product():
+    assert find_products("방토 가격") == ["방울토마토"]
+    assert lookup_product("로메인상추") == "로메인 상추"
+    assert lookup_product("없는품목") is None
+
+
+def test_related_products_include_alias_varieties():
+    assert find_related_products("고추")[:4] == ["건고추", "풋고추", "붉은고추", "청양고추"]
+    assert find_related_products("고") == []
@@ -0,0 +1,54 @@
+import threading
+
+import pytest
+
+import session_store
+from session_store import MemorySessionStore, SQLiteSessionStore, create_session_store
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    worker_a = SQLiteSessionStore(path, max_turns=2)
+    worker_b = SQLiteSessionStore(path, max_turns=2)
+
+    worker_a.append("u1", "질문0", "취급중인 상품 목록을 알려드릴까요?")
+    worker_b.append("u1", "질문1", "답변1")
+    worker_a.append("u1", "질문2", "답변2")
+
+    assert list(worker_b.get("u1")) == [("질문1", "답변1"), ("질문2", "답변2")]
+    assert worker_a.stats() == {"backend": "sqlite", "users": 1, "turns": 2}
+
+
+def test_sqlite_concurrent_appends_keep_last_turns(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.sqlite3"), max_turns=3)
+    threads = [threading.Thread(target=store.append, args=("u1", f"질문{i}", f"답변{i}")) for i in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(store.get("u1")) == 3
+    assert store.stats()["turns"] == 3
+
+
+def test_sqlite_idle_history_expires(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(session_store.time, "time", lambda: now[0])
+    store = SQLiteSessionStore(str(tmp_path / "sessions.sqlite3"), idle_ttl=60)
+    store.append("u1", "오래된 질문", "답변")
+    now[0] += 61
+
+    assert len(store.get("u1")) == 0
+    store.append("u1", "새 질문", "답변")
+    assert list(store.get("u1")) == [("새 질문", "답변")]
+
+
+def test_create_session_store_selects_backend(monkeypatch, tmp_path):
+    # 기본 SQLite 경로(.cache/sessions.sqlite3)는 작업 디렉터리 기준
+    monkeypatch.chdir(tmp_path)
+
+    assert isinstance(create_session_store("memory"), MemorySessionStore)
+    assert isinstance(create_session_store("sqlite"), SQLiteSessionStore)
+    assert create_session_store("memory").stats()["backend"] == "memory"
+    with pytest.raises(ValueError):
+        create_session_store("memcached")
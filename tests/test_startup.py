@@ -0,0 +1,16 @@
+from benchmarks.bench_startup import LAZY_MODULES, measure_once
+
+
+def test_importing_app_does_not_load_heavy_clients():
+    # 새 프로세스에서 import (MongoDB/OpenAI/오라클 패키지는 처음 사용할 때 불러와야 함)
+    result = measure_once("agriculture_chatbot")
+    assert result["loaded"] == []
+
+
+def test_unused_agent_is_not_built_on_import():
+    import agriculture_chatbot
+
+    assert "langchain" in LAZY_MODULES
+    assert not hasattr(agriculture_chatbot, "agent")
+    assert not hasattr(agriculture_chatbot, "llm")
+    assert not hasattr(agriculture_chatbot, "search_tool")
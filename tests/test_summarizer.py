@@ -0,0 +1,109 @@
+import json
+import threading
+import time
+import types
+
+import pytest
+
+import summarizer
+from summarizer import collect_relevant, filter_ad_lines, summarize_contents
+
+
+def completion(content):
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def per_item(monkeypatch):
+    """per_item 모드, 요약 = '요약:' + 본문 (동시 실행 수 기록)"""
+    monkeypatch.setattr(summarizer, "SUMMARY_MODE", "per_item")
+    state = {"running": 0, "max_running": 0, "calls": 0}
+    lock = threading.Lock()
+
+    def fake_completion(client, stage, **kwargs):
+        content = kwargs["messages"][-1]["content"].split("\n\n", 1)[1]
+        with lock:
+            state["calls"] += 1
+            state["running"] += 1
+            state["max_running"] = max(state["max_running"], state["running"])
+        # 앞의 결과일수록 늦게 끝나도 반환 순서는 유지돼야 함
+        time.sleep(0.05 if content.endswith("0") else 0.01)
+        with lock:
+            state["running"] -= 1
+        return completion(f"요약:{content}")
+
+    monkeypatch.setattr(summarizer, "chat_completion", fake_completion)
+    return state
+
+
+def test_per_item_keeps_order_and_limits_concurrency(per_item, monkeypatch):
+    monkeypatch.setitem(summarizer._semaphores, "test", threading.BoundedSemaphore(2))
+    contents = [f"본문{i}" for i in range(6)]
+    results = summarize_contents("test", None, "요약해줘", contents)
+    assert [s for s, _ in results] == [f"요약:본문{i}" for i in range(6)]
+    assert per_item["max_running"] <= 2
+
+
+def test_collect_relevant_stops_when_enough_are_found(per_item):
+    contents = ["감자 1", "잡담 2", "감자 3", "감자 4", "감자 5"]
+    selected = collect_relevant("search", None, "요약해줘", contents, ["감자"], 2)
+    assert selected == [(0, "요약:감자 1"), (2, "요약:감자 3")]
+    assert per_item["calls"] == 3
+
+
+def test_failed_summary_falls_back_to_content(monkeypatch):
+    monkeypatch.setattr(summarizer, "SUMMARY_MODE", "per_item")
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("LLM 오류")
+    monkeypatch.setattr(summarizer, "chat_completion", fail)
+    assert summarize_contents("search", None, "요약해줘", ["가" * 500])[0][0] == "가" * 400
+
+
+def test_filter_ad_lines_removes_promotional_lines():
+    text = "배추 작황이 좋다.\n[이벤트] 지금 주문하면 배송비 무료\n가격은 안정세다."
+    assert filter_ad_lines(text) == "배추 작황이 좋다.\n가격은 안정세다."
+
+
+@pytest.fixture
+def batch(monkeypatch):
+    """batch 모드, 일괄 요약 응답(JSON 문자열)을 지정하고 개별 요약 호출 수를 기록"""
+    monkeypatch.setattr(summarizer, "SUMMARY_MODE", "batch")
+    state = {"response": None, "item_calls": 0}
+
+    def fake_completion(client, stage, **kwargs):
+        if stage == "summarize_batch":
+            return completion(state["response"])
+        state["item_calls"] += 1
+        return completion("개별 요약 감자")
+
+    monkeypatch.setattr(summarizer, "chat_completion", fake_completion)
+    return state
+
+
+def test_batch_uses_one_call_and_strict_relevance(batch):
+    batch["response"] = json.dumps({"results": [
+        {"index": 0, "summary": "감자 작황", "relevant": True},
+        {"index": 1, "summary": "감자 수출", "relevant": "false"},
+        {"index": 2, "summary": "감자 가격", "relevant": "true"},
+        {"index": 3, "summary": "감자 보관"},
+    ]})
+    results = summarize_contents("search", None, "요약해줘", ["a", "b", "c", "d"], query="감자")
+    assert [r for _, r in results] == [True, False, True, False]
+    assert batch["item_calls"] == 0
+
+
+def test_batch_fills_missing_results_and_keeps_keyword_guard(batch):
+    batch["response"] = json.dumps({"results": [
+        {"index": 0, "summary": "고구마 이야기", "relevant": True},
+        {"index": 1, "summary": "감자 이야기", "relevant": True},
+    ]})
+    results = summarize_contents("search", None, "요약해줘", ["a", "b", "c"], keywords=["감자"], query="감자")
+    assert results == [("고구마 이야기", False), ("감자 이야기", True), ("개별 요약 감자", True)]
+    assert batch["item_calls"] == 1
+
+
+def test_invalid_batch_json_falls_back_to_per_item(batch):
+    batch["response"] = "요약을 만들 수 없습니다"
+    results = summarize_contents("search", None, "요약해줘", ["a", "b"])
+    assert results == [("개별 요약 감자", True), ("개별 요약 감자", True)]
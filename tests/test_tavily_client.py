@@ -0,0 +1,91 @@
+import json
+
+import pytest
+
+import tavily_client
+from cache_utils import LRUCache
+from tavily_client import _DiskCache, get_tavily_cache_stats, tavily_search
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self.status_code = status_code
+        self.text = json.dumps(data, ensure_ascii=False)
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.posts = []
+
+    def post(self, url, headers=None, data=None, timeout=None):
+        self.posts.append(json.loads(data))
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def session(monkeypatch, tmp_path):
+    monkeypatch.setattr(tavily_client, "_memory", LRUCache())
+    monkeypatch.setattr(tavily_client, "_disk", _DiskCache(str(tmp_path / "tavily.sqlite3")))
+    monkeypatch.setattr(tavily_client, "_disk_hits", 0)
+    monkeypatch.setattr(tavily_client, "_api_calls", 0)
+    fake = FakeSession()
+    monkeypatch.setattr(tavily_client, "get_http_session", lambda: fake)
+    return fake
+
+
+RESULTS = {"results": [{"title": "사과 수출 동향", "url": "https://example.com", "content": "..."}]}
+
+
+def test_same_search_hits_memory_then_disk(session, monkeypatch):
+    session.responses.append(FakeResponse(RESULTS))
+
+    assert tavily_search("사과 수출", handler="export") == RESULTS
+    assert tavily_search("사과 수출", handler="export") == RESULTS
+    assert len(session.posts) == 1
+
+    # 재시작처럼 메모리 캐시만 비우면 디스크 캐시에서 읽음
+    monkeypatch.setattr(tavily_client, "_memory", LRUCache())
+    assert tavily_search("사과 수출", handler="export") == RESULTS
+    assert len(session.posts) == 1
+
+    stats = get_tavily_cache_stats()
+    assert (stats["memory_hits"], stats["disk_hits"], stats["api_calls"]) == (0, 1, 1)
+    assert stats["disk_size"] == 1
+
+
+def test_different_parameters_are_separate_entries(session):
+    session.responses += [FakeResponse(RESULTS), FakeResponse(RESULTS)]
+
+    tavily_search("사과 수출", max_results=5)
+    tavily_search("사과 수출", max_results=3)
+
+    assert [p["max_results"] for p in session.posts] == [5, 3]
+
+
+def test_empty_and_failed_responses_are_not_cached(session):
+    session.responses += [
+        FakeResponse({"results": []}),
+        FakeResponse({"error": "rate limit"}, status_code=429),
+        FakeResponse(RESULTS),
+    ]
+
+    assert tavily_search("배 정책") == {"results": []}
+    assert tavily_search("배 정책") is None
+    assert tavily_search("배 정책") == RESULTS
+    assert len(session.posts) == 3
+    assert get_tavily_cache_stats()["disk_size"] == 1
+
+
+def test_disk_entries_expire(tmp_path):
+    disk = _DiskCache(str(tmp_path / "tavily.sqlite3"))
+    disk.set("old", RESULTS, expires_at=0)
+    disk.set("new", RESULTS, expires_at=2 ** 40)
+
+    assert disk.get("old") is None
+    assert disk.get("new")[0] == RESULTS
+    assert disk.size() == 1
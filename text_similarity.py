@@ -0,0 +1,76 @@
+import math
+import re
+from collections import Counter
+
+# 글자 n-gram TF-IDF 유사도 검색 (외부 라이브러리 없이, 짧은 한국어 문장용)
+# 띄어쓰기/어미가 조금 달라도 ('반품 가능한가요' / '반품가능해?') 겹치는 글자 조각으로 비슷한 문장을 찾습니다.
+NGRAM_SIZES = (1, 2, 3)
+
+
+def normalize_text(text):
+    """소문자, 공백/문장부호 제거"""
+    return re.sub(r'[\W_]+', '', text.lower())
+
+
+def char_ngrams(text, sizes=NGRAM_SIZES, stopwords=()):
+    text = normalize_text(text)
+    for word in stopwords:
+        text = text.replace(word, "")
+    grams = Counter()
+    for n in sizes:
+        for i in range(len(text) - n + 1):
+            grams[text[i:i + n]] += 1
+    return grams
+
+
+class NgramIndex:
+    """
+    문서(문자열) 목록에 대한 글자 n-gram TF-IDF 색인
+    - search(query, k): 코사인 유사도가 높은 순서로 [(문서 인덱스, 유사도 0~1), ...]
+    - stopwords: n-gram을 만들기 전에 지울 표현 (질문마다 붙는 '어떻게', '가능한가요' 등)
+    """
+
+    def __init__(self, documents, sizes=NGRAM_SIZES, stopwords=()):
+        self.sizes = sizes
+        # 긴 표현부터 지워야 '가능한가요'가 '가능'보다 먼저 제거됨
+        self.stopwords = sorted({normalize_text(w) for w in stopwords if normalize_text(w)}, key=len, reverse=True)
+        counts = [char_ngrams(doc, sizes, self.stopwords) for doc in documents]
+        df = Counter()
+        for grams in counts:
+            df.update(grams.keys())
+        total = len(documents)
+        self.idf = {g: math.log((1 + total) / (1 + d)) + 1 for g, d in df.items()}
+        self.vectors = [self._weigh(grams) for grams in counts]
+        # n-gram → [(문서 인덱스, 가중치)] 역색인
+        self.postings = {}
+        for i, vector in enumerate(self.vectors):
+            for g, w in vector.items():
+                self.postings.setdefault(g, []).append((i, w))
+
+    def _weigh(self, grams):
+        vector = {g: (1 + math.log(c)) * self.idf.get(g, 0.0) for g, c in grams.items()}
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        return {g: w / norm for g, w in vector.items() if w} if norm else {}
+
+    def search(self, query, k=5):
+        query_vector = self._weigh(char_ngrams(query, self.sizes, self.stopwords))
+        scores = Counter()
+        for g, qw in query_vector.items():
+            for i, w in self.postings.get(g, ()):
+                scores[i] += qw * w
+        return scores.most_common(k)
+
+
+def ngram_vector(text, sizes=NGRAM_SIZES, stopwords=()):
+    """IDF 없이 (1 + log tf) 가중치로 정규화한 n-gram 벡터 (문서 집합이 계속 바뀌는 캐시용)"""
+    grams = char_ngrams(text, sizes, stopwords)
+    vector = {g: 1 + math.log(c) for g, c in grams.items()}
+    norm = math.sqrt(sum(w * w for w in vector.values()))
+    return {g: w / norm for g, w in vector.items()} if norm else {}
+
+
+def cosine(a, b):
+    """ngram_vector 두 개의 코사인 유사도"""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b.get(g, 0.0) for g, w in a.items())